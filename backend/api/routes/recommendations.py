@@ -3,12 +3,19 @@
 """
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from backend.database.db import get_db_session
+from backend.instrumentation import span
+from backend.schemas.schemas import BatchBuildRequest
 from backend.recommendation.engine_v2 import RecommendationEngineV2
-from backend.recommendation.context_builder import ContextBuilder
+from backend.recommendation.materialized import lookup_materialized_build, lookup_materialized_builds
+from backend.recommendation.similar_builds import find_similar_builds
+from backend.recommendation.context_builder import ContextBuilder, candidate_limits
 from backend.recommendation.ai_service import AIRecommendationService
+from backend.recommendation.ai_pregenerated import lookup_ai_build
+from backend.recommendation.ai_hedge import follow_up_result, hedge_slo_ms, hedged_ai_build
 
 router = APIRouter()
 
@@ -20,6 +27,13 @@ def get_build_recommendation(
     focus: Optional[str] = Query(None, description="빌드 초점 (Damage, Defense, Utility)"),
     max_skills: int = Query(6, ge=1, le=10, description="추천할 스킬 개수"),
     max_items: int = Query(10, ge=1, le=20, description="추천할 아이템 개수"),
+    optimize: bool = Query(False, description="세트 시너지까지 고려한 스킬 조합 최적화"),
+    budget_ms: float = Query(50, gt=0, le=1000, description="조합 최적화 시간 예산 (밀리초)"),
+    optimize_items: bool = Query(False, description="세트 보너스를 고려한 장비 슬롯 배정"),
+    allocate_talents: bool = Query(False, description="포인트 예산 내 재능 트리 배분"),
+    talent_points: int = Query(24, ge=1, le=200, description="재능 포인트 예산"),
+    explain: bool = Query(True, description="False면 이유 문자열 대신 reason_codes 반환"),
+    pair_synergy: bool = Query(False, description="스킬 쌍 시너지까지 고려한 스킬 조합 최적화"),
     db: Session = Depends(get_db_session)
 ):
     """
@@ -30,15 +44,49 @@ def get_build_recommendation(
     - **focus**: 빌드 초점 (선택사항)
     - **max_skills**: 추천할 최대 스킬 개수
     - **max_items**: 추천할 최대 아이템 개수
+    - **optimize**: 개별 상위 스킬 대신 조합 최적화 사용 (선택사항)
+    - **budget_ms**: 조합 최적화 시간 예산 - 초과 시 그때까지의 최선 조합 반환
+    - **optimize_items**: 슬롯별 최고 점수 대신 세트 보너스까지 고려한 장비 배정 (선택사항)
+    - **allocate_talents**: 상위 노드 5개 대신 재능 트리 경로를 따라 포인트 배분 계획 반환 (선택사항)
+    - **talent_points**: 재능 포인트 예산
+    - **explain**: False면 이유 문자열을 만들지 않고 reason_codes만 반환 (프로그램 호출용)
+    - **pair_synergy**: skill_synergies 테이블의 스킬 쌍 시너지까지 목적 함수에 포함한 조합 최적화 (선택사항)
+
+    사전 계산된 조합(materialized_builds)은 조회 한 번으로 반환하고, 나머지만 실시간 계산합니다.
     """
     try:
+        request = {
+            "hero_id": hero_id,
+            "playstyle": playstyle,
+            "focus": focus,
+            "max_skills": max_skills,
+            "max_items": max_items,
+            "optimize_skills": optimize,
+            "optimize_budget_ms": budget_ms,
+            "optimize_items": optimize_items,
+            "allocate_talents": allocate_talents,
+            "talent_points": talent_points,
+            "explain": explain,
+            "pair_synergy": pair_synergy
+        }
+        materialized = lookup_materialized_build(db, request)
+        if materialized is not None:
+            return materialized
+
         engine = RecommendationEngineV2(db)
         recommendation = engine.recommend_build(
             hero_id=hero_id,
             playstyle=playstyle,
             focus=focus,
             max_skills=max_skills,
-            max_items=max_items
+            max_items=max_items,
+            optimize_skills=optimize,
+            optimize_budget_ms=budget_ms,
+            optimize_items=optimize_items,
+            allocate_talents=allocate_talents,
+            talent_points=talent_points,
+            explain=explain,
+            pair_synergy=pair_synergy
         )
         return recommendation
 
@@ -48,6 +96,43 @@ def get_build_recommendation(
         raise HTTPException(status_code=500, detail=f"Recommendation failed: {str(e)}")
 
 
+@router.post("/build/batch")
+def get_batch_build_recommendations(
+    batch: BatchBuildRequest,
+    db: Session = Depends(get_db_session)
+):
+    """
+    여러 영웅/플레이스타일 빌드를 한 번에 추천
+
+    - **requests**: (hero_id, playstyle, focus, max_skills, max_items) 목록
+    - **workers**: 병렬 처리 수 (0이면 단일 프로세스, 서버 공유 프로세스 풀에서 실행)
+
+    카탈로그(스킬/아이템/노드)는 요청 전체에서 한 번만 로드합니다.
+    사전 계산된 조합은 조회로 채우고, 나머지 요청만 계산합니다.
+    실패한 항목은 `error`, `status_code` 필드로 표시되며 나머지 결과는 그대로 반환됩니다.
+    """
+    try:
+        requests = [item.model_dump() for item in batch.requests]
+        results = lookup_materialized_builds(db, requests)
+
+        # 사전 계산에 없는 요청만 실시간 계산
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            engine = RecommendationEngineV2(db)
+            computed = engine.recommend_builds([requests[i] for i in missing], workers=batch.workers)
+            for i, result in zip(missing, computed):
+                results[i] = result
+
+        return {
+            "count": len(results),
+            "failed": sum(1 for r in results if "error" in r),
+            "results": results
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch recommendation failed: {str(e)}")
+
+
 @router.get("/quick/{hero_id}")
 def get_quick_recommendation(
     hero_id: int,
@@ -59,12 +144,16 @@ def get_quick_recommendation(
     - **hero_id**: 영웅 ID
     """
     try:
-        engine = RecommendationEngineV2(db)
-        recommendation = engine.recommend_build(
-            hero_id=hero_id,
-            max_skills=4,
-            max_items=6
+        recommendation = lookup_materialized_build(
+            db, {"hero_id": hero_id, "max_skills": 4, "max_items": 6}
         )
+        if recommendation is None:
+            engine = RecommendationEngineV2(db)
+            recommendation = engine.recommend_build(
+                hero_id=hero_id,
+                max_skills=4,
+                max_items=6
+            )
         return {
             "hero_name": recommendation["hero_name"],
             "talent": recommendation["hero_talent"],
@@ -98,12 +187,69 @@ def get_quick_recommendation(
         raise HTTPException(status_code=500, detail=f"Recommendation failed: {str(e)}")
 
 
+@router.get("/similar/{hero_id}")
+def get_similar_builds(
+    hero_id: int,
+    playstyle: Optional[str] = Query(None, description="플레이스타일 (Melee, Ranged, etc.)"),
+    focus: Optional[str] = Query(None, description="빌드 초점 (Damage, Defense, Utility)"),
+    max_skills: int = Query(6, ge=1, le=10, description="추천할 스킬 개수"),
+    max_items: int = Query(10, ge=1, le=20, description="추천할 아이템 개수"),
+    limit: int = Query(10, ge=1, le=50, description="반환할 유사 빌드 개수"),
+    db: Session = Depends(get_db_session)
+):
+    """
+    비슷하게 플레이되는 빌드 찾기
+
+    - **hero_id**: 영웅 ID (이 영웅의 추천 빌드를 기준으로 검색)
+    - **playstyle**, **focus**, **max_skills**, **max_items**: 기준 빌드 추천 파라미터
+    - **limit**: 반환할 유사 빌드 개수
+
+    사전 계산된 빌드와 메타 빌드 중 스킬/아이템 구성, 데미지 타입, DoT/Hit 비율,
+    메커니즘이 가장 비슷한 빌드를 코사인 유사도 순으로 반환합니다 (기준 빌드 자신은 제외).
+    """
+    try:
+        request = {
+            "hero_id": hero_id,
+            "playstyle": playstyle,
+            "focus": focus,
+            "max_skills": max_skills,
+            "max_items": max_items,
+            "explain": False
+        }
+        recommendation = lookup_materialized_build(db, request)
+        if recommendation is None:
+            engine = RecommendationEngineV2(db)
+            recommendation = engine.recommend_build(
+                hero_id=hero_id,
+                playstyle=playstyle,
+                focus=focus,
+                max_skills=max_skills,
+                max_items=max_items,
+                explain=False
+            )
+
+        similar = find_similar_builds(db, recommendation, limit=limit)
+        return {
+            "hero_id": hero_id,
+            "hero_name": recommendation["hero_name"],
+            "build_type": recommendation["build_type"],
+            "count": len(similar),
+            "similar_builds": similar
+        }
+
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Similar build search failed: {str(e)}")
+
+
 @router.get("/ai/build/{hero_id}")
 def get_ai_build_recommendation(
     hero_id: int,
     playstyle: Optional[str] = Query(None, description="플레이스타일 (Melee, Ranged, Fire, DoT 등)"),
     max_skills: int = Query(6, ge=1, le=10, description="추천할 스킬 개수"),
     max_items: int = Query(10, ge=1, le=20, description="추천할 아이템 개수"),
+    slo_ms: Optional[int] = Query(None, ge=0, le=60000, description="AI 대기 시간 (밀리초, 초과 시 룰 기반 추천)"),
     db: Session = Depends(get_db_session)
 ):
     """
@@ -113,6 +259,9 @@ def get_ai_build_recommendation(
     - **playstyle**: 플레이스타일 (선택사항)
     - **max_skills**: 추천할 최대 스킬 개수
     - **max_items**: 추천할 최대 아이템 개수
+    - **slo_ms**: AI 결과 대기 시간 (기본: AI_HEDGE_SLO_MS, 0이면 헤지 없음) - 초과하거나 AI 호출이
+      실패하면 룰 기반 추천(source: "rules")을 바로 반환하고, AI 결과는 follow_up_token으로
+      GET /ai/result/{token}에서 받거나 같은 요청을 다시 보내면 받을 수 있음
 
     **새로운 AI 기반 추천 시스템**:
     - 로컬 DB 데이터를 기반으로 컨텍스트 생성
@@ -120,14 +269,28 @@ def get_ai_build_recommendation(
     - 데이터 무결성 보장 (환각 방지)
     """
     try:
-        # 1. Context Builder로 DB 데이터 수집
-        context_builder = ContextBuilder(db)
-        context = context_builder.build_hero_context(
-            hero_id=hero_id,
-            playstyle=playstyle,
-            max_skills=50,  # 충분한 옵션 제공
-            max_items=50
-        )
+        # 0. 사전 생성된 결과가 있으면 바로 반환 (scripts/pregenerate_ai_builds.py)
+        recommendation = lookup_ai_build(db, hero_id, playstyle, max_skills, max_items)
+        if recommendation is not None:
+            recommendation["source"] = "ai"
+            recommendation["hero_id"] = hero_id
+            return recommendation
+
+        # 헤지 모드: SLO까지만 AI를 기다리고 넘으면 룰 기반 추천
+        slo = hedge_slo_ms() if slo_ms is None else slo_ms
+        if slo > 0:
+            return hedged_ai_build(db, AIRecommendationService(), hero_id, playstyle, max_skills, max_items, slo)
+
+        # 1. Context Builder로 DB 데이터 수집 (관련도 상위 후보만)
+        with span("ai_context"):
+            skill_candidates, item_candidates = candidate_limits(max_skills, max_items)
+            context_builder = ContextBuilder(db)
+            context = context_builder.build_hero_context(
+                hero_id=hero_id,
+                playstyle=playstyle,
+                max_skills=skill_candidates,
+                max_items=item_candidates
+            )
 
         # 2. AI 서비스로 추천 생성
         ai_service = AIRecommendationService()
@@ -151,6 +314,25 @@ def get_ai_build_recommendation(
         raise HTTPException(status_code=500, detail=f"AI recommendation failed: {str(e)}")
 
 
+@router.get("/ai/result/{token}")
+def get_ai_follow_up(token: str):
+    """
+    헤지 모드 AI 추천 결과 조회
+
+    - **token**: /ai/build가 룰 기반 추천과 함께 반환한 follow_up_token
+
+    진행 중이면 202, 실패하면 503, 만료되었거나 없는 토큰이면 404를 반환합니다.
+    """
+    status, recommendation = follow_up_result(token)
+    if status == "ready":
+        return recommendation
+    if status == "pending":
+        return JSONResponse(status_code=202, content={"status": "pending", "follow_up_token": token})
+    if status == "failed":
+        raise HTTPException(status_code=503, detail="AI service error: background AI call failed")
+    raise HTTPException(status_code=404, detail="Unknown or expired follow-up token")
+
+
 @router.get("/ai/quick/{hero_id}")
 async def get_quick_ai_recommendation(
     hero_id: int,
@@ -164,21 +346,26 @@ async def get_quick_ai_recommendation(
     기본 설정으로 빠르게 빌드 추천을 받습니다.
     """
     try:
-        # Context 생성
-        context_builder = ContextBuilder(db)
-        context = context_builder.build_hero_context(
-            hero_id=hero_id,
-            max_skills=30,  # 빠른 추천용
-            max_items=30
-        )
+        # 사전 생성된 결과 우선
+        recommendation = lookup_ai_build(db, hero_id, None, 4, 6)
+        if recommendation is None:
+            # Context 생성
+            with span("ai_context"):
+                skill_candidates, item_candidates = candidate_limits(4, 6)  # 빠른 추천용
+                context_builder = ContextBuilder(db)
+                context = context_builder.build_hero_context(
+                    hero_id=hero_id,
+                    max_skills=skill_candidates,
+                    max_items=item_candidates
+                )
 
-        # AI 추천
-        ai_service = AIRecommendationService()
-        recommendation = await ai_service.generate_build_recommendation_async(
-            context=context,
-            max_skills=4,
-            max_items=6
-        )
+            # AI 추천
+            ai_service = AIRecommendationService()
+            recommendation = await ai_service.generate_build_recommendation_async(
+                context=context,
+                max_skills=4,
+                max_items=6
+            )
 
         # 간소화된 응답
         return {
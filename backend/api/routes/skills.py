@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 
 from backend.database.db import get_db_session
 from backend.database.models import Skill
+from backend.recommendation.mechanics_analyzer import MechanicsAnalyzer
 from backend.schemas.schemas import SkillResponse
 
 router = APIRouter()
@@ -18,6 +19,8 @@ def get_skills(
     limit: int = Query(100, ge=1, le=500, description="가져올 항목 수"),
     skill_type: Optional[str] = Query(None, description="스킬 타입 필터 (Active, Support, etc.)"),
     damage_type: Optional[str] = Query(None, description="데미지 타입 필터 (Physical, Fire, etc.)"),
+    build_style: Optional[str] = Query(None, description="빌드 스타일 필터 (DoT, Hit, Hybrid)"),
+    mechanic: Optional[str] = Query(None, description="메커니즘 필터 (Spell Burst, Combo, Melee, etc.)"),
     db: Session = Depends(get_db_session)
 ):
     """
@@ -27,6 +30,8 @@ def get_skills(
     - **limit**: 가져올 최대 항목 수
     - **skill_type**: 스킬 타입 필터 (Active, Support, Passive, etc.)
     - **damage_type**: 데미지 타입 필터 (Physical, Fire, Lightning, etc.)
+    - **build_style**: 빌드 스타일 필터 (DoT, Hit, Hybrid)
+    - **mechanic**: 메커니즘 필터 (Spell Burst, Multistrike, Combo, Channeled, Chain, AoE, Melee, Ranged)
     """
     query = db.query(Skill)
 
@@ -38,6 +43,20 @@ def get_skills(
     if damage_type:
         query = query.filter(Skill.damage_type == damage_type)
 
+    # 빌드 스타일 필터 (저장된 메커니즘 분석 컬럼)
+    if build_style:
+        query = query.filter(Skill.build_style == build_style)
+
+    # 메커니즘 필터 (mechanics_mask 비트 검사)
+    if mechanic:
+        bit = MechanicsAnalyzer.MECHANIC_BITS.get(mechanic)
+        if bit is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown mechanic '{mechanic}'. Available: {', '.join(MechanicsAnalyzer.MECHANIC_BITS)}"
+            )
+        query = query.filter(Skill.mechanics_mask.op("&")(bit) != 0)
+
     skills = query.offset(skip).limit(limit).all()
     return skills
 
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from backend.crawler.base_crawler import BaseCrawler, DataParser
 from backend.database.models import Skill
 from backend.database.db import get_db_session
+from backend.recommendation.mechanics_analyzer import MechanicsAnalyzer
 
 logger = logging.getLogger(__name__)
 
@@ -209,6 +210,7 @@ class SkillsCrawler(BaseCrawler):
             db: 데이터베이스 세션
         """
         saved_count = 0
+        mechanics_analyzer = MechanicsAnalyzer()  # 파생 컬럼 (build_style, ailment, mechanics_mask)
 
         for skill_data in skills_data:
             try:
@@ -222,6 +224,7 @@ class SkillsCrawler(BaseCrawler):
                     existing_skill.tags = skill_data.get('tags', existing_skill.tags)
                     existing_skill.damage_type = skill_data.get('damage_type', existing_skill.damage_type)
                     existing_skill.image_url = skill_data.get('image_url', existing_skill.image_url)
+                    mechanics_analyzer.apply_to_skill(existing_skill)
                     logger.info(f"Updated skill: {skill_data['name']}")
                 else:
                     # 새로 생성
@@ -235,6 +238,7 @@ class SkillsCrawler(BaseCrawler):
                         mana_cost=skill_data.get('mana_cost'),
                         image_url=skill_data.get('image_url', '')
                     )
+                    mechanics_analyzer.apply_to_skill(new_skill)
                     db.add(new_skill)
                     logger.info(f"Added new skill: {skill_data['name']}")
 
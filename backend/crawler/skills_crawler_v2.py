@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 from backend.crawler.base_crawler import BaseCrawler, DataParser
 from backend.database.models import Skill
 from backend.database.db import get_db_session
+from backend.recommendation.mechanics_analyzer import MechanicsAnalyzer
 
 logger = logging.getLogger(__name__)
 
@@ -265,6 +266,7 @@ class SkillsCrawlerV2(BaseCrawler):
         크롤링한 스킬 데이터를 데이터베이스에 저장
         """
         saved_count = 0
+        mechanics_analyzer = MechanicsAnalyzer()  # 파생 컬럼 (build_style, ailment, mechanics_mask)
 
         for skill_data in skills_data:
             try:
@@ -279,10 +281,12 @@ class SkillsCrawlerV2(BaseCrawler):
                     for key, value in save_data.items():
                         if hasattr(existing_skill, key):
                             setattr(existing_skill, key, value)
+                    mechanics_analyzer.apply_to_skill(existing_skill)
                     logger.info(f"Updated skill: {save_data['name']}")
                 else:
                     # 새로 생성
                     new_skill = Skill(**save_data)
+                    mechanics_analyzer.apply_to_skill(new_skill)
                     db.add(new_skill)
                     logger.info(f"Added new skill: {save_data['name']}")
 
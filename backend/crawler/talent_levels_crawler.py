@@ -11,6 +11,8 @@ from sqlalchemy.orm import Session
 from backend.crawler.base_crawler import BaseCrawler
 from backend.database.models import TalentLevel
 from backend.database.db import get_db_session
+from backend.keyword_matcher import register_keywords, scan_keywords
+from backend.recommendation.talent_profiles import invalidate_talent_profiles
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +43,23 @@ class TalentLevelsCrawler(BaseCrawler):
         "https://tlidb.com/en/Sing_with_the_Tide",
     ]
 
+    # 효과 설명의 메커니즘 키워드 (정의 순서 = 추출 순서)
+    MECHANIC_KEYWORDS = {
+        'burst': ['burst'],
+        'rage': ['rage'],
+        'melee': ['melee'],
+        'attack_speed': ['attack speed'],
+        'critical': ['critical', 'crit'],
+        'area': ['area', 'aoe'],
+        'damage_penalty': ['-80%', 'damage for non-'],
+        'cooldown': ['cooldown'],
+        'dot': ['damage over time', 'dot', 'ignite', 'bleed'],
+        'spell': ['spell'],
+        'projectile': ['projectile'],
+        'summon': ['summon', 'minion', 'clone'],
+        'affliction': ['affliction', 'ailment'],
+    }
+
     def crawl_all_talent_levels(self) -> List[Dict]:
         """
         모든 재능의 레벨별 효과 크롤링
@@ -222,29 +241,8 @@ class TalentLevelsCrawler(BaseCrawler):
         Returns:
             메커니즘 키워드 리스트
         """
-        mechanics = []
-        desc_lower = description.lower()
-
-        # 주요 메커니즘 키워드 매칭
-        mechanic_keywords = {
-            'burst': ['burst'],
-            'rage': ['rage'],
-            'melee': ['melee'],
-            'attack_speed': ['attack speed'],
-            'critical': ['critical', 'crit'],
-            'area': ['area', 'aoe'],
-            'damage_penalty': ['-80%', 'damage for non-'],
-            'cooldown': ['cooldown'],
-            'dot': ['damage over time', 'dot', 'ignite', 'bleed'],
-            'spell': ['spell'],
-            'projectile': ['projectile'],
-            'summon': ['summon', 'minion', 'clone'],
-            'affliction': ['affliction', 'ailment'],
-        }
-
-        for mech_name, keywords in mechanic_keywords.items():
-            if any(kw in desc_lower for kw in keywords):
-                mechanics.append(mech_name)
+        # 주요 메커니즘 키워드 매칭 (설명 1회 스캔)
+        mechanics = scan_keywords(description).concepts(self.MECHANIC_KEYWORDS)
 
         # 레벨별 중요 메커니즘 태깅
         if level == 60:
@@ -341,6 +339,9 @@ class TalentLevelsCrawler(BaseCrawler):
         db.commit()
         logger.info(f"Successfully saved {saved_count} talent level effects to database")
 
+        # 재능 프로필 재생성 필요 (다른 프로세스는 데이터 지문으로 변경 감지)
+        invalidate_talent_profiles()
+
     def export_to_json(self, talent_levels_data: List[Dict], filename: str = "talent_levels.json"):
         """재능 레벨 데이터를 JSON 파일로 저장"""
         from pathlib import Path
@@ -355,6 +356,9 @@ class TalentLevelsCrawler(BaseCrawler):
         logger.info(f"Talent levels data exported to: {filepath}")
 
 
+register_keywords(TalentLevelsCrawler.MECHANIC_KEYWORDS)
+
+
 def main():
     """재능 레벨 크롤러 실행"""
     logging.basicConfig(level=logging.INFO)
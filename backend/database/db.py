@@ -3,11 +3,12 @@
 """
 import os
 from pathlib import Path
-from sqlalchemy import create_engine
+from typing import List
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
-from backend.database.models import Base
+from backend.database.models import Base, install_revision_triggers
 
 
 # 프로젝트 루트 디렉토리
@@ -36,9 +37,45 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 def create_tables():
     """데이터베이스 테이블 생성"""
     Base.metadata.create_all(bind=engine)
+    upgrade_schema()
     print(f"✓ Database tables created at: {DATA_DIR}/torchlight.db")
 
 
+def upgrade_schema(bind=None) -> List[str]:
+    """
+    기존 테이블에 모델에만 있는 컬럼/인덱스와 카탈로그 변경 횟수 트리거 추가 (create_all은 기존 테이블을 바꾸지 않음)
+
+    추가된 컬럼은 NULL로 채워지므로 값 계산은 백필 스크립트에서 합니다.
+
+    Returns:
+        추가된 "테이블.컬럼" 목록
+    """
+    bind = bind or engine
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                added.append(f"{table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+        # 카탈로그 변경 횟수 테이블 + 트리거 (기존 DB)
+        Base.metadata.tables["catalog_revisions"].create(conn, checkfirst=True)
+        install_revision_triggers(conn)
+
+    return added
+
+
 def drop_tables():
     """데이터베이스 테이블 삭제 (주의: 모든 데이터 삭제됨)"""
     Base.metadata.drop_all(bind=engine)
@@ -78,7 +115,6 @@ if __name__ == "__main__":
     create_tables()
 
     # 테이블 확인
-    from sqlalchemy import inspect
     inspector = inspect(engine)
     tables = inspector.get_table_names()
     print(f"\nCreated tables ({len(tables)}):")
@@ -4,8 +4,8 @@ SQLAlchemy 데이터베이스 모델 정의
 from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
-    Column, Integer, String, Text, Float, DateTime,
-    ForeignKey, UniqueConstraint
+    Column, Integer, String, Text, Float, DateTime, Boolean,
+    ForeignKey, UniqueConstraint, event, text
 )
 from sqlalchemy.orm import relationship, DeclarativeBase
 
@@ -49,6 +49,10 @@ class Skill(Base):
     cooldown = Column(Float)
     mana_cost = Column(Integer)
     image_url = Column(String(500))
+    # MechanicsAnalyzer 파생 컬럼 (저장 시 계산, NULL이면 아직 분석 전 → 백필 대상)
+    build_style = Column(String(20), index=True)  # DoT, Hit, Hybrid, Unknown
+    ailment = Column(String(20), index=True)  # Trauma, Ignite, etc.
+    mechanics_mask = Column(Integer, index=True)  # MechanicsAnalyzer.MECHANIC_BITS 비트마스크
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
@@ -215,3 +219,87 @@ class MetaBuild(Base):
 
     def __repr__(self):
         return f"<MetaBuild(id={self.id}, hero_id={self.hero_id}, name='{self.build_name}')>"
+
+
+class MaterializedBuild(Base):
+    """사전 계산된 빌드 추천(Materialized_Builds) 테이블"""
+    __tablename__ = "materialized_builds"
+    __table_args__ = (
+        UniqueConstraint('catalog_version', 'params_key', name='uq_materialized_build'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    catalog_version = Column(String(40), nullable=False)  # 카탈로그 + 스코어링 규칙 지문
+    params_key = Column(String(200), nullable=False)  # 조회 키 (hero_id|playstyle|max_skills|...)
+    hero_id = Column(Integer, nullable=False)
+    playstyle = Column(String(50), nullable=False)  # 미지정은 빈 문자열
+    max_skills = Column(Integer, nullable=False)
+    max_items = Column(Integer, nullable=False)
+    explain = Column(Boolean, nullable=False)
+    result = Column(Text, nullable=False)  # JSON: recommend_build() 결과
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<MaterializedBuild(version='{self.catalog_version}', key='{self.params_key}')>"
+
+
+class PregeneratedAIBuild(Base):
+    """사전 생성된 AI 빌드 추천(AI_Pregenerated_Builds) 테이블"""
+    __tablename__ = "ai_pregenerated_builds"
+    __table_args__ = (
+        UniqueConstraint('catalog_version', 'model', 'params_key', name='uq_ai_pregenerated_build'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    catalog_version = Column(String(40), nullable=False)  # 카탈로그 + 스코어링 규칙 지문
+    model = Column(String(100), nullable=False)  # 생성한 모델 (OPENAI_MODEL)
+    params_key = Column(String(200), nullable=False)  # 조회 키 (hero_id|playstyle|max_skills|max_items)
+    hero_id = Column(Integer, nullable=False)
+    playstyle = Column(String(50), nullable=False)  # 미지정은 빈 문자열
+    max_skills = Column(Integer, nullable=False)
+    max_items = Column(Integer, nullable=False)
+    result = Column(Text, nullable=False)  # JSON: 검증을 통과한 AI 추천 결과
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<PregeneratedAIBuild(version='{self.catalog_version}', model='{self.model}', key='{self.params_key}')>"
+
+
+class CatalogRevision(Base):
+    """카탈로그 테이블별 변경 횟수(Catalog_Revisions) 테이블 - 트리거가 갱신"""
+    __tablename__ = "catalog_revisions"
+
+    table_name = Column(String(50), primary_key=True)
+    revision = Column(Integer, nullable=False, default=0)  # INSERT/UPDATE/DELETE 행마다 +1
+
+    def __repr__(self):
+        return f"<CatalogRevision(table='{self.table_name}', revision={self.revision})>"
+
+
+# 변경 횟수를 기록하는 테이블 (추천 카탈로그 + 재능 레벨 + 메타 빌드 + 스킬 시너지)
+# 크롤러 등 다른 프로세스의 제자리 수정도 DB 트리거가 기록하므로, 메모리 캐시(카탈로그 스냅샷, 재능 프로필,
+# 유사 빌드 인덱스, 시너지 행렬)와 카탈로그 버전은 모두 catalog_fingerprint()로 이 값을 읽어 판단합니다.
+REVISIONED_TABLES = (
+    "heroes", "skills", "items", "item_sets", "talent_nodes", "talent_levels", "meta_builds", "skill_synergies"
+)
+
+
+def install_revision_triggers(connection) -> None:
+    """존재하는 REVISIONED_TABLES에 변경 횟수 트리거 생성 (이미 있으면 건너뜀)"""
+    existing = set(connection.dialect.get_table_names(connection))
+    for table_name in REVISIONED_TABLES:
+        if table_name not in existing:
+            continue
+        for operation in ("INSERT", "UPDATE", "DELETE"):
+            connection.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {table_name}_{operation.lower()}_revision "
+                f"AFTER {operation} ON {table_name} BEGIN "
+                f"INSERT INTO catalog_revisions (table_name, revision) VALUES ('{table_name}', 1) "
+                f"ON CONFLICT(table_name) DO UPDATE SET revision = revision + 1; END"
+            ))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_revision_triggers(target, connection, **kw):
+    """create_all() 후 트리거 생성"""
+    install_revision_triggers(connection)
@@ -0,0 +1,253 @@
+"""
+단계별 타이밍 계측 (Server-Timing 헤더 + Prometheus 히스토그램/카운터)
+
+추천 엔진/AI 파이프라인의 주요 단계를 이름 있는 구간(span)으로 감싸면:
+- 요청 안에서는 구간 시간이 모여 `Server-Timing` 응답 헤더로 반환되고
+- 모든 구간 시간이 단계별 히스토그램에 누적되어 /metrics (Prometheus 텍스트 형식)로 노출됩니다.
+
+계측을 끄면(TIMING_ENABLED=false) span()은 아무것도 하지 않는 공유 객체를 돌려주므로
+호출 비용은 함수 호출 1회 수준입니다.
+
+Usage:
+    with span("skill_scoring"):
+        scores = ...
+
+    spans = start_request()          # 미들웨어: 요청 시작
+    ...
+    header = server_timing_header(spans)
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+TIMING_ENABLED_ENV = "TIMING_ENABLED"
+
+# Prometheus 클라이언트 기본 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+STAGE_METRIC = "torchlight_stage_duration_seconds"
+REQUEST_METRIC = "torchlight_request_duration_seconds"
+SINGLE_FLIGHT_METRIC = "torchlight_single_flight_calls_total"
+AI_HEDGE_METRIC = "torchlight_ai_hedge_total"
+AI_PROMPT_TOKENS_METRIC = "torchlight_ai_prompt_tokens_total"
+
+Span = Tuple[str, float]  # (구간 이름, 초)
+
+
+def _env_enabled() -> bool:
+    return os.getenv(TIMING_ENABLED_ENV, "true").strip().lower() not in ("0", "false", "no", "off")
+
+
+_enabled = _env_enabled()
+
+# 현재 요청의 구간 목록 (요청 밖이면 None → 히스토그램에만 기록)
+_request_spans: ContextVar[Optional[List[Span]]] = ContextVar("request_spans", default=None)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: Optional[bool] = None) -> None:
+    """계측 켜기/끄기 (None이면 환경변수 다시 읽기 - .env 로드 후 호출)"""
+    global _enabled
+    _enabled = _env_enabled() if enabled is None else enabled
+
+
+# ==============================================================================
+# 히스토그램
+# ==============================================================================
+
+class Histogram:
+    """레이블 값별 누적 버킷 히스토그램 (스레드 안전)"""
+
+    def __init__(self, name: str, help_text: str, label: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        self._series: Dict[str, List] = {}  # 레이블 값 → [버킷별 개수..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, seconds: float) -> None:
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1  # 마지막 칸은 +Inf 전용
+            series[-2] += seconds
+            series[-1] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> List[str]:
+        """Prometheus 텍스트 형식 줄 목록"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {value: list(series) for value, series in self._series.items()}
+
+        for value in sorted(snapshot):
+            series = snapshot[value]
+            label = f'{self.label}="{_escape_label(value)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {series[-1]}')
+            lines.append(f"{self.name}_sum{{{label}}} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{{{label}}} {series[-1]}")
+        return lines
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Counter:
+    """레이블 값 조합별 누적 카운터 (스레드 안전, 계측 꺼짐과 무관하게 항상 집계)"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], int] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: int = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> int:
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        """Prometheus 텍스트 형식 줄 목록"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = dict(self._values)
+
+        for values in sorted(snapshot):
+            label = ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(self.labels, values))
+            lines.append(f"{self.name}{{{label}}} {snapshot[values]}")
+        return lines
+
+
+STAGE_DURATIONS = Histogram(STAGE_METRIC, "Duration of named pipeline stages", "stage")
+REQUEST_DURATIONS = Histogram(REQUEST_METRIC, "Duration of HTTP requests by route", "route")
+SINGLE_FLIGHT_CALLS = Counter(
+    SINGLE_FLIGHT_METRIC, "Single-flight calls by outcome (executed upstream or coalesced)", ("flight", "result")
+)
+AI_HEDGE_OUTCOMES = Counter(
+    AI_HEDGE_METRIC, "Hedged AI requests by what was served (ai, ai_cached, rules_timeout, rules_error)", ("result",)
+)
+AI_PROMPT_TOKENS = Counter(
+    AI_PROMPT_TOKENS_METRIC,
+    "AI prompt tokens reported by the provider, by prompt layout and whether the prompt cache served them",
+    ("layout", "cache")
+)
+
+
+def render_metrics() -> str:
+    """/metrics 응답 본문"""
+    lines = (
+        STAGE_DURATIONS.render() + REQUEST_DURATIONS.render()
+        + SINGLE_FLIGHT_CALLS.render() + AI_HEDGE_OUTCOMES.render() + AI_PROMPT_TOKENS.render()
+    )
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    STAGE_DURATIONS.reset()
+    REQUEST_DURATIONS.reset()
+    SINGLE_FLIGHT_CALLS.reset()
+    AI_HEDGE_OUTCOMES.reset()
+    AI_PROMPT_TOKENS.reset()
+
+
+# ==============================================================================
+# 구간 (span)
+# ==============================================================================
+
+class _NullSpan:
+    """계측 꺼짐 - 아무것도 하지 않음"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _TimedSpan:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.started
+        STAGE_DURATIONS.observe(self.name, elapsed)
+        spans = _request_spans.get()
+        if spans is not None:
+            spans.append((self.name, elapsed))
+        return False
+
+
+def span(name: str):
+    """
+    이름 있는 구간 (with 문)
+
+    Args:
+        name: 단계 이름 (Server-Timing 토큰 규칙상 영문/숫자/밑줄 권장)
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _TimedSpan(name)
+
+
+def start_request() -> Optional[List[Span]]:
+    """
+    현재 컨텍스트에서 요청 구간 수집 시작 (계측 꺼짐이면 None)
+
+    목록을 제자리에서 채우므로 스레드풀/asyncio.to_thread로 복사된 컨텍스트의 구간도 모입니다.
+    """
+    if not _enabled:
+        return None
+    spans: List[Span] = []
+    _request_spans.set(spans)
+    return spans
+
+
+def server_timing_header(spans: List[Span], total_seconds: Optional[float] = None) -> str:
+    """
+    구간 목록 → Server-Timing 헤더 값 (같은 이름은 합산, 첫 등장 순서)
+
+    Example:
+        "hero_query;dur=0.12, skill_scoring;dur=3.41, total;dur=4.02"
+    """
+    totals: Dict[str, float] = {}
+    for name, seconds in spans:
+        totals[name] = totals.get(name, 0.0) + seconds
+    if total_seconds is not None:
+        totals["total"] = total_seconds
+    return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in totals.items())
@@ -0,0 +1,196 @@
+"""
+다중 키워드 매처
+
+여러 곳(추천 엔진, 메커니즘 분석기, 크롤러)에서 쓰는 키워드 어휘를 하나의 정규식(트라이 기반)으로
+컴파일하여, 텍스트를 한 번만 훑어 등장한 모든 키워드를 찾습니다.
+
+매칭 의미는 기존 `keyword in text.lower()`(대소문자 무시 부분 문자열 검색)와 동일합니다.
+서로 겹치는 키워드("crit"/"critical", "spell"/"spell burst")도 모두 찾아냅니다.
+
+Usage:
+    register_keywords(["damage over time", "dot"], {"critical": ["critical", "crit"]})
+    hits = scan_keywords(skill.description)
+    if hits.any_of(["damage over time", "dot"]):
+        ...
+"""
+import re
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Union
+
+Vocabulary = Union[Iterable[str], Dict[str, Iterable[str]]]
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """키워드 목록을 트라이 형태의 정규식으로 변환 (같은 위치에서는 가장 긴 키워드 우선)"""
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # 여기서 끝나는 키워드가 있으면 나머지는 선택적 (탐욕적이므로 더 긴 키워드 우선)
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordHits:
+    """텍스트 한 개에 대한 키워드 매칭 결과"""
+
+    __slots__ = ("keywords", "text", "vocabulary")
+
+    def __init__(self, keywords: FrozenSet[str], text: str, vocabulary: FrozenSet[str]):
+        self.keywords = keywords  # 텍스트에 등장한 어휘 키워드 (소문자)
+        self.text = text  # 소문자 텍스트
+        self.vocabulary = vocabulary  # 스캔 시점의 어휘
+
+    def __contains__(self, keyword: str) -> bool:
+        """키워드 포함 여부 (어휘에 없는 동적 키워드는 텍스트에서 직접 검색)"""
+        if keyword in self.vocabulary:
+            return keyword in self.keywords
+        return keyword in self.text
+
+    def __bool__(self) -> bool:
+        return bool(self.keywords)
+
+    def any_of(self, keywords: Iterable[str]) -> bool:
+        """키워드 중 하나라도 포함되는지"""
+        return any(keyword in self for keyword in keywords)
+
+    def first_of(self, keywords: Iterable[str]) -> Optional[str]:
+        """주어진 순서대로 처음 포함된 키워드"""
+        for keyword in keywords:
+            if keyword in self:
+                return keyword
+        return None
+
+    def concepts(self, vocabulary: Dict[str, Iterable[str]]) -> List[str]:
+        """{개념: [키워드]} 중 키워드가 포함된 개념 목록 (정의 순서 유지)"""
+        return [concept for concept, keywords in vocabulary.items() if self.any_of(keywords)]
+
+
+class KeywordMatcher:
+    """여러 키워드 어휘를 하나의 정규식으로 컴파일한 단일 패스 매처"""
+
+    def __init__(self, *vocabularies: Vocabulary):
+        self._keywords: Set[str] = set()
+        self._lock = threading.Lock()
+        self._compiled = None
+        for vocabulary in vocabularies:
+            self.add(vocabulary)
+
+    def add(self, vocabulary: Vocabulary):
+        """어휘 추가 (키워드 리스트 또는 {개념: [키워드]} 딕셔너리)"""
+        if isinstance(vocabulary, dict):
+            keywords = [kw for kws in vocabulary.values() for kw in kws]
+        else:
+            keywords = list(vocabulary)
+
+        new_keywords = {kw.lower() for kw in keywords if kw} - self._keywords
+        if new_keywords:
+            with self._lock:
+                self._keywords |= new_keywords
+                self._compiled = None  # 다음 스캔 때 재컴파일
+
+    @property
+    def vocabulary(self) -> FrozenSet[str]:
+        """현재 등록된 전체 키워드"""
+        return self._compile()[0]
+
+    def _compile(self):
+        """정규식과 겹침 처리 테이블 생성 (어휘 변경 시에만)"""
+        compiled = self._compiled
+        if compiled is not None:
+            return compiled
+
+        with self._lock:
+            keywords = sorted(self._keywords)
+            vocabulary = frozenset(keywords)
+            pattern = re.compile(_trie_pattern(keywords)) if keywords else None
+
+            # 매치된 키워드 안에 포함된 다른 키워드 ("critical" → {"critical", "crit"})
+            contained = {
+                keyword: frozenset(other for other in keywords if other in keyword)
+                for keyword in keywords
+            }
+
+            # 매치 내부에서 시작해 매치 밖으로 이어질 수 있는 키워드의 시작 오프셋
+            # ("spell burst" 매치 안의 "burst"가 "burst damage"로 이어지는 경우 등)
+            proper_prefixes = {keyword[:i] for keyword in keywords for i in range(1, len(keyword))}
+            overlap_offsets = {
+                keyword: tuple(j for j in range(1, len(keyword)) if keyword[j:] in proper_prefixes)
+                for keyword in keywords
+            }
+
+            overlap_offsets = {keyword: offsets for keyword, offsets in overlap_offsets.items() if offsets}
+
+            self._compiled = (vocabulary, pattern, contained, overlap_offsets)
+            return self._compiled
+
+    def scan(self, text: Optional[str]) -> KeywordHits:
+        """
+        텍스트를 한 번 훑어 등장한 모든 키워드 반환
+
+        Args:
+            text: 검사할 텍스트 (대소문자 무시)
+
+        Returns:
+            KeywordHits
+        """
+        vocabulary, pattern, contained, overlap_offsets = self._compile()
+        lowered = text.lower() if text else ""
+        if not lowered or pattern is None:
+            return KeywordHits(frozenset(), lowered, vocabulary)
+
+        found: Set[str] = set()
+
+        def collect(start: int, keyword: str):
+            found.update(contained[keyword])
+            end = start + len(keyword)
+            for offset in overlap_offsets.get(keyword, ()):
+                overlap = pattern.match(lowered, start + offset)
+                if overlap and overlap.end() > end:
+                    collect(overlap.start(), overlap.group())
+
+        matched: Set[str] = set()
+        for match in pattern.finditer(lowered):
+            keyword = match.group()
+            if keyword in overlap_offsets:
+                # 다른 키워드와 겹칠 수 있는 매치만 위치 기반으로 재확인
+                collect(match.start(), keyword)
+            else:
+                matched.add(keyword)
+
+        for keyword in matched:
+            found.update(contained[keyword])
+
+        return KeywordHits(frozenset(found), lowered, vocabulary)
+
+
+# ==============================================================================
+# 공유 매처 - 각 모듈이 자신의 어휘를 등록하고 하나의 정규식으로 함께 스캔
+# ==============================================================================
+
+_shared_matcher = KeywordMatcher()
+
+
+def register_keywords(*vocabularies: Vocabulary):
+    """공유 매처에 어휘 등록"""
+    for vocabulary in vocabularies:
+        _shared_matcher.add(vocabulary)
+
+
+def scan_keywords(text: Optional[str]) -> KeywordHits:
+    """공유 매처로 텍스트 스캔"""
+    return _shared_matcher.scan(text)
+
+
+def get_shared_matcher() -> KeywordMatcher:
+    """공유 매처 인스턴스"""
+    return _shared_matcher
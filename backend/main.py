@@ -1,19 +1,55 @@
 """
 FastAPI 메인 애플리케이션
 """
+import logging
+import time
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from backend.api.routes import heroes, skills, items, talent_nodes, destinies, recommendations
+from backend.database.db import get_db_session, upgrade_schema
+from backend.instrumentation import (
+    REQUEST_DURATIONS, render_metrics, server_timing_header, set_enabled, start_request
+)
+from backend.recommendation.engine_v2 import shutdown_batch_pool
+from backend.recommendation.talent_profiles import build_talent_profiles
 
 # Load environment variables from .env file
 load_dotenv()
+set_enabled()  # .env의 TIMING_ENABLED 반영
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작 시 스키마 보강 + 재능 프로필 사전 생성, 종료 시 배치 프로세스 풀 정리"""
+    added = upgrade_schema()
+    if added:
+        logger.warning(f"Added columns {', '.join(added)} - run scripts/backfill_skill_mechanics.py")
+
+    db = get_db_session()
+    try:
+        build_talent_profiles(db)
+    except Exception as e:
+        # 테이블이 아직 없으면 첫 요청 때 생성됨
+        logger.warning(f"Talent profiles not built at startup: {e}")
+    finally:
+        db.close()
+    yield
+    shutdown_batch_pool()
+
 
 # FastAPI 앱 생성
 app = FastAPI(
     title="Torchlight Infinite Optimizer API",
     description="토치라이트 인피니트 최적 빌드 추천 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -25,6 +61,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+class ServerTimingMiddleware:
+    """
+    요청 중 기록된 단계별 시간을 Server-Timing 헤더로 반환하고 라우트별 히스토그램에 누적
+
+    순수 ASGI 미들웨어 - 계측이 꺼져 있으면 요청을 그대로 넘깁니다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        spans = start_request() if scope["type"] == "http" else None
+        if spans is None:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - started
+                route = scope.get("route")
+                REQUEST_DURATIONS.observe(getattr(route, "path", "unmatched"), elapsed)
+                MutableHeaders(scope=message).append("Server-Timing", server_timing_header(spans, elapsed))
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+
+app.add_middleware(ServerTimingMiddleware)
+
+
 # 라우터 등록
 app.include_router(heroes.router, prefix="/api/heroes", tags=["Heroes"])
 app.include_router(skills.router, prefix="/api/skills", tags=["Skills"])
@@ -48,6 +117,7 @@ async def root():
             "talent_nodes": "/api/talent-nodes",
             "destinies": "/api/destinies",
             "recommendations_v2": "/api/recommendations/build/{hero_id}",
+            "recommendations_batch": "/api/recommendations/build/batch",
             "recommendations_ai": "/api/recommendations/ai/build/{hero_id}"
         }
     }
@@ -59,6 +129,12 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """단계별/라우트별 지연 시간 히스토그램 (Prometheus 텍스트 형식)"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
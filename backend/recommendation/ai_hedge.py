@@ -0,0 +1,195 @@
+"""
+지연 시간 헤지 AI 추천 (SLO 초과 시 룰 기반 추천으로 즉시 응답)
+
+AI 호출은 백그라운드 스레드에서 시작하고 SLO까지만 기다립니다.
+- SLO 안에 끝나면 AI 결과 (source: "ai")
+- SLO를 넘기면 RecommendationEngineV2 결과 (source: "rules") + follow_up_token을 반환하고,
+  AI 호출은 계속 진행되어 GET /ai/result/{token}으로 받거나 같은 프롬프트의 다음 요청이 바로 사용
+- AI 호출이 실패하면 503 대신 룰 기반 결과 (follow_up_token 없음, 다음 요청이 다시 호출)
+
+완료된 결과는 프롬프트 지문별로 FOLLOW_UP_TTL_SECONDS 동안 보관합니다. 지문에 카탈로그 내용과
+모델이 들어가므로 데이터가 바뀌면 자연히 새로 호출합니다.
+"""
+import copy
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.instrumentation import AI_HEDGE_OUTCOMES, span
+from backend.recommendation.ai_service import AIRecommendationService
+from backend.recommendation.context_builder import ContextBuilder, candidate_limits
+from backend.recommendation.engine_v2 import RecommendationEngineV2
+from backend.recommendation.materialized import lookup_materialized_build
+
+logger = logging.getLogger(__name__)
+
+
+# AI 결과 대기 SLO (밀리초, 0이면 헤지 없이 AI 결과까지 대기)
+AI_HEDGE_SLO_ENV = "AI_HEDGE_SLO_MS"
+
+FOLLOW_UP_TTL_SECONDS = 600.0
+FOLLOW_UP_MAX_ENTRIES = 512
+BACKGROUND_WORKERS = 8
+
+_executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix="ai-hedge")
+
+
+def hedge_slo_ms() -> int:
+    """기본 SLO (AI_HEDGE_SLO_MS, 미설정이면 0 = 헤지 끔)"""
+    return int(os.getenv(AI_HEDGE_SLO_ENV, "0"))
+
+
+@dataclass
+class FollowUp:
+    """백그라운드 AI 호출 1건"""
+    token: str
+    hero_id: int
+    future: Future
+    created: float
+
+
+class FollowUpStore:
+    """프롬프트 지문 → 진행 중/완료된 AI 호출 (TTL + 최대 개수, 스레드 안전)"""
+
+    def __init__(self, ttl_seconds: float = FOLLOW_UP_TTL_SECONDS, max_entries: int = FOLLOW_UP_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._by_fingerprint: "OrderedDict[str, FollowUp]" = OrderedDict()  # 시작 순서
+        self._by_token: Dict[str, str] = {}
+
+    def _expire(self, now: float) -> None:
+        while self._by_fingerprint:
+            fingerprint, follow_up = next(iter(self._by_fingerprint.items()))
+            if len(self._by_fingerprint) <= self.max_entries and now - follow_up.created < self.ttl_seconds:
+                break
+            self._remove(fingerprint)
+
+    def _remove(self, fingerprint: str) -> None:
+        follow_up = self._by_fingerprint.pop(fingerprint)
+        self._by_token.pop(follow_up.token, None)
+
+    def start(self, fingerprint: str, hero_id: int, fn: Callable[[], Dict]) -> FollowUp:
+        """같은 지문의 호출이 진행 중이거나 성공했으면 그것을, 아니면 새로 시작"""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            follow_up = self._by_fingerprint.get(fingerprint)
+            if follow_up is not None and not (follow_up.future.done() and follow_up.future.exception()):
+                return follow_up
+            if follow_up is not None:
+                self._remove(fingerprint)  # 실패한 호출은 다시 시작
+
+            follow_up = FollowUp(secrets.token_urlsafe(16), hero_id, _executor.submit(fn), now)
+            self._by_fingerprint[fingerprint] = follow_up
+            self._by_token[follow_up.token] = fingerprint
+            return follow_up
+
+    def get(self, token: str) -> Optional[FollowUp]:
+        with self._lock:
+            self._expire(time.monotonic())
+            fingerprint = self._by_token.get(token)
+            return self._by_fingerprint.get(fingerprint) if fingerprint else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_fingerprint.clear()
+            self._by_token.clear()
+
+
+FOLLOW_UPS = FollowUpStore()
+
+
+def _ai_response(follow_up: FollowUp, recommendation: Dict) -> Dict:
+    """공유 결과의 요청별 복사본 (라우트와 같은 source/hero_id 표시)"""
+    recommendation = copy.deepcopy(recommendation)
+    recommendation["source"] = "ai"
+    recommendation["hero_id"] = follow_up.hero_id
+    return recommendation
+
+
+def _rules_build(db: Session, hero_id: int, playstyle: Optional[str], max_skills: int, max_items: int) -> Dict:
+    """룰 기반 추천 (사전 계산 결과 우선)"""
+    request = {"hero_id": hero_id, "playstyle": playstyle, "max_skills": max_skills, "max_items": max_items}
+    recommendation = lookup_materialized_build(db, request)
+    if recommendation is None:
+        recommendation = RecommendationEngineV2(db).recommend_build(**request)
+    return recommendation
+
+
+def hedged_ai_build(
+    db: Session,
+    service: AIRecommendationService,
+    hero_id: int,
+    playstyle: Optional[str],
+    max_skills: int,
+    max_items: int,
+    slo_ms: int
+) -> Dict:
+    """
+    SLO 안에 끝나면 AI 추천, 아니면 룰 기반 추천 (+ follow_up_token)
+
+    Raises:
+        ValueError: 영웅이 없는 경우
+    """
+    # 1. 컨텍스트 + 프롬프트 (DB 접근은 요청 스레드에서)
+    with span("ai_context"):
+        skill_candidates, item_candidates = candidate_limits(max_skills, max_items)
+        context = ContextBuilder(db).build_hero_context(
+            hero_id=hero_id,
+            playstyle=playstyle,
+            max_skills=skill_candidates,
+            max_items=item_candidates
+        )
+    request = service.prepare_request(context, max_skills, max_items)
+
+    # 2. 백그라운드 호출 시작 (같은 프롬프트가 진행 중이거나 완료되어 있으면 재사용)
+    follow_up = FOLLOW_UPS.start(request.fingerprint, hero_id, lambda: service.complete_request(request))
+    ready = follow_up.future.done()
+
+    # 3. SLO까지 대기
+    try:
+        with span("ai_hedge_wait"):
+            recommendation = follow_up.future.result(timeout=slo_ms / 1000)
+    except FutureTimeoutError:
+        reason = "timeout"
+    except Exception as e:
+        reason = "error"
+        logger.warning(f"AI call failed for hero {hero_id}, serving rule-based build: {e}")
+    else:
+        AI_HEDGE_OUTCOMES.inc("ai_cached" if ready else "ai")
+        return _ai_response(follow_up, recommendation)
+
+    # 4. 룰 기반 결과로 즉시 응답 (시간 초과면 AI 호출은 계속 진행)
+    AI_HEDGE_OUTCOMES.inc(f"rules_{reason}")
+    with span("ai_hedge_rules"):
+        recommendation = _rules_build(db, hero_id, playstyle, max_skills, max_items)
+    recommendation["source"] = "rules"
+    recommendation["fallback_reason"] = f"ai_{reason}"
+    recommendation["follow_up_token"] = follow_up.token if reason == "timeout" else None
+    return recommendation
+
+
+def follow_up_result(token: str) -> Tuple[str, Optional[Dict]]:
+    """
+    백그라운드 AI 호출 결과 조회
+
+    Returns:
+        (상태, 결과) - 상태는 "ready", "pending", "failed", "unknown" (만료 포함)
+    """
+    follow_up = FOLLOW_UPS.get(token)
+    if follow_up is None:
+        return "unknown", None
+    if not follow_up.future.done():
+        return "pending", None
+    if follow_up.future.exception() is not None:
+        return "failed", None
+    return "ready", _ai_response(follow_up, follow_up.future.result())
@@ -0,0 +1,378 @@
+"""
+사전 생성된 AI 빌드 추천 (ai_pregenerated_builds 테이블)
+
+AI 추천은 요청마다 OpenAI 호출이 필요하지만 자주 쓰이는 조합(영웅 × 주요 플레이스타일 ×
+기본/빠른 추천 개수)은 한정되어 있으므로, 오프라인 작업으로 미리 생성해 두고 AI 라우트가 먼저 조회합니다.
+
+- pregenerate_ai_builds(): 컨텍스트를 만들어 제한된 동시성으로 AIRecommendationService에 보내고,
+  검증(ai_validation)을 통과한 결과만 완료되는 대로 커밋 (중단 후 다시 실행하면 남은 조합만 생성)
+- export_batch_file() / import_batch_results(): 같은 요청을 일괄 추론 API(Batch API) 형식의
+  JSONL로 내보내고, 결과 파일을 검증 후 저장
+
+행은 카탈로그 버전(materialized.catalog_version)과 모델 이름으로 구분하므로, 데이터/규칙/모델이
+바뀌면 다시 생성하기 전까지 AI 라우트는 실시간 호출로 돌아갑니다.
+"""
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from openai.types import CompletionUsage
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from backend.database.models import PregeneratedAIBuild
+from backend.instrumentation import span
+from backend.recommendation.ai_service import AIRecommendationService, current_ai_model
+from backend.recommendation.ai_validation import repair_ai_build, validate_ai_build
+from backend.recommendation.catalog import RecommendationCatalog, invalidate_catalog
+from backend.recommendation.context_builder import ContextBuilder, candidate_limits
+from backend.recommendation.engine_v2 import RecommendationEngineV2
+from backend.recommendation.materialized import catalog_version, current_catalog_version
+
+logger = logging.getLogger(__name__)
+
+
+# 사전 생성 조합 (None = 미지정)
+PREGENERATED_PLAYSTYLES = (None, "Melee", "Ranged", "Spell", "DoT", "Summon")
+PREGENERATED_LIMITS = ((6, 10), (4, 6))  # (max_skills, max_items): /ai/build 기본값, /ai/quick
+
+DEFAULT_CONCURRENCY = 4
+
+# 저장할 최소 유효도 점수 (복구 전 그대로 맞은 항목 비율) - 이보다 많이 틀린 응답은 다시 생성
+MIN_VALIDITY_SCORE = 0.5
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+
+@dataclass
+class PregenerateResult:
+    """사전 생성 결과"""
+    catalog_version: str
+    model: str
+    generated: int  # 이번 실행에서 저장한 결과 수
+    skipped: int  # 이미 저장되어 있어 건너뛴 조합 수
+    failed: int  # 호출 실패 또는 검증 실패로 저장하지 않은 조합 수
+    elapsed_ms: float
+
+
+def ai_params_key(hero_id: int, playstyle: Optional[str], max_skills: int, max_items: int) -> str:
+    """조회 키 (미지정 플레이스타일은 빈 문자열)"""
+    return f"{hero_id}|{playstyle or ''}|{max_skills}|{max_items}"
+
+
+def build_ai_jobs(hero_ids: List[int]) -> List[Dict]:
+    """사전 생성할 요청 목록"""
+    return [
+        {"hero_id": hero_id, "playstyle": playstyle, "max_skills": max_skills, "max_items": max_items}
+        for hero_id in sorted(hero_ids)
+        for playstyle in PREGENERATED_PLAYSTYLES
+        for max_skills, max_items in PREGENERATED_LIMITS
+    ]
+
+
+def _job_key(job: Dict) -> str:
+    return ai_params_key(job["hero_id"], job["playstyle"], job["max_skills"], job["max_items"])
+
+
+# ==============================================================================
+# 조회
+# ==============================================================================
+
+def lookup_ai_build(
+    db: Session,
+    hero_id: int,
+    playstyle: Optional[str],
+    max_skills: int,
+    max_items: int
+) -> Optional[Dict]:
+    """
+    사전 생성된 AI 추천 조회
+
+    Returns:
+        현재 카탈로그 버전 + 모델의 결과 (없으면 None)
+    """
+    try:
+        with span("ai_pregenerated_lookup"):
+            version = current_catalog_version(db)
+            row = db.query(PregeneratedAIBuild.result).filter(
+                PregeneratedAIBuild.catalog_version == version,
+                PregeneratedAIBuild.model == current_ai_model(),
+                PregeneratedAIBuild.params_key == ai_params_key(hero_id, playstyle, max_skills, max_items)
+            ).first()
+    except SQLAlchemyError as e:
+        # 테이블이 아직 없는 DB 등 - 실시간 호출로 진행
+        db.rollback()
+        logger.debug(f"Pre-generated AI build lookup skipped: {e}")
+        return None
+
+    if row is None:
+        return None
+    recommendation = json.loads(row.result)
+    recommendation.setdefault("ai_metadata", {})["pregenerated"] = True
+    return recommendation
+
+
+# ==============================================================================
+# 사전 생성
+# ==============================================================================
+
+def _prepare_run(
+    db: Session,
+    model: str,
+    force: bool = False
+) -> Tuple[str, RecommendationCatalog, List[Dict], int]:
+    """
+    버전 고정 + 이전 버전 행 정리 + 남은 조합 계산
+
+    force면 현재 모델의 저장된 행을 모두 지우고 전체 조합을 다시 생성합니다
+    (프롬프트/검증 로직이 바뀌어 카탈로그 버전은 같지만 결과를 새로 만들어야 할 때).
+
+    Returns:
+        (카탈로그 버전, 카탈로그 스냅샷, 남은 조합, 이미 저장된 조합 수)
+    """
+    PregeneratedAIBuild.__table__.create(bind=db.get_bind(), checkfirst=True)
+
+    # 1. 버전 고정 후 카탈로그 로드 (크롤링 직후이므로 공유 스냅샷도 다시 로드)
+    invalidate_catalog()
+    engine = RecommendationEngineV2(db)
+    version = catalog_version(db, engine.rules)
+
+    # 2. 다른 카탈로그 버전의 행은 더 이상 조회되지 않으므로 삭제 (다른 모델의 같은 버전 행은 유지)
+    db.query(PregeneratedAIBuild).filter(
+        PregeneratedAIBuild.catalog_version != version
+    ).delete(synchronize_session=False)
+    if force:
+        db.query(PregeneratedAIBuild).filter(
+            PregeneratedAIBuild.model == model
+        ).delete(synchronize_session=False)
+    db.commit()
+
+    # 3. 이미 저장된 조합 제외 (중단된 실행 이어서 하기)
+    done = {
+        key for (key,) in db.query(PregeneratedAIBuild.params_key).filter(
+            PregeneratedAIBuild.catalog_version == version,
+            PregeneratedAIBuild.model == model
+        )
+    }
+    jobs = build_ai_jobs(list(engine.catalog.heroes))
+    pending = [job for job in jobs if _job_key(job) not in done]
+    return version, engine.catalog, pending, len(jobs) - len(pending)
+
+
+def _build_context(builder: ContextBuilder, job: Dict) -> Dict:
+    skill_candidates, item_candidates = candidate_limits(job["max_skills"], job["max_items"])
+    return builder.build_hero_context(
+        hero_id=job["hero_id"],
+        playstyle=job["playstyle"],
+        max_skills=skill_candidates,
+        max_items=item_candidates
+    )
+
+
+def _store(
+    db: Session,
+    version: str,
+    model: str,
+    catalog: RecommendationCatalog,
+    job: Dict,
+    recommendation: Dict
+) -> bool:
+    """검증 후 1건 저장 + 커밋 (검증 실패 또는 유효도 미달이면 저장하지 않고 False)"""
+    validation = validate_ai_build(recommendation, catalog)
+    if not validation.ok:
+        logger.warning(f"Rejected AI build {_job_key(job)}: {'; '.join(validation.problems[:3])}")
+        return False
+    score = recommendation["ai_metadata"].get("validation", {}).get("validity_score", 1.0)
+    if score < MIN_VALIDITY_SCORE:
+        logger.warning(f"Rejected AI build {_job_key(job)}: validity score {score}")
+        return False
+
+    db.add(PregeneratedAIBuild(
+        catalog_version=version,
+        model=model,
+        params_key=_job_key(job),
+        hero_id=job["hero_id"],
+        playstyle=job["playstyle"] or "",
+        max_skills=job["max_skills"],
+        max_items=job["max_items"],
+        result=json.dumps(recommendation, ensure_ascii=False)
+    ))
+    db.commit()
+    return True
+
+
+def pregenerate_ai_builds(
+    db: Session,
+    service: AIRecommendationService,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    force: bool = False
+) -> PregenerateResult:
+    """
+    남은 조합의 AI 추천을 생성하여 저장
+
+    컨텍스트 생성과 DB 저장은 호출 스레드에서, OpenAI 호출만 스레드풀(concurrency개)에서 실행합니다.
+
+    Args:
+        db: DB 세션
+        service: AI 추천 서비스 (base_url로 로컬 호환 서버 지정 가능)
+        concurrency: 동시에 진행할 최대 호출 수
+        force: 현재 모델의 저장된 결과를 지우고 전체 조합을 다시 생성
+
+    Returns:
+        PregenerateResult
+    """
+    started = time.perf_counter()
+    version, catalog, pending, skipped = _prepare_run(db, service.model, force)
+    builder = ContextBuilder(db)
+
+    generated = failed = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {}
+        for job in pending:
+            context = _build_context(builder, job)
+            future = pool.submit(
+                service.generate_build_recommendation, context, job["max_skills"], job["max_items"]
+            )
+            futures[future] = job
+
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                recommendation = future.result()
+            except Exception as e:
+                failed += 1
+                logger.warning(f"AI build {_job_key(job)} failed: {e}")
+                continue
+            recommendation["ai_metadata"].pop("coalesced", None)
+            if _store(db, version, service.model, catalog, job, recommendation):
+                generated += 1
+            else:
+                failed += 1
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(
+        f"Pre-generated {generated} AI builds for catalog {version[:12]} "
+        f"({skipped} already stored, {failed} failed, {elapsed_ms:.0f} ms)"
+    )
+    return PregenerateResult(
+        catalog_version=version,
+        model=service.model,
+        generated=generated,
+        skipped=skipped,
+        failed=failed,
+        elapsed_ms=elapsed_ms
+    )
+
+
+# ==============================================================================
+# 일괄 추론 파일 (OpenAI Batch API 형식 JSONL)
+# ==============================================================================
+
+def export_batch_file(
+    db: Session,
+    service: AIRecommendationService,
+    path: str,
+    force: bool = False
+) -> Tuple[str, int]:
+    """
+    남은 조합의 요청을 Batch API 입력 파일로 저장
+
+    custom_id는 "카탈로그 버전:조회 키"이므로 결과를 가져올 때 버전이 바뀌었으면 버립니다.
+    force면 현재 모델의 저장된 결과를 지우고 전체 조합을 내보냅니다.
+
+    Returns:
+        (카탈로그 버전, 요청 수)
+    """
+    version, _, pending, _ = _prepare_run(db, service.model, force)
+    builder = ContextBuilder(db)
+
+    with open(path, "w", encoding="utf-8") as f:
+        for job in pending:
+            request = service.prepare_request(_build_context(builder, job), job["max_skills"], job["max_items"])
+            line = {
+                "custom_id": f"{version}:{_job_key(job)}",
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": service.completion_body(request)
+            }
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+    logger.info(f"Exported {len(pending)} AI build requests for catalog {version[:12]} to {path}")
+    return version, len(pending)
+
+
+def _job_from_key(key: str) -> Dict:
+    hero_id, playstyle, max_skills, max_items = key.split("|")
+    return {
+        "hero_id": int(hero_id),
+        "playstyle": playstyle or None,
+        "max_skills": int(max_skills),
+        "max_items": int(max_items)
+    }
+
+
+def import_batch_results(db: Session, service: AIRecommendationService, path: str) -> PregenerateResult:
+    """
+    Batch API 결과 파일을 검증 후 저장
+
+    실패 응답, JSON이 아닌 응답, 검증 실패, 다른 카탈로그 버전의 요청은 failed로 셉니다.
+
+    Returns:
+        PregenerateResult
+    """
+    started = time.perf_counter()
+    version, catalog, pending, _ = _prepare_run(db, service.model)
+    pending_keys = {_job_key(job) for job in pending}
+
+    generated = skipped = failed = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            output = json.loads(line)
+            request_version, _, key = output["custom_id"].partition(":")
+            if request_version != version:
+                failed += 1
+                continue
+            if key not in pending_keys:
+                skipped += 1
+                continue
+
+            response = output.get("response") or {}
+            if output.get("error") or response.get("status_code") != 200:
+                failed += 1
+                logger.warning(f"AI build {key} failed in batch: {output.get('error') or response.get('status_code')}")
+                continue
+
+            body = response["body"]
+            try:
+                recommendation = service.parse_completion(
+                    body["choices"][0]["message"]["content"],
+                    CompletionUsage.model_validate(body["usage"]),
+                    {"batch": True}
+                )
+            except (KeyError, ValueError) as e:
+                failed += 1
+                logger.warning(f"AI build {key} has an unreadable response: {e}")
+                continue
+            recommendation["ai_metadata"]["validation"] = repair_ai_build(recommendation, catalog).to_metadata()
+
+            if _store(db, version, service.model, catalog, _job_from_key(key), recommendation):
+                generated += 1
+                pending_keys.discard(key)
+            else:
+                failed += 1
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Imported {generated} AI builds for catalog {version[:12]} ({failed} failed, {elapsed_ms:.0f} ms)")
+    return PregenerateResult(
+        catalog_version=version,
+        model=service.model,
+        generated=generated,
+        skipped=skipped,
+        failed=failed,
+        elapsed_ms=elapsed_ms
+    )
@@ -1,21 +1,88 @@
 """
 AI Recommendation Service - OpenAI API 연동
 """
+import asyncio
+import copy
+import hashlib
 import os
 import json
-from typing import Dict, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
 from openai import OpenAI
 
-from backend.recommendation.context_builder import ContextBuilder
+from backend.instrumentation import AI_PROMPT_TOKENS, span
+from backend.single_flight import SingleFlight
+from backend.recommendation.ai_validation import repair_ai_build
+from backend.recommendation.catalog import RecommendationCatalog
+from backend.recommendation.context_builder import DIGEST_BUDGET_SHARE, ContextBuilder, catalog_digest
+from backend.recommendation.prompt_budget import estimate_tokens
+
+# 컨텍스트 텍스트의 토큰 예산 (0 이하면 예산 없이 상위 후보 전체를 원문 그대로 포함)
+PROMPT_TOKEN_BUDGET_ENV = "AI_PROMPT_TOKEN_BUDGET"
+DEFAULT_PROMPT_TOKEN_BUDGET = 1500
+
+# 프롬프트 배치 (기본 inline - cached_prefix는 캐시 적중이 /metrics에서 확인된 경우에만 사용)
+# - inline: 영웅별 관련도 상위 후보 상세를 사용자 프롬프트에 직접 포함
+# - cached_prefix: 시스템 프롬프트 + 카탈로그 다이제스트를 바이트 단위로 고정된 접두부로 두고,
+#                  영웅/재능/후보/선호도만 요청별 접미부로 보냄 (제공자 측 프롬프트 캐시 적중)
+#                  다이제스트는 토큰 예산의 DIGEST_BUDGET_SHARE, 접미부는 나머지 예산 안에서 생성
+PROMPT_LAYOUT_ENV = "AI_PROMPT_LAYOUT"
+PROMPT_LAYOUTS = ("inline", "cached_prefix")
+
+DEFAULT_MODEL = "gpt-4o-mini"
+TEMPERATURE = 0.7
+
+# 같은 프롬프트의 동시 요청 병합 (프로세스 전역, /metrics의 torchlight_single_flight_calls_total)
+AI_REQUESTS = SingleFlight("ai_openai")
+
+
+@dataclass
+class AIRequest:
+    """OpenAI 호출 1건 (메시지 + 병합 키 + 요청 메타데이터 + 응답 검증용 카탈로그)"""
+    messages: List[Dict]
+    fingerprint: str
+    metadata: Dict
+    catalog: Optional[RecommendationCatalog] = None
+
+
+def _prompt_fingerprint(model: str, messages: List[Dict]) -> str:
+    """모델 + 메시지 + 생성 옵션의 해시 (같으면 같은 요청)"""
+    payload = json.dumps([model, TEMPERATURE, messages], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=4)
+def _prompt_prefix(system_prompt: str, digest_text: str) -> str:
+    """시스템 프롬프트 + 카탈로그 다이제스트 (카탈로그 버전별로 같은 문자열 재사용)"""
+    return f"{system_prompt}\n\n{digest_text}"
+
+
+@lru_cache(maxsize=4)
+def _prefix_tokens(prefix: str) -> int:
+    """고정 접두부(시스템 메시지) 추정 토큰 수"""
+    return estimate_tokens(prefix)
+
+
+def _cached_tokens(usage) -> int:
+    """응답 usage의 캐시 적중 토큰 수 (제공자가 보고하지 않으면 0)"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return getattr(details, "cached_tokens", None) or 0
+
+
+def current_ai_model() -> str:
+    """사용할 모델 이름 (OPENAI_MODEL, 사전 생성 결과 조회 키)"""
+    return os.getenv("OPENAI_MODEL", DEFAULT_MODEL)
 
 
 class AIRecommendationService:
     """OpenAI API 기반 빌드 추천 서비스"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """
         Args:
             api_key: OpenAI API 키 (None이면 환경변수에서 로드)
+            base_url: OpenAI 호환 서버 주소 (None이면 OPENAI_BASE_URL 또는 기본 주소)
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
@@ -24,8 +91,12 @@ class AIRecommendationService:
                 "or pass api_key parameter."
             )
 
-        self.client = OpenAI(api_key=self.api_key)
-        self.model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")  # 기본 모델
+        self.client = OpenAI(api_key=self.api_key, base_url=base_url)
+        self.model = current_ai_model()
+        self.prompt_token_budget = int(os.getenv(PROMPT_TOKEN_BUDGET_ENV, DEFAULT_PROMPT_TOKEN_BUDGET))
+        self.prompt_layout = os.getenv(PROMPT_LAYOUT_ENV, PROMPT_LAYOUTS[0])
+        if self.prompt_layout not in PROMPT_LAYOUTS:
+            raise ValueError(f"{PROMPT_LAYOUT_ENV} must be one of {', '.join(PROMPT_LAYOUTS)}")
 
     def generate_build_recommendation(
         self,
@@ -36,6 +107,8 @@ class AIRecommendationService:
         """
         AI 기반 빌드 추천 생성
 
+        같은 프롬프트의 요청이 이미 진행 중이면 OpenAI를 다시 호출하지 않고 그 결과를 함께 받습니다.
+
         Args:
             context: ContextBuilder.build_hero_context()의 반환값
             max_skills: 추천할 최대 스킬 개수
@@ -44,43 +117,74 @@ class AIRecommendationService:
         Returns:
             구조화된 빌드 추천
         """
-        # 1. 컨텍스트를 프롬프트로 변환
-        context_builder = ContextBuilder(db=None)  # format only
-        context_text = context_builder.format_context_for_prompt(context)
-
-        # 2. 시스템 프롬프트 생성
-        system_prompt = self._build_system_prompt()
-
-        # 3. 사용자 프롬프트 생성
-        user_prompt = self._build_user_prompt(
-            context_text,
-            max_skills,
-            max_items
-        )
+        return self.complete_request(self.prepare_request(context, max_skills, max_items))
+
+    def prepare_request(self, context: Dict, max_skills: int = 6, max_items: int = 10) -> "AIRequest":
+        """프롬프트 메시지 생성 + 병합 키(프롬프트 지문) 계산"""
+        with span("ai_prompt"):
+            # 1. 컨텍스트를 프롬프트로 변환 (토큰 예산 내로 압축)
+            context_builder = ContextBuilder(db=None)  # format only
+            token_budget = self.prompt_token_budget if self.prompt_token_budget > 0 else None
+            digest = None
+            if self.prompt_layout == "cached_prefix" and context.get("catalog") is not None:
+                digest_budget = int(token_budget * DIGEST_BUDGET_SHARE) if token_budget is not None else None
+                digest = catalog_digest(context["catalog"], digest_budget)
+                if token_budget is not None:
+                    token_budget -= digest.tokens  # 다이제스트 + 접미부가 예산 안에 들도록
+            budgeted = None
+            if token_budget is not None or digest is not None:
+                budgeted = context_builder.format_context_with_budget(context, token_budget, digest)
+                context_text = budgeted.text
+            else:
+                context_text = context_builder.format_context_for_prompt(context)
+
+            # 2. 시스템 프롬프트 생성 (고정 접두부: 메커니즘 레퍼런스 + 카탈로그 다이제스트)
+            system_prompt = self._build_system_prompt()
+            if digest is not None:
+                system_prompt = _prompt_prefix(system_prompt, digest.text)
+
+            # 3. 사용자 프롬프트 생성
+            user_prompt = self._build_user_prompt(
+                context_text,
+                max_skills,
+                max_items
+            )
 
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
+            metadata = budgeted.to_metadata() if budgeted is not None else {}
+            metadata["prompt_layout"] = "cached_prefix" if digest is not None else "inline"
+            metadata["prefix_tokens"] = _prefix_tokens(system_prompt)
+            if digest is not None:
+                metadata["digest_tokens"] = digest.tokens
+
+        return AIRequest(messages, _prompt_fingerprint(self.model, messages), metadata, context.get("catalog"))
+
+    def complete_request(self, request: "AIRequest") -> Dict:
+        """준비된 요청 실행 (같은 프롬프트가 진행 중이면 그 결과를 공유)"""
+        recommendation, coalesced = AI_REQUESTS.do(request.fingerprint, lambda: self._complete(request))
+        return self._own_copy(recommendation, coalesced)
+
+    def _complete(self, request: "AIRequest") -> Dict:
+        """OpenAI 호출 + 응답 파싱 (같은 지문의 동시 요청 중 1건만 실행)"""
         # 4. OpenAI API 호출
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                response_format={"type": "json_object"}  # JSON 모드 활성화
-            )
+            with span("ai_openai"):
+                response = self.client.chat.completions.create(**self.completion_body(request))
 
             # 5. 응답 파싱
-            response_text = response.choices[0].message.content
-            recommendation = json.loads(response_text)
+            with span("ai_parse"):
+                recommendation = self.parse_completion(
+                    response.choices[0].message.content, response.usage, request.metadata
+                )
 
-            # 6. 메타데이터 추가
-            recommendation["ai_metadata"] = {
-                "model": self.model,
-                "tokens_used": response.usage.total_tokens,
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens
-            }
+            # 6. 카탈로그 대조 (틀린 ID 복구, 없는 항목 제거)
+            if request.catalog is not None:
+                with span("ai_validate"):
+                    report = repair_ai_build(recommendation, request.catalog)
+                recommendation["ai_metadata"]["validation"] = report.to_metadata()
 
             return recommendation
 
@@ -89,6 +193,52 @@ class AIRecommendationService:
         except Exception as e:
             raise RuntimeError(f"OpenAI API call failed: {e}")
 
+    def completion_body(self, request: "AIRequest") -> Dict:
+        """Chat Completions 요청 본문 (실시간 호출과 배치 파일 공통)"""
+        return {
+            "model": self.model,
+            "messages": request.messages,
+            "temperature": TEMPERATURE,
+            "response_format": {"type": "json_object"}  # JSON 모드 활성화
+        }
+
+    def parse_completion(self, content: str, usage, metadata: Optional[Dict] = None) -> Dict:
+        """
+        응답 본문 → 추천 딕셔너리 (+ ai_metadata)
+
+        Args:
+            content: 응답 메시지 내용 (JSON 문자열)
+            usage: 응답 usage (CompletionUsage)
+            metadata: ai_metadata에 추가할 요청 메타데이터
+
+        Raises:
+            json.JSONDecodeError: 응답이 JSON이 아닌 경우
+        """
+        recommendation = json.loads(content)
+
+        # 메타데이터 추가
+        recommendation["ai_metadata"] = {
+            "model": self.model,
+            "tokens_used": usage.total_tokens,
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens
+        }
+        recommendation["ai_metadata"].update(metadata or {})
+        cached_tokens = _cached_tokens(usage)
+        recommendation["ai_metadata"]["cached_tokens"] = cached_tokens
+
+        # 배치별 캐시 적중 토큰 누적 (/metrics의 torchlight_ai_prompt_tokens_total)
+        layout = recommendation["ai_metadata"].get("prompt_layout", self.prompt_layout)
+        AI_PROMPT_TOKENS.inc(layout, "cached", amount=cached_tokens)
+        AI_PROMPT_TOKENS.inc(layout, "uncached", amount=max(usage.prompt_tokens - cached_tokens, 0))
+        return recommendation
+
+    def _own_copy(self, recommendation: Dict, coalesced: bool) -> Dict:
+        """병합된 호출끼리 결과를 공유하므로 호출자별 복사본 반환 (라우트가 키를 추가함)"""
+        recommendation = copy.deepcopy(recommendation)
+        recommendation["ai_metadata"]["coalesced"] = coalesced
+        return recommendation
+
     def _build_system_prompt(self) -> str:
         """시스템 프롬프트 생성 - AI의 역할 정의"""
         return """You are an expert Torchlight Infinite build theorycrafter with deep knowledge of game mechanics.
@@ -204,15 +354,13 @@ Return your recommendation as a JSON object following the specified format."""
         max_items: int = 10
     ) -> Dict:
         """
-        비동기 버전의 빌드 추천 생성 (향후 FastAPI async 엔드포인트용)
+        비동기 버전의 빌드 추천 생성 (FastAPI async 엔드포인트용)
 
-        현재는 동기 함수를 래핑한 형태
+        프롬프트 생성과 OpenAI 호출은 워커 스레드에서 실행하고, 같은 프롬프트의 요청이
+        진행 중이면 (동기 경로에서 시작된 요청 포함) 이벤트 루프를 막지 않고 그 결과를 기다립니다.
         """
-        # 실제 비동기 구현을 위해서는 asyncio.to_thread 또는 httpx 사용 필요
-        import asyncio
-        return await asyncio.to_thread(
-            self.generate_build_recommendation,
-            context,
-            max_skills,
-            max_items
+        request = await asyncio.to_thread(self.prepare_request, context, max_skills, max_items)
+        recommendation, coalesced = await AI_REQUESTS.do_async(
+            request.fingerprint, lambda: self._complete(request)
         )
+        return self._own_copy(recommendation, coalesced)
@@ -0,0 +1,324 @@
+"""
+AI 추천 결과 검증 및 복구
+
+AI 응답(JSON)이 출력 형식을 지키는지, 추천한 스킬/아이템이 실제 카탈로그에 있는지
+(ID와 이름이 같은 행을 가리키는지) 확인합니다. DB를 다시 조회하지 않고 카탈로그 스냅샷별
+메모리 인덱스(ID → 이름, 정규화 이름 → ID, 트라이그램 역색인)를 사용합니다.
+
+- validate_ai_build(): 검사만 (사전 생성 결과는 검증을 통과한 것만 저장)
+- repair_ai_build(): 틀린 ID는 이름(정확히 일치 → 트라이그램 유사도 순)으로 고치고,
+  찾을 수 없거나 중복인 항목은 제거한 뒤 유효도 점수를 보고
+"""
+import math
+import re
+import threading
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from backend.recommendation.catalog import RecommendationCatalog
+
+
+REQUIRED_FIELDS = ("build_type", "build_summary", "recommended_skills", "recommended_items")
+
+# 이름 유사도 하한 (트라이그램 자카드 유사도) - 이보다 낮으면 다른 스킬/아이템으로 봄
+FUZZY_MIN_SIMILARITY = 0.6
+
+_NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+
+def normalize_name(name) -> str:
+    """비교용 이름 (소문자, 기호/공백 정리)"""
+    if not isinstance(name, str):
+        return ""
+    return _NON_WORD_PATTERN.sub(" ", name.lower()).strip()
+
+
+def _trigrams(normalized: str) -> Set[str]:
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """ID → 이름, 정규화 이름 → ID, 트라이그램 → ID 역색인"""
+
+    def __init__(self, entries: Iterable[Tuple[int, str]]):
+        self.names: Dict[int, str] = {}
+        self.by_name: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._grams: Dict[int, FrozenSet[str]] = {}
+
+        for entity_id, name in sorted(entries):
+            self.names[entity_id] = name
+            normalized = normalize_name(name)
+            self.by_name.setdefault(normalized, entity_id)  # 같은 이름이면 작은 ID
+            grams = self._grams[entity_id] = frozenset(_trigrams(normalized))
+            for gram in grams:
+                self._postings[gram].append(entity_id)
+
+    def exact(self, name) -> Optional[int]:
+        """정규화 이름이 같은 ID"""
+        return self.by_name.get(normalize_name(name))
+
+    def fuzzy(self, name, min_similarity: float = FUZZY_MIN_SIMILARITY) -> Optional[int]:
+        """
+        트라이그램 자카드 유사도가 가장 높은 ID (하한과 같으면 포함, 하한 미만이면 None, 동률이면 작은 ID)
+
+        유사도가 하한 이상이려면 질의 트라이그램 중 ceil(하한 × 개수)개 이상을 공유해야 하므로,
+        후보는 가장 드문 트라이그램 (개수 - 필요 공유 수 + 1)개의 역색인에서만 모읍니다.
+        """
+        normalized = normalize_name(name)
+        if not normalized:
+            return None
+
+        grams = _trigrams(normalized)
+        required = max(1, math.ceil(min_similarity * len(grams)))
+        rarest = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        candidates: Set[int] = set()
+        for gram in rarest[:len(grams) - required + 1]:
+            candidates.update(self._postings.get(gram, ()))
+
+        best_id, best_similarity = None, -1.0
+        for entity_id in candidates:
+            count = len(grams & self._grams[entity_id])
+            similarity = count / (len(grams) + len(self._grams[entity_id]) - count)
+            if similarity < min_similarity:
+                continue
+            if similarity > best_similarity or (similarity == best_similarity and entity_id < best_id):
+                best_id, best_similarity = entity_id, similarity
+        return best_id
+
+
+@dataclass(frozen=True)
+class CatalogIndex:
+    """카탈로그 스냅샷의 검증용 인덱스"""
+    skills: NameIndex
+    items: NameIndex
+    item_slots: Dict[int, str]
+
+
+_index_lock = threading.Lock()
+_indexes: "weakref.WeakKeyDictionary[RecommendationCatalog, CatalogIndex]" = weakref.WeakKeyDictionary()
+
+
+def catalog_index(catalog: RecommendationCatalog) -> CatalogIndex:
+    """검증용 인덱스 (스냅샷별 1회 생성)"""
+    with _index_lock:
+        index = _indexes.get(catalog)
+    if index is None:
+        index = CatalogIndex(
+            skills=NameIndex((skill.id, skill.name) for skill in catalog.skills),
+            items=NameIndex((item.id, item.name) for item in catalog.items),
+            item_slots={item.id: item.slot for item in catalog.items}
+        )
+        with _index_lock:
+            index = _indexes.setdefault(catalog, index)
+    return index
+
+
+# ==============================================================================
+# 검증
+# ==============================================================================
+
+@dataclass
+class ValidationResult:
+    """검증 결과 (problems가 비어 있으면 통과)"""
+    problems: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+
+def _check_entries(
+    entries,
+    kind: str,
+    name_field: str,
+    id_field: str,
+    names_by_id: Dict[int, str],
+    problems: List[str]
+) -> None:
+    """추천 목록의 각 항목이 카탈로그의 같은 행(ID + 이름)을 가리키는지"""
+    if not isinstance(entries, list):
+        problems.append(f"{kind}: expected a list")
+        return
+
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            problems.append(f"{kind}[{position}]: expected an object")
+            continue
+        entry_id = entry.get(id_field)
+        name = entry.get(name_field)
+        if entry_id not in names_by_id:
+            problems.append(f"{kind}[{position}]: unknown {id_field} {entry_id!r} ({name!r})")
+        elif names_by_id[entry_id] != name:
+            problems.append(
+                f"{kind}[{position}]: {id_field} {entry_id} is {names_by_id[entry_id]!r}, not {name!r}"
+            )
+
+
+def validate_ai_build(recommendation: Dict, catalog: RecommendationCatalog) -> ValidationResult:
+    """
+    AI 추천 결과 검증
+
+    Args:
+        recommendation: AIRecommendationService 결과
+        catalog: 추천 시점의 카탈로그 스냅샷
+
+    Returns:
+        ValidationResult
+    """
+    index = catalog_index(catalog)
+    result = ValidationResult()
+    for required in REQUIRED_FIELDS:
+        if required not in recommendation:
+            result.problems.append(f"missing field '{required}'")
+
+    _check_entries(
+        recommendation.get("recommended_skills", []), "recommended_skills", "skill_name", "skill_id",
+        index.skills.names, result.problems
+    )
+    _check_entries(
+        recommendation.get("recommended_items", []), "recommended_items", "item_name", "item_id",
+        index.items.names, result.problems
+    )
+    return result
+
+
+# ==============================================================================
+# 복구
+# ==============================================================================
+
+@dataclass
+class ValidationReport:
+    """복구 결과 - 항목별 판정 수와 유효도 점수"""
+    entries: int = 0  # AI가 반환한 스킬/아이템 항목 수
+    valid: int = 0  # 그대로 맞은 항목
+    repaired: int = 0  # ID/이름을 고쳐서 남긴 항목
+    dropped: int = 0  # 찾을 수 없거나 중복이라 제거한 항목
+    problems: List[str] = field(default_factory=list)
+
+    @property
+    def score(self) -> float:
+        """유효도 점수 (그대로 맞은 항목 비율, 항목이 없으면 1.0)"""
+        return self.valid / self.entries if self.entries else 1.0
+
+    def to_metadata(self) -> Dict:
+        """ai_metadata용 요약"""
+        return {
+            "validity_score": round(self.score, 3),
+            "entries": self.entries,
+            "repaired": self.repaired,
+            "dropped": self.dropped,
+            "problems": self.problems[:5]
+        }
+
+
+def _coerce_id(value) -> Optional[int]:
+    """정수 ID ("12" 같은 문자열 포함, bool 제외)"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+
+def _resolve(entry_id: Optional[int], name, index: NameIndex) -> Tuple[Optional[int], bool]:
+    """
+    항목이 가리키는 카탈로그 ID
+
+    ID와 이름이 같은 행이면 그대로, 아니면 이름(정확히 일치 → 유사도) 우선,
+    이름으로 찾을 수 없으면 유효한 ID를 사용합니다.
+
+    Returns:
+        (ID 또는 None, ID와 이름이 일치했는지)
+    """
+    canonical = index.names.get(entry_id)
+    if canonical is not None and (canonical == name or normalize_name(canonical) == normalize_name(name)):
+        return entry_id, True
+
+    resolved = index.exact(name)
+    if resolved is None:
+        resolved = index.fuzzy(name)
+    if resolved is None and canonical is not None:
+        resolved = entry_id
+    return resolved, False
+
+
+def _repair_entries(
+    recommendation: Dict,
+    kind: str,
+    name_field: str,
+    id_field: str,
+    index: NameIndex,
+    report: ValidationReport,
+    slots: Optional[Dict[int, str]] = None
+) -> None:
+    """추천 목록 복구 (제자리 교체)"""
+    entries = recommendation.get(kind)
+    if not isinstance(entries, list):
+        report.problems.append(f"{kind}: expected a list")
+        recommendation[kind] = []
+        return
+
+    kept: List[Dict] = []
+    seen: Set[int] = set()
+    for position, entry in enumerate(entries):
+        report.entries += 1
+        if not isinstance(entry, dict):
+            report.dropped += 1
+            report.problems.append(f"{kind}[{position}]: expected an object")
+            continue
+
+        raw_id, name = entry.get(id_field), entry.get(name_field)
+        entry_id = _coerce_id(raw_id)
+        resolved, matched = _resolve(entry_id, name, index)
+        if resolved is None:
+            report.dropped += 1
+            report.problems.append(f"{kind}[{position}]: unknown {id_field} {raw_id!r} ({name!r})")
+            continue
+        if resolved in seen:
+            report.dropped += 1
+            report.problems.append(f"{kind}[{position}]: duplicate {id_field} {resolved}")
+            continue
+        seen.add(resolved)
+
+        canonical = index.names[resolved]
+        if matched and raw_id == resolved and name == canonical:
+            report.valid += 1
+        else:
+            report.repaired += 1
+            if not matched:
+                report.problems.append(f"{kind}[{position}]: {raw_id!r} ({name!r}) → {resolved} ({canonical!r})")
+        entry[id_field] = resolved
+        entry[name_field] = canonical
+        if slots is not None and not entry.get("slot"):
+            entry["slot"] = slots.get(resolved, "")
+        kept.append(entry)
+
+    recommendation[kind] = kept
+
+
+def repair_ai_build(recommendation: Dict, catalog: RecommendationCatalog) -> ValidationReport:
+    """
+    AI 추천 결과를 카탈로그에 맞게 복구 (제자리 수정)
+
+    Args:
+        recommendation: 파싱한 AI 응답
+        catalog: 추천 시점의 카탈로그 스냅샷
+
+    Returns:
+        ValidationReport (누락된 필수 필드도 problems에 포함)
+    """
+    index = catalog_index(catalog)
+    report = ValidationReport()
+    for required in REQUIRED_FIELDS:
+        if required not in recommendation:
+            report.problems.append(f"missing field '{required}'")
+
+    _repair_entries(recommendation, "recommended_skills", "skill_name", "skill_id", index.skills, report)
+    _repair_entries(
+        recommendation, "recommended_items", "item_name", "item_id", index.items, report, index.item_slots
+    )
+    return report
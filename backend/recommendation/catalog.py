@@ -0,0 +1,372 @@
+"""
+추천 카탈로그 스냅샷
+
+영웅/스킬/아이템/재능 노드 테이블을 한 번만 조회하고,
+재능과 무관한 특징(태그 파싱, DoT 판별, Spell Burst/Combo 여부 등)을 미리 계산합니다.
+ORM 객체 대신 단순 레코드만 보관하므로 프로세스 간 전달(pickle)이 가능합니다.
+
+스냅샷은 읽기 전용이므로 프로세스 전역으로 공유하고 (get_catalog),
+테이블 변경 횟수(catalog_revisions, DB 트리거가 갱신)가 바뀐 경우에만 다시 로드합니다.
+"""
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.orm import Session
+
+from backend.database.models import CatalogRevision, Hero, Skill, Item, ItemSet, TalentNode
+from backend.keyword_matcher import KeywordHits, register_keywords, scan_keywords
+from backend.recommendation.item_features import ItemFeatureIndex
+from backend.recommendation.talent_tree import TalentTree
+from backend.game_mechanics import (
+    get_ailment_for_damage_type,
+    get_recommended_stats_for_skill_tags,
+    is_spell_burst_compatible,
+    is_combo_skill
+)
+
+logger = logging.getLogger(__name__)
+
+
+# 태그 기반 DoT 감지 키워드
+DOT_TAG_KEYWORDS = ["DoT", "Damage Over Time", "Ailment", "Burn", "Bleed", "Poison"]
+
+# 설명 기반 DoT 감지 키워드
+DOT_DESCRIPTION_KEYWORDS = [
+    "damage over time", "dot", "per second",
+    "ignite", "trauma", "wilt", "bleed", "poison",
+    "burning", "erosion", "affliction"
+]
+
+# 카탈로그 지문에 포함하는 테이블 (RecommendationCatalog.load가 읽는 테이블)
+CATALOG_MODELS = (Hero, Skill, Item, TalentNode, ItemSet)
+
+RECHECK_INTERVAL = 2.0  # 테이블 변경 확인 간격 (초)
+
+register_keywords(
+    [keyword.lower() for keyword in DOT_TAG_KEYWORDS],
+    DOT_DESCRIPTION_KEYWORDS,
+    ["over time"]
+)
+
+
+@dataclass
+class HeroRecord:
+    """영웅 레코드"""
+    id: int
+    name: str
+    god_type: str
+    talent: str
+
+
+@dataclass
+class SkillRecord:
+    """스킬 레코드 + 재능 무관 특징"""
+    id: int
+    name: str
+    type: Optional[str]
+    description: Optional[str]
+    tags: Optional[str]  # 원본 JSON 문자열 (응답에 그대로 사용)
+    damage_type: Optional[str]
+    tag_list: List[str] = field(default_factory=list)
+    tags_lower: List[str] = field(default_factory=list)
+    type_lower: str = ""
+    tag_hits: Optional[KeywordHits] = None  # 태그 전체 키워드 스캔 결과
+    description_hits: Optional[KeywordHits] = None  # 설명 키워드 스캔 결과
+    is_dot: bool = False
+    ailment: Optional[str] = None
+    tag_synergy_count: int = 0
+    is_spell_burst_compatible: bool = False
+    is_combo: bool = False
+
+
+@dataclass
+class ItemRecord:
+    """아이템 레코드 + 재능 무관 특징"""
+    id: int
+    name: str
+    type: str
+    slot: str
+    rarity: Optional[str]
+    stat_type: Optional[str]
+    special_effects: Optional[str]
+    set_name: Optional[str]
+    effect_hits: Optional[KeywordHits] = None  # special_effects 키워드 스캔 결과
+    feature_mask: int = 0  # 특징 비트마스크 (ItemFeatureIndex 기준)
+
+
+@dataclass
+class SetBonusTier:
+    """세트 보너스 단계 (pieces개 이상 장착 시 활성화)"""
+    pieces: int
+    effect: str
+    feature_mask: int = 0  # 보너스 효과 특징 비트마스크 (ItemFeatureIndex 기준)
+
+
+@dataclass
+class ItemSetRecord:
+    """아이템 세트 레코드"""
+    set_name: str
+    pieces_required: int
+    tiers: Tuple[SetBonusTier, ...] = ()
+
+
+@dataclass
+class TalentNodeRecord:
+    """재능 노드 레코드"""
+    id: int
+    name: str
+    node_type: str
+    god_class: Optional[str]
+    tier: Optional[str]
+    effect: Optional[str]
+    effect_hits: Optional[KeywordHits] = None  # 효과 키워드 스캔 결과
+
+
+def parse_skill_tags(raw_tags: Optional[str]) -> List[str]:
+    """스킬 태그 JSON 파싱 (실패 시 빈 리스트)"""
+    if not raw_tags:
+        return []
+    try:
+        tags = json.loads(raw_tags)
+    except json.JSONDecodeError:
+        return []
+    return tags if isinstance(tags, list) else []
+
+
+def scan_tags(tags_lower: List[str]) -> KeywordHits:
+    """
+    태그 전체를 한 번에 스캔
+
+    줄바꿈으로 이어 붙여 스캔하므로 `kw in hits`는 `any(kw in tag for tag in tags)`와 같습니다.
+    """
+    return scan_keywords("\n".join(tags_lower))
+
+
+def detect_dot_skill(
+    tag_hits: KeywordHits,
+    description_hits: KeywordHits,
+    damage_type: Optional[str]
+) -> bool:
+    """태그/설명/데미지 타입으로 DoT 스킬 여부 판별"""
+    # 태그 기반 DoT 감지
+    if tag_hits.any_of(keyword.lower() for keyword in DOT_TAG_KEYWORDS):
+        return True
+
+    # 설명 기반 DoT 감지
+    if description_hits.any_of(DOT_DESCRIPTION_KEYWORDS):
+        return True
+
+    # 데미지 타입 기반 DoT 유추 (Fire와 Erosion은 DoT 경향이 있음)
+    return damage_type in ["Fire", "Erosion"] and "over time" in description_hits
+
+
+def build_skill_record(skill: Skill) -> SkillRecord:
+    """ORM 스킬을 특징이 계산된 레코드로 변환"""
+    tag_list = parse_skill_tags(skill.tags)
+    tags_lower = [tag.lower() for tag in tag_list]
+    tag_hits = scan_tags(tags_lower)
+    description_hits = scan_keywords(skill.description)
+
+    ailment = None
+    if skill.damage_type:
+        ailment = get_ailment_for_damage_type(skill.damage_type)
+
+    return SkillRecord(
+        id=skill.id,
+        name=skill.name,
+        type=skill.type,
+        description=skill.description,
+        tags=skill.tags,
+        damage_type=skill.damage_type,
+        tag_list=tag_list,
+        tags_lower=tags_lower,
+        type_lower=skill.type.lower() if skill.type else "",
+        tag_hits=tag_hits,
+        description_hits=description_hits,
+        is_dot=detect_dot_skill(tag_hits, description_hits, skill.damage_type),
+        ailment=ailment,
+        tag_synergy_count=len(get_recommended_stats_for_skill_tags(tag_list)),
+        is_spell_burst_compatible=is_spell_burst_compatible(tag_list),
+        is_combo=is_combo_skill(tag_list)
+    )
+
+
+def build_item_record(item: Item) -> ItemRecord:
+    """ORM 아이템을 레코드로 변환"""
+    return ItemRecord(
+        id=item.id,
+        name=item.name,
+        type=item.type,
+        slot=item.slot,
+        rarity=item.rarity,
+        stat_type=item.stat_type,
+        special_effects=item.special_effects,
+        set_name=item.set_name,
+        effect_hits=scan_keywords(item.special_effects)
+    )
+
+
+def build_item_set_record(item_set: ItemSet) -> ItemSetRecord:
+    """ORM 아이템 세트를 레코드로 변환 (2/4/6피스 보너스 중 효과가 있는 단계만)"""
+    tiers = tuple(
+        SetBonusTier(pieces=pieces, effect=effect)
+        for pieces, effect in (
+            (2, item_set.set_bonus_2), (4, item_set.set_bonus_4), (6, item_set.set_bonus_6)
+        )
+        if effect
+    )
+    return ItemSetRecord(
+        set_name=item_set.set_name,
+        pieces_required=item_set.pieces_required,
+        tiers=tiers
+    )
+
+
+def build_talent_node_record(node: TalentNode) -> TalentNodeRecord:
+    """ORM 재능 노드를 레코드로 변환"""
+    return TalentNodeRecord(
+        id=node.id,
+        name=node.name,
+        node_type=node.node_type,
+        god_class=node.god_class,
+        tier=node.tier,
+        effect=node.effect,
+        effect_hits=scan_keywords(node.effect)
+    )
+
+
+class RecommendationCatalog:
+    """추천 엔진이 사용하는 카탈로그 스냅샷"""
+
+    def __init__(
+        self,
+        heroes: List[HeroRecord],
+        skills: List[SkillRecord],
+        items: List[ItemRecord],
+        talent_nodes: List[TalentNodeRecord],
+        item_sets: Optional[List[ItemSetRecord]] = None,
+        effect_keywords: Sequence[str] = ()
+    ):
+        self.heroes = {hero.id: hero for hero in heroes}
+        self.skills = skills
+        self.items = items
+        self.talent_nodes = talent_nodes
+        self.talent_tree = TalentTree(talent_nodes)
+        self.item_sets = {item_set.set_name: item_set for item_set in item_sets or []}
+
+        # 아이템 특징 인덱스 (스킬 데미지 타입/상태이상, 스코어링 규칙 키워드까지 효과 키워드로 포함)
+        damage_types = {skill.damage_type for skill in skills if skill.damage_type}
+        self.item_features = ItemFeatureIndex(
+            sorted(damage_types) + sorted({skill.ailment for skill in skills if skill.ailment})
+            + list(effect_keywords)
+        )
+        for item in items:
+            item.feature_mask = self.item_features.item_mask(
+                item.effect_hits, item.special_effects,
+                item.stat_type, item.rarity, item.slot, item.set_name
+            )
+        for item_set in self.item_sets.values():
+            for tier in item_set.tiers:
+                tier.feature_mask = self.item_features.item_mask(
+                    scan_keywords(tier.effect), tier.effect, None, None, None, None
+                )
+
+    @classmethod
+    def load(cls, db: Session, effect_keywords: Sequence[str] = ()) -> "RecommendationCatalog":
+        """
+        DB에서 전체 카탈로그를 한 번에 로드
+
+        Args:
+            db: DB 세션
+            effect_keywords: 특징 비트를 추가로 할당할 아이템 효과 키워드 (스코어링 규칙 키워드)
+        """
+        heroes = [
+            HeroRecord(id=h.id, name=h.name, god_type=h.god_type, talent=h.talent)
+            for h in db.query(Hero).all()
+        ]
+        skills = [build_skill_record(s) for s in db.query(Skill).all()]
+        items = [build_item_record(i) for i in db.query(Item).all()]
+        talent_nodes = [build_talent_node_record(n) for n in db.query(TalentNode).all()]
+        item_sets = [build_item_set_record(s) for s in db.query(ItemSet).all()]
+        return cls(heroes, skills, items, talent_nodes, item_sets, effect_keywords)
+
+    def get_hero(self, hero_id: int) -> Optional[HeroRecord]:
+        """영웅 조회"""
+        return self.heroes.get(hero_id)
+
+
+# ==============================================================================
+# 프로세스 전역 카탈로그
+# ==============================================================================
+
+_lock = threading.Lock()
+_catalogs: Dict[Tuple[str, ...], RecommendationCatalog] = {}  # 효과 키워드별 스냅샷
+_bind = None
+_fingerprint: Optional[Tuple] = None
+_last_checked = 0.0
+
+
+def catalog_fingerprint(db: Session, models: Sequence = CATALOG_MODELS) -> Tuple:
+    """
+    카탈로그 테이블 변경 감지용 지문 (조회 쿼리 1회)
+
+    catalog_revisions는 DB 트리거가 행 INSERT/UPDATE/DELETE마다 증가시키므로,
+    길이가 같은 제자리 수정이나 다른 프로세스(크롤러)의 변경도 감지합니다.
+
+    Returns:
+        테이블별 (테이블 이름, 변경 횟수) 튜플
+    """
+    names = [model.__tablename__ for model in models]
+    revisions = dict(
+        db.query(CatalogRevision.table_name, CatalogRevision.revision).filter(
+            CatalogRevision.table_name.in_(names)
+        ).all()
+    )
+    return tuple((name, revisions.get(name, 0)) for name in names)
+
+
+def get_catalog(db: Session, effect_keywords: Sequence[str] = ()) -> RecommendationCatalog:
+    """
+    공유 카탈로그 스냅샷 (RECHECK_INTERVAL 간격으로 테이블 변경 확인 후 필요 시 다시 로드)
+
+    Args:
+        db: DB 세션 (다른 DB에 연결된 세션이면 바로 다시 확인)
+        effect_keywords: 특징 비트를 추가로 할당할 아이템 효과 키워드 (스코어링 규칙 키워드)
+    """
+    global _bind, _fingerprint, _last_checked
+
+    key = tuple(effect_keywords)
+    bind = db.get_bind()
+    now = time.monotonic()
+    with _lock:
+        catalog = _catalogs.get(key)
+        if catalog is not None and bind is _bind and now - _last_checked < RECHECK_INTERVAL:
+            return catalog
+
+    fingerprint = catalog_fingerprint(db)
+    with _lock:
+        if bind is not _bind or fingerprint != _fingerprint:
+            _catalogs.clear()
+            _bind, _fingerprint = bind, fingerprint
+        _last_checked = now
+        catalog = _catalogs.get(key)
+        if catalog is not None:
+            return catalog
+
+    catalog = RecommendationCatalog.load(db, effect_keywords)
+    with _lock:
+        if _bind is bind and _fingerprint == fingerprint:
+            _catalogs[key] = catalog
+    logger.info(f"Loaded recommendation catalog ({len(catalog.skills)} skills, {len(catalog.items)} items)")
+    return catalog
+
+
+def invalidate_catalog():
+    """카탈로그 변경 시 호출 - 다음 조회 때 다시 로드"""
+    global _fingerprint
+    with _lock:
+        _catalogs.clear()
+        _fingerprint = None
@@ -1,13 +1,162 @@
 """
 Context Builder - AI 프롬프트용 컨텍스트 생성
 DB에서 관련 데이터를 쿼리하고 구조화된 프롬프트를 생성합니다.
+
+스킬/아이템은 룰 엔진의 캐시된 점수 순위(재능 프로필 + 플레이스타일 기준)로 관련도 상위 후보만 고릅니다.
+
+프롬프트 캐싱용으로 카탈로그를 ID 순서로 요약한 다이제스트(영웅과 무관, 카탈로그 스냅샷 + 토큰 예산별 1회 생성)와
+영웅별 짧은 접미부(영웅/재능/후보 ID/선호도)를 따로 만들 수도 있습니다.
 """
 import json
-from typing import Dict, List, Optional
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 from sqlalchemy.orm import Session
 
 from backend.database.models import Hero, Skill, Item, TalentLevel, TalentNode
+from backend.recommendation.catalog import RecommendationCatalog
+from backend.recommendation.engine_v2 import RecommendationEngineV2
 from backend.recommendation.mechanics_analyzer import MechanicsAnalyzer
+from backend.recommendation.prompt_budget import (
+    BudgetedPrompt, TokenBudget, estimate_lines, estimate_tokens, mechanic_sentences, tokenizer_name
+)
+
+
+# 프롬프트에 포함하는 최대 후보 수 (format_context_for_prompt)
+PROMPT_MAX_SKILLS = 30
+PROMPT_MAX_ITEMS = 20
+
+# AI가 고를 개수 대비 프롬프트 후보 배수 (관련도 상위만 포함)
+CANDIDATES_PER_PICK = 3
+
+
+# 카탈로그 다이제스트에 포함하는 최대 항목 수 (ID 순서, 넘는 후보는 접미부에 직접 기술)
+DIGEST_MAX_SKILLS = 100
+DIGEST_MAX_ITEMS = 100
+
+# cached_prefix 배치에서 다이제스트에 쓰는 프롬프트 토큰 예산 비율 (나머지는 영웅별 접미부)
+DIGEST_BUDGET_SHARE = 0.5
+
+
+def candidate_limits(max_skills: int, max_items: int) -> Tuple[int, int]:
+    """AI 요청 개수 → 컨텍스트에 넣을 스킬/아이템 후보 수"""
+    return (
+        min(max_skills * CANDIDATES_PER_PICK, PROMPT_MAX_SKILLS),
+        min(max_items * CANDIDATES_PER_PICK, PROMPT_MAX_ITEMS)
+    )
+
+
+@dataclass(frozen=True)
+class CatalogDigest:
+    """카탈로그 다이제스트 (프롬프트 캐시 접두부용, 같은 스냅샷이면 같은 바이트열)"""
+    text: str
+    skill_ids: FrozenSet[int]
+    item_ids: FrozenSet[int]
+    tokens: int
+
+
+# 카탈로그 스냅샷별 다이제스트 (토큰 예산별, 스냅샷이 교체되면 함께 사라짐)
+_digest_lock = threading.Lock()
+_digests: "weakref.WeakKeyDictionary[RecommendationCatalog, Dict[Optional[int], CatalogDigest]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def catalog_digest(catalog: RecommendationCatalog, token_budget: Optional[int] = None) -> CatalogDigest:
+    """
+    카탈로그 다이제스트 (스냅샷 + 예산별 1회 생성)
+
+    Args:
+        catalog: 카탈로그 스냅샷
+        token_budget: 다이제스트 최대 토큰 수 (None이면 DIGEST_MAX_* 개수까지)
+    """
+    with _digest_lock:
+        digest = _digests.get(catalog, {}).get(token_budget)
+    if digest is None:
+        digest = _render_catalog_digest(catalog, token_budget)
+        with _digest_lock:
+            digest = _digests.setdefault(catalog, {}).setdefault(token_budget, digest)
+    return digest
+
+
+def _render_catalog_digest(catalog: RecommendationCatalog, token_budget: Optional[int] = None) -> CatalogDigest:
+    """
+    스킬/아이템을 ID 순서로 한 줄씩 요약 (설명/효과는 메커니즘 문장만)
+
+    예산이 있으면 스킬/아이템을 순위 비율대로 번갈아 예산이 허락하는 만큼만 넣습니다.
+    """
+    skill_rows = sorted(catalog.skills, key=lambda skill: skill.id)[:DIGEST_MAX_SKILLS]
+    item_rows = sorted(catalog.items, key=lambda item: item.id)[:DIGEST_MAX_ITEMS]
+
+    # 1. 항목별 요약 줄
+    skill_lines = []
+    for skill in skill_rows:
+        description = mechanic_sentences(skill.description, max_sentences=1, max_chars=160)
+        skill_lines.append(
+            f"{skill.id} | {skill.name} | {skill.type or '-'} | {skill.damage_type or '-'} | "
+            f"{skill.ailment or '-'} | {', '.join(skill.tag_list[:5])} | {description}"
+        )
+    item_lines = []
+    for item in item_rows:
+        effects = [
+            mechanic_sentences(str(effect), max_sentences=1, max_chars=120)
+            for effect in _parse_effects(item.special_effects)[:2]
+        ]
+        item_lines.append(
+            f"{item.id} | {item.name} | {item.slot} | {item.rarity or '-'} | {item.stat_type or '-'} | "
+            f"{item.set_name or '-'} | {'; '.join(effect for effect in effects if effect)}"
+        )
+
+    # 2. 예산 안에서 순위 비율 순서로 채우기 (예산을 넘는 첫 항목에서 해당 종류 중단)
+    skills_header = "## SKILLS (ID | Name | Type | Damage | Ailment | Tags | Mechanics)"
+    items_header = "## ITEMS (ID | Name | Slot | Rarity | Stat | Set | Effects)"
+    budget = TokenBudget(token_budget)
+    budget.spend(estimate_lines([
+        f"# CATALOG DIGEST ({len(skill_rows)} skills, {len(item_rows)} items)", "", skills_header, "", items_header
+    ]))
+    counts = [0, 0]
+    stopped: Set[int] = set()
+    order = sorted(
+        [(rank / len(skill_lines), 0, rank) for rank in range(len(skill_lines))]
+        + [(rank / len(item_lines), 1, rank) for rank in range(len(item_lines))]
+    )
+    for _, kind, rank in order:
+        if kind in stopped:
+            continue
+        cost = estimate_lines([(skill_lines, item_lines)[kind][rank]])
+        if not budget.fits(cost):
+            stopped.add(kind)
+            continue
+        budget.spend(cost)
+        counts[kind] += 1
+
+    skills, items = skill_rows[:counts[0]], item_rows[:counts[1]]
+    lines = [f"# CATALOG DIGEST ({len(skills)} skills, {len(items)} items)", ""]
+    lines.append(skills_header)
+    lines.extend(skill_lines[:counts[0]])
+    lines.append("")
+    lines.append(items_header)
+    lines.extend(item_lines[:counts[1]])
+
+    text = "\n".join(lines)
+    return CatalogDigest(
+        text=text,
+        skill_ids=frozenset(skill.id for skill in skills),
+        item_ids=frozenset(item.id for item in items),
+        tokens=estimate_tokens(text)
+    )
+
+
+def _parse_effects(raw: Optional[str]) -> List:
+    """special_effects JSON 파싱 (JSON이 아니면 문자열 그대로)"""
+    if not raw:
+        return []
+    try:
+        effects = json.loads(raw)
+    except json.JSONDecodeError:
+        return [raw]
+    return effects if isinstance(effects, list) else [effects]
 
 
 class ContextBuilder:
@@ -44,13 +193,19 @@ class ContextBuilder:
         # 2. 재능 레벨 효과 조회 (핵심 메커니즘)
         talent_levels = self._get_talent_levels(hero.talent)
 
-        # 3. 관련 스킬 조회 (필터링)
-        relevant_skills = self._get_relevant_skills(hero, playstyle, max_skills)
+        # 3. 관련도 순위 (재능/플레이스타일 기준 룰 점수, 카탈로그 스냅샷 캐시 사용)
+        engine = RecommendationEngineV2(self.db)
+        ranked_skills, ranked_items = engine.rank_candidates(hero.id, playstyle, max_skills, max_items)
 
-        # 4. 관련 아이템 조회 (필터링)
-        relevant_items = self._get_relevant_items(hero, max_items)
+        # 4. 관련 스킬 조회 (순위 상위)
+        relevant_skills = self._get_relevant_skills(
+            hero, playstyle, [skill.id for skill in ranked_skills]
+        )
 
-        # 5. 컨텍스트 구조화
+        # 5. 관련 아이템 조회 (순위 상위)
+        relevant_items = self._get_relevant_items(hero, [item.id for item in ranked_items])
+
+        # 6. 컨텍스트 구조화
         context = {
             "hero": {
                 "id": hero.id,
@@ -64,7 +219,8 @@ class ContextBuilder:
             "available_items": relevant_items,
             "user_preferences": {
                 "playstyle": playstyle
-            }
+            },
+            "catalog": engine.catalog  # AI 응답 검증용 스냅샷
         }
 
         return context
@@ -89,11 +245,10 @@ class ContextBuilder:
         self,
         hero: Hero,
         playstyle: Optional[str],
-        max_skills: int
+        skill_ids: List[int]
     ) -> List[Dict]:
-        """관련 스킬 조회 및 필터링 (메커니즘 분석 포함)"""
-        # 모든 스킬 조회 (실제로는 필터링 최적화 가능)
-        skills = self.db.query(Skill).limit(max_skills).all()
+        """관련 스킬 조회 (순위 순서 유지, 메커니즘 분석 포함)"""
+        skills = self._query_in_order(Skill, skill_ids)
 
         skill_list = []
         for skill in skills:
@@ -105,19 +260,19 @@ class ContextBuilder:
                 except json.JSONDecodeError:
                     tags = []
 
-            skill_dict = {
-                "id": skill.id,
-                "name": skill.name,
-                "type": skill.type,
-                "description": skill.description,
-                "tags": tags,
-                "damage_type": skill.damage_type,
-                "cooldown": skill.cooldown,
-                "mana_cost": skill.mana_cost
-            }
-
-            # 메커니즘 분석 수행
-            mechanics_analysis = self.mechanics_analyzer.analyze_skill_mechanics(skill_dict)
+            # 메커니즘 분석 결과 (저장 시 계산된 컬럼, 백필 전 행만 즉석 분석)
+            if skill.mechanics_mask is not None:
+                mechanics = {
+                    "build_style": skill.build_style,
+                    "ailment": skill.ailment,
+                    "mechanics_mask": skill.mechanics_mask
+                }
+            else:
+                mechanics = self.mechanics_analyzer.skill_mechanics_columns({
+                    "tags": tags,
+                    "description": skill.description,
+                    "damage_type": skill.damage_type
+                })
 
             skill_data = {
                 "id": skill.id,
@@ -129,9 +284,9 @@ class ContextBuilder:
                 "cooldown": skill.cooldown,
                 "mana_cost": skill.mana_cost,
                 # 메커니즘 분석 결과 추가
-                "build_style": mechanics_analysis["build_style"],
-                "ailment": mechanics_analysis["ailment"],
-                "mechanics": list(mechanics_analysis["mechanics"])
+                "build_style": mechanics["build_style"],
+                "ailment": mechanics["ailment"],
+                "mechanics": MechanicsAnalyzer.mask_to_mechanics(mechanics["mechanics_mask"])
             }
 
             # 플레이스타일 필터링 (선택사항)
@@ -144,15 +299,9 @@ class ContextBuilder:
 
         return skill_list
 
-    def _get_relevant_items(self, hero: Hero, max_items: int) -> List[Dict]:
-        """관련 아이템 조회 및 필터링"""
-        # 영웅의 주 스탯과 매칭되는 아이템 우선
-        primary_stat = self._get_primary_stat(hero.god_type)
-
-        # 주 스탯 아이템 + 레전더리 아이템
-        items = self.db.query(Item).filter(
-            (Item.stat_type == primary_stat) | (Item.rarity == "Legendary")
-        ).limit(max_items).all()
+    def _get_relevant_items(self, hero: Hero, item_ids: List[int]) -> List[Dict]:
+        """관련 아이템 조회 (순위 순서 유지 - 슬롯별 최고 아이템 먼저)"""
+        items = self._query_in_order(Item, item_ids)
 
         item_list = []
         for item in items:
@@ -178,98 +327,233 @@ class ContextBuilder:
 
         return item_list
 
-    def _get_primary_stat(self, god_type: str) -> str:
-        """God Type에 따른 주 스탯 반환"""
-        if "Might" in god_type or "Berserker" in god_type:
-            return "STR"
-        elif "Cunning" in god_type or "Ranger" in god_type:
-            return "DEX"
-        elif "Wisdom" in god_type or "Mage" in god_type:
-            return "INT"
-        else:
-            return "STR"  # 기본값
-
-    def format_context_for_prompt(self, context: Dict) -> str:
+    def _query_in_order(self, model, ids: List[int]) -> List:
+        """ID 목록의 행을 목록 순서대로 조회"""
+        rows = {row.id: row for row in self.db.query(model).filter(model.id.in_(ids))} if ids else {}
+        return [rows[row_id] for row_id in ids if row_id in rows]
+
+    def format_context_for_prompt(self, context: Dict, token_budget: Optional[int] = None) -> str:
         """
         컨텍스트를 AI 프롬프트용 텍스트로 변환
 
         Args:
             context: build_hero_context()의 반환값
+            token_budget: 토큰 예산 (None이면 상위 후보 전체를 원문 그대로 포함)
 
         Returns:
             포맷팅된 프롬프트 문자열
         """
-        hero = context["hero"]
-        talent_mechanics = context["talent_mechanics"]
+        if token_budget is not None:
+            return self.format_context_with_budget(context, token_budget).text
+
         skills = context["available_skills"]
         items = context["available_items"]
-        user_prefs = context["user_preferences"]
 
         prompt_parts = []
 
-        # 1. 영웅 정보
-        prompt_parts.append("# HERO INFORMATION")
-        prompt_parts.append(f"Name: {hero['name']}")
-        prompt_parts.append(f"Talent: {hero['talent']}")
-        prompt_parts.append(f"God Type: {hero['god_type']}")
-        if hero.get('description'):
-            prompt_parts.append(f"Description: {hero['description']}")
-        prompt_parts.append("")
-
-        # 2. 재능 메커니즘 (핵심!)
-        prompt_parts.append("# TALENT MECHANICS (CRITICAL)")
-        for tl in talent_mechanics:
-            prompt_parts.append(f"Level {tl['level']} - {tl['effect_name']}:")
-            prompt_parts.append(f"  {tl['effect_description']}")
-            if tl['mechanics']:
-                prompt_parts.append(f"  Keywords: {', '.join(tl['mechanics'])}")
-        prompt_parts.append("")
+        # 1. 영웅 정보 / 2. 재능 메커니즘 (핵심!)
+        prompt_parts.extend(self._hero_lines(context))
 
         # 3. 사용 가능한 스킬
         prompt_parts.append(f"# AVAILABLE SKILLS (Total: {len(skills)})")
-        for skill in skills[:30]:  # 최대 30개만 포함
-            prompt_parts.append(f"- {skill['name']} (ID: {skill['id']}, {skill['type']})")
-            prompt_parts.append(f"  Damage: {skill['damage_type']}, Tags: {', '.join(skill['tags'][:5])}")
-
-            # 메커니즘 분석 결과 표시
-            if skill.get('build_style') and skill['build_style'] != 'Unknown':
-                mechanics_info = f"  Build Style: {skill['build_style']}"
-                if skill.get('ailment'):
-                    mechanics_info += f" → {skill['ailment']}"
-                prompt_parts.append(mechanics_info)
-
-            if skill.get('mechanics'):
-                prompt_parts.append(f"  Mechanics: {', '.join(skill['mechanics'])}")
-
-            if skill.get('description'):
-                prompt_parts.append(f"  Description: {skill['description']}")
-
-            if skill.get('playstyle_match'):
-                prompt_parts.append(f"  ⭐ MATCHES USER PLAYSTYLE")
+        for skill in skills[:PROMPT_MAX_SKILLS]:  # 관련도 상위만 포함
+            prompt_parts.extend(self._skill_lines(skill, skill.get('description')))
         prompt_parts.append("")
 
         # 4. 사용 가능한 아이템
         prompt_parts.append(f"# AVAILABLE ITEMS (Total: {len(items)})")
-        for item in items[:20]:  # 최대 20개만 포함
-            prompt_parts.append(f"- {item['name']} (ID: {item['id']}, {item['slot']}, {item['rarity']})")
-            prompt_parts.append(f"  Stat: {item['stat_type']}, Type: {item['type']}")
-            if item.get('set_name'):
-                prompt_parts.append(f"  Set: {item['set_name']}")
-            if item.get('special_effects') and len(item['special_effects']) > 0:
-                # 모든 효과를 포함
-                for i, effect in enumerate(item['special_effects'][:5], 1):  # 최대 5개 효과
-                    effect_str = str(effect)
-                    prompt_parts.append(f"  Effect {i}: {effect_str}")
+        for item in items[:PROMPT_MAX_ITEMS]:  # 관련도 상위만 포함
+            effects = [str(effect) for effect in item.get('special_effects') or []][:5]  # 최대 5개 효과
+            prompt_parts.extend(self._item_lines(item, effects))
         prompt_parts.append("")
 
         # 5. 사용자 선호도
-        if user_prefs.get('playstyle'):
-            prompt_parts.append("# USER PREFERENCES")
-            prompt_parts.append(f"Preferred Playstyle: {user_prefs['playstyle']}")
-            prompt_parts.append("")
+        prompt_parts.extend(self._preference_lines(context))
 
         return "\n".join(prompt_parts)
 
+    def format_context_with_budget(
+        self,
+        context: Dict,
+        token_budget: Optional[int],
+        digest: Optional[CatalogDigest] = None
+    ) -> BudgetedPrompt:
+        """
+        토큰 예산 안에 맞춘 프롬프트 컨텍스트
+
+        영웅/재능/선호도는 항상 포함하고, 스킬과 아이템은 관련도 순위 비율대로 번갈아
+        예산이 허락하는 만큼 상위부터 채웁니다. 설명은 메커니즘 문장만 남기고,
+        앞 항목에서 이미 쓴 문장/효과는 반복하지 않습니다.
+
+        digest가 있으면 다이제스트에 있는 후보는 이름/ID 한 줄로만 참조합니다
+        (프롬프트 캐시 접두부에 다이제스트가 들어가는 경우의 영웅별 접미부).
+
+        Args:
+            context: build_hero_context()의 반환값
+            token_budget: 컨텍스트 텍스트에 쓸 최대 토큰 수 (None이면 제한 없음)
+            digest: 프롬프트 접두부에 포함된 카탈로그 다이제스트
+
+        Returns:
+            BudgetedPrompt (텍스트 + 추정 토큰 수 + 포함된 후보 수)
+        """
+        skills = context["available_skills"][:PROMPT_MAX_SKILLS]
+        items = context["available_items"][:PROMPT_MAX_ITEMS]
+
+        # 1. 필수 섹션 (영웅/재능/선호도 + 스킬/아이템 섹션 제목)
+        head = self._hero_lines(context)
+        tail = self._preference_lines(context)
+        suffix = " - details in CATALOG DIGEST" if digest is not None else ""
+        budget = TokenBudget(token_budget)
+        budget.spend(estimate_lines(head) + estimate_lines(tail) + estimate_lines([
+            f"# AVAILABLE SKILLS (Top {len(skills)} of {len(skills)}{suffix})", "",
+            f"# AVAILABLE ITEMS (Top {len(items)} of {len(items)}{suffix})", ""
+        ]))
+
+        # 2. 순위 비율 순서로 스킬/아이템 채우기 (예산을 넘는 첫 항목에서 해당 종류 중단)
+        order = sorted(
+            [(rank / len(skills), 0, rank) for rank in range(len(skills))]
+            + [(rank / len(items), 1, rank) for rank in range(len(items))]
+        )
+        skill_sentences: Set[str] = set()
+        effect_owners: Dict[str, str] = {}
+        entries: Tuple[List[str], List[str]] = ([], [])
+        counts = [0, 0]
+        stopped: Set[int] = set()
+
+        for _, kind, rank in order:
+            if kind in stopped:
+                continue
+            if kind == 0:
+                skill = skills[rank]
+                if digest is not None and skill['id'] in digest.skill_ids:
+                    lines = [self._reference_line(skill)]
+                else:
+                    lines = self._compact_skill_lines(skill, skill_sentences)
+            else:
+                item = items[rank]
+                if digest is not None and item['id'] in digest.item_ids:
+                    lines = [self._reference_line(item)]
+                else:
+                    lines = self._compact_item_lines(item, effect_owners)
+
+            cost = estimate_lines(lines)
+            if not budget.fits(cost):
+                stopped.add(kind)
+                continue
+            budget.spend(cost)
+            entries[kind].extend(lines)
+            counts[kind] += 1
+
+        # 3. 조립
+        prompt_parts = list(head)
+        prompt_parts.append(f"# AVAILABLE SKILLS (Top {counts[0]} of {len(context['available_skills'])}{suffix})")
+        prompt_parts.extend(entries[0])
+        prompt_parts.append("")
+        prompt_parts.append(f"# AVAILABLE ITEMS (Top {counts[1]} of {len(context['available_items'])}{suffix})")
+        prompt_parts.extend(entries[1])
+        prompt_parts.append("")
+        prompt_parts.extend(tail)
+
+        text = "\n".join(prompt_parts)
+        return BudgetedPrompt(
+            text=text,
+            tokens_used=estimate_tokens(text),
+            token_budget=token_budget,
+            skills_included=counts[0],
+            skills_total=len(context["available_skills"]),
+            items_included=counts[1],
+            items_total=len(context["available_items"]),
+            tokenizer=tokenizer_name()
+        )
+
+    def _hero_lines(self, context: Dict) -> List[str]:
+        """영웅 정보 + 재능 메커니즘 섹션"""
+        hero = context["hero"]
+        lines = ["# HERO INFORMATION"]
+        lines.append(f"Name: {hero['name']}")
+        lines.append(f"Talent: {hero['talent']}")
+        lines.append(f"God Type: {hero['god_type']}")
+        if hero.get('description'):
+            lines.append(f"Description: {hero['description']}")
+        lines.append("")
+
+        lines.append("# TALENT MECHANICS (CRITICAL)")
+        for tl in context["talent_mechanics"]:
+            lines.append(f"Level {tl['level']} - {tl['effect_name']}:")
+            lines.append(f"  {tl['effect_description']}")
+            if tl['mechanics']:
+                lines.append(f"  Keywords: {', '.join(tl['mechanics'])}")
+        lines.append("")
+        return lines
+
+    def _preference_lines(self, context: Dict) -> List[str]:
+        """사용자 선호도 섹션"""
+        user_prefs = context["user_preferences"]
+        if not user_prefs.get('playstyle'):
+            return []
+        return ["# USER PREFERENCES", f"Preferred Playstyle: {user_prefs['playstyle']}", ""]
+
+    def _skill_lines(self, skill: Dict, description: Optional[str]) -> List[str]:
+        """스킬 1개 항목"""
+        lines = [f"- {skill['name']} (ID: {skill['id']}, {skill['type']})"]
+        lines.append(f"  Damage: {skill['damage_type']}, Tags: {', '.join(skill['tags'][:5])}")
+
+        # 메커니즘 분석 결과 표시
+        if skill.get('build_style') and skill['build_style'] != 'Unknown':
+            mechanics_info = f"  Build Style: {skill['build_style']}"
+            if skill.get('ailment'):
+                mechanics_info += f" → {skill['ailment']}"
+            lines.append(mechanics_info)
+
+        if skill.get('mechanics'):
+            lines.append(f"  Mechanics: {', '.join(skill['mechanics'])}")
+
+        if description:
+            lines.append(f"  Description: {description}")
+
+        if skill.get('playstyle_match'):
+            lines.append(f"  ⭐ MATCHES USER PLAYSTYLE")
+        return lines
+
+    def _item_lines(self, item: Dict, effects: List[str], shared_with: Optional[List[str]] = None) -> List[str]:
+        """아이템 1개 항목"""
+        lines = [f"- {item['name']} (ID: {item['id']}, {item['slot']}, {item['rarity']})"]
+        lines.append(f"  Stat: {item['stat_type']}, Type: {item['type']}")
+        if item.get('set_name'):
+            lines.append(f"  Set: {item['set_name']}")
+        for i, effect in enumerate(effects, 1):
+            lines.append(f"  Effect {i}: {effect}")
+        if shared_with:
+            lines.append(f"  Same effects as: {', '.join(shared_with)}")
+        return lines
+
+    def _reference_line(self, entry: Dict) -> str:
+        """다이제스트에 있는 후보 참조 (이름/ID만)"""
+        line = f"- {entry['name']} (ID: {entry['id']})"
+        if entry.get('playstyle_match'):
+            line += " ⭐ MATCHES USER PLAYSTYLE"
+        return line
+
+    def _compact_skill_lines(self, skill: Dict, seen_sentences: Set[str]) -> List[str]:
+        """예산 모드 스킬 항목 (메커니즘 문장만, 앞 스킬과 겹치는 문장 제외)"""
+        return self._skill_lines(skill, mechanic_sentences(skill.get('description'), seen=seen_sentences))
+
+    def _compact_item_lines(self, item: Dict, effect_owners: Dict[str, str]) -> List[str]:
+        """예산 모드 아이템 항목 (앞 아이템과 같은 효과는 아이템 이름으로 대체)"""
+        effects: List[str] = []
+        shared_with: List[str] = []
+        for effect in (item.get('special_effects') or [])[:5]:
+            key = " ".join(str(effect).lower().split())
+            owner = effect_owners.setdefault(key, item['name'])
+            if owner != item['name']:
+                if owner not in shared_with:
+                    shared_with.append(owner)
+                continue
+            trimmed = mechanic_sentences(str(effect), max_chars=160)
+            if trimmed and trimmed not in effects:
+                effects.append(trimmed)
+        return self._item_lines(item, effects, shared_with)
+
     def get_build_suggestions(self, context: Dict) -> Dict:
         """
         컨텍스트 기반 빌드 제안 생성 (메커니즘 분석 활용)
@@ -1,12 +1,22 @@
 """
 빌드 추천 엔진 v2 - 게임 메커니즘 기반
+
+점수 계산 결과는 카탈로그 스냅샷별로 캐시합니다.
+- 스킬: 플레이스타일을 참조하지 않는 규칙 구간 점수(영웅 컨텍스트별 기본 벡터)를 캐시하고,
+  요청마다 플레이스타일 규칙 구간만 계산해 더한 뒤 상위 k개를 다시 선택
+- 아이템/재능 노드: 규칙 컨텍스트별 점수 순위를 캐시하고 개수 제한만 다시 적용
 """
-import json
-from typing import List, Dict, Optional
+import heapq
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain, islice
+from typing import Callable, List, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
-from collections import Counter
+from collections import Counter, OrderedDict
 
-from backend.database.models import Hero, Skill, Item, TalentNode, TalentLevel
 from backend.game_mechanics import (
     DAMAGE_TYPES, DAMAGE_FORMS, AILMENTS, SKILL_TAG_SYNERGIES,
     STAT_EFFECTS, SPELL_BURST, COMBO,
@@ -14,32 +24,247 @@ from backend.game_mechanics import (
     should_avoid_crit_for_skill,
     get_skill_speed_type,
     get_ailment_for_damage_type,
-    get_recommended_stats_for_skill_tags,
     get_recommended_stats_for_damage_form,
     get_recommended_stats_for_ailment,
-    is_spell_burst_compatible,
-    is_combo_skill,
     is_dot_ailment,
     should_focus_on_stacking
 )
 from backend.talent_mechanics import (
-    get_talent_mechanics,
     get_talent_build_focus,
-    get_talent_must_have_mechanics,
-    get_talent_avoid_mechanics,
-    get_recommended_skill_types,
-    get_recommended_item_stats,
-    is_burst_focused_talent,
     get_talent_playstyle
 )
+from backend.instrumentation import span
+from backend.recommendation.catalog import (
+    RecommendationCatalog, HeroRecord, SkillRecord, ItemRecord, TalentNodeRecord, get_catalog
+)
+from backend.recommendation.skill_set_optimizer import DEFAULT_TIME_BUDGET_MS, optimize_skill_set
+from backend.recommendation.gear_optimizer import assign_gear
+from backend.recommendation.reasons import ReasonCode, finalize_reasons
+from backend.recommendation.scoring_rules import ItemCandidate, ScoringRules, get_scoring_rules
+from backend.recommendation.skill_synergy import SkillSynergyMatrix, get_skill_synergy_matrix
+from backend.recommendation.talent_tree import DEFAULT_TALENT_POINTS, allocate_talent_points
+from backend.recommendation.talent_profiles import (
+    TalentProfile,
+    get_talent_profile,
+    get_all_talent_profiles,
+    install_talent_profiles
+)
+
+
+# 세트 보너스 단계별 기본 점수 (보너스 효과 점수와 합산)
+SET_BONUS_BASE_SCORE = 10
+
+# 요청마다 다시 계산하는 스킬 규칙 변수 (이 변수를 참조하지 않는 규칙 구간은 영웅별로 캐시)
+SKILL_DELTA_VARIABLES = ("playstyle",)
+
+# 카탈로그별 점수 캐시 크기 (스킬 기본 벡터 + 아이템/재능 노드 순위)
+SCORE_CACHE_SIZE = 256
+
+
+@dataclass
+class SkillBaseScores:
+    """플레이스타일 무관 규칙 구간의 스킬별 결과 (카탈로그 순서, 읽기 전용)"""
+    totals: List[float]  # 기본 구간 점수 합계
+    reasons: List[Tuple[Tuple[ReasonCode, ...], ...]]  # 기본 구간별 이유 코드 (규칙 순서)
+
+
+@dataclass
+class ScoreRanking:
+    """후보별 점수/이유 코드와 점수 내림차순 순서 (카탈로그 순서 기준, 읽기 전용)"""
+    scores: List[float]
+    reasons: List[Tuple[ReasonCode, ...]]
+    order: List[int]  # 점수 내림차순 인덱스 (동점은 카탈로그 순서)
+    slot_leaders: Optional[List[int]] = None  # 아이템: 슬롯별 최고 순위 인덱스 (순위순)
+
+
+class _CandidateView:
+    """딕셔너리 키 조회 호환 (optimizer가 candidate["score"], candidate.get(...)로 읽음)"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+
+@dataclass(slots=True)
+class ScoredSkill(_CandidateView):
+    """조합 최적화용 스킬 후보 (응답 항목은 선택된 후보만 생성)"""
+    index: int  # 카탈로그 인덱스
+    skill_id: int
+    damage_type: Optional[str]
+    is_dot: bool
+    is_spell_burst_compatible: bool
+    is_combo: bool
+    score: float
+
+
+@dataclass(slots=True)
+class ScoredItem(_CandidateView):
+    """슬롯 배정용 아이템 후보 (응답 항목은 배정된 후보만 생성)"""
+    index: int  # 카탈로그 인덱스
+    slot: str
+    set_name: Optional[str]
+    score: float
+
+
+def _rank(results: List[Tuple[float, List[ReasonCode]]]) -> ScoreRanking:
+    """평가 결과 → 점수 순위 (안정 정렬, 이유 코드는 캐시에 오래 남으므로 튜플로 보관 - 빈 목록은 공유)"""
+    scores = [score for score, _ in results]
+    return ScoreRanking(
+        scores=scores,
+        reasons=[tuple(reasons) for _, reasons in results],
+        order=sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+    )
+
+
+# 카탈로그 스냅샷별 점수 캐시 (스냅샷이 교체되면 함께 사라짐)
+_score_cache_lock = threading.Lock()
+_score_caches: "weakref.WeakKeyDictionary[RecommendationCatalog, OrderedDict]" = weakref.WeakKeyDictionary()
+
+
+def _cached_scores(catalog: RecommendationCatalog, key: Tuple, compute: Callable[[], object]):
+    """카탈로그별 점수 캐시 조회 (없으면 compute() 결과 저장, LRU)"""
+    with _score_cache_lock:
+        cache = _score_caches.get(catalog)
+        if cache is None:
+            cache = _score_caches[catalog] = OrderedDict()
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+            return value
+
+    value = compute()
+    with _score_cache_lock:
+        cache[key] = value
+        if len(cache) > SCORE_CACHE_SIZE:
+            cache.popitem(last=False)
+    return value
+
+
+# 프로세스 풀 워커별 카탈로그/규칙/쌍 시너지 (initializer에서 1회 설정)
+_worker_catalog: Optional[RecommendationCatalog] = None
+_worker_rules: Optional[ScoringRules] = None
+_worker_skill_synergies: Optional[SkillSynergyMatrix] = None
+
+
+def _init_batch_worker(
+    catalog: RecommendationCatalog,
+    talent_profiles: Dict[str, TalentProfile],
+    rules: ScoringRules,
+    skill_synergies: Optional[SkillSynergyMatrix] = None
+):
+    """배치 워커 초기화 - 카탈로그, 재능 프로필, 스코어링 규칙 (+ 쌍 시너지)을 워커당 한 번만 전달받음"""
+    global _worker_catalog, _worker_rules, _worker_skill_synergies
+    _worker_catalog = catalog
+    _worker_rules = rules
+    _worker_skill_synergies = skill_synergies
+    install_talent_profiles(talent_profiles)
+
+
+def _recommend_in_worker(requests: List[Dict]) -> List[Dict]:
+    """배치 워커에서 요청 묶음 추천 실행 (DB 접근 없음)"""
+    engine = RecommendationEngineV2(
+        db=None, catalog=_worker_catalog, rules=_worker_rules, skill_synergies=_worker_skill_synergies
+    )
+    return [engine._recommend_batch_entry(request) for request in requests]
+
+
+# 배치 추천용 공유 프로세스 풀 (첫 병렬 요청 때 생성, 요청 수와 무관하게 최대 BATCH_POOL_MAX_WORKERS개 프로세스)
+BATCH_POOL_MAX_WORKERS = min(16, os.cpu_count() or 1)
+
+_pool_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_state: Optional[Tuple] = None  # 워커에 전달한 (카탈로그, 규칙, 재능 프로필, 쌍 시너지)
+
+
+def _batch_pool(
+    catalog: RecommendationCatalog,
+    rules: ScoringRules,
+    talent_profiles: Dict[str, TalentProfile],
+    skill_synergies: Optional[SkillSynergyMatrix]
+) -> ProcessPoolExecutor:
+    """
+    공유 프로세스 풀 (워커 상태가 바뀐 경우에만 새로 생성)
+
+    카탈로그 스냅샷/규칙/재능 프로필이 바뀌었거나 쌍 시너지가 필요한데 없는 풀이면 기존 풀을 닫고
+    (진행 중인 작업은 끝까지 실행) 새 상태로 다시 만듭니다.
+    """
+    global _pool, _pool_state
+    with _pool_lock:
+        if _pool is not None:
+            pool_catalog, pool_rules, pool_profiles, pool_synergies = _pool_state
+            if (
+                pool_catalog is catalog and pool_rules is rules and pool_profiles == talent_profiles
+                and (skill_synergies is None or pool_synergies is skill_synergies)
+            ):
+                return _pool
+            _pool.shutdown(wait=False)
+
+        _pool = ProcessPoolExecutor(
+            max_workers=BATCH_POOL_MAX_WORKERS,
+            initializer=_init_batch_worker,
+            initargs=(catalog, talent_profiles, rules, skill_synergies)
+        )
+        _pool_state = (catalog, rules, talent_profiles, skill_synergies)
+        return _pool
+
+
+def shutdown_batch_pool():
+    """공유 프로세스 풀 종료 (서버 종료 시)"""
+    global _pool, _pool_state
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = _pool_state = None
 
 
 class RecommendationEngineV2:
     """빌드 추천 엔진 v2 - 게임 메커니즘 활용"""
 
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Optional[Session],
+        catalog: Optional[RecommendationCatalog] = None,
+        rules: Optional[ScoringRules] = None,
+        skill_synergies: Optional[SkillSynergyMatrix] = None
+    ):
+        """
+        Args:
+            db: DB 세션 (catalog가 주어지면 None 가능)
+            catalog: 미리 로드한 카탈로그 (None이면 첫 사용 시 DB에서 로드)
+            rules: 스코어링 규칙 (None이면 첫 사용 시 현재 규칙 파일에서 가져옴)
+            skill_synergies: 스킬 쌍 시너지 행렬 (None이면 pair_synergy 요청 시 DB에서 로드)
+        """
         self.db = db
-        self._talent_level_cache = {}  # 재능 레벨 효과 캐시
+        self._catalog = catalog
+        self._rules = rules
+        self._skill_synergies = skill_synergies
+
+    @property
+    def rules(self) -> ScoringRules:
+        """스코어링 규칙 (지연 로드, 엔진 인스턴스 동안 고정)"""
+        if self._rules is None:
+            self._rules = get_scoring_rules()
+        return self._rules
+
+    @property
+    def skill_synergies(self) -> SkillSynergyMatrix:
+        """스킬 쌍 시너지 행렬 (지연 로드, DB가 없으면 빈 행렬)"""
+        if self._skill_synergies is None:
+            self._skill_synergies = (
+                get_skill_synergy_matrix(self.db) if self.db is not None else SkillSynergyMatrix({})
+            )
+        return self._skill_synergies
+
+    @property
+    def catalog(self) -> RecommendationCatalog:
+        """카탈로그 스냅샷 (지연 로드, 프로세스 전역 공유 스냅샷)"""
+        if self._catalog is None:
+            self._catalog = get_catalog(self.db, self.rules.effect_keywords)
+        return self._catalog
 
     def recommend_build(
         self,
@@ -47,7 +272,14 @@ class RecommendationEngineV2:
         playstyle: Optional[str] = None,
         focus: Optional[str] = None,
         max_skills: int = 6,
-        max_items: int = 10
+        max_items: int = 10,
+        optimize_skills: bool = False,
+        optimize_budget_ms: float = DEFAULT_TIME_BUDGET_MS,
+        optimize_items: bool = False,
+        allocate_talents: bool = False,
+        talent_points: int = DEFAULT_TALENT_POINTS,
+        explain: bool = True,
+        pair_synergy: bool = False
     ) -> Dict:
         """
         영웅 기반 빌드 추천 (v2)
@@ -58,12 +290,22 @@ class RecommendationEngineV2:
             focus: 빌드 초점
             max_skills: 추천할 최대 스킬 개수
             max_items: 추천할 최대 아이템 개수
+            optimize_skills: True면 개별 상위 k개 대신 세트 시너지까지 고려한 조합 최적화
+            optimize_budget_ms: 조합 최적화 시간 예산 (밀리초)
+            optimize_items: True면 슬롯별 최고 점수 대신 세트 보너스까지 고려한 슬롯 배정
+            allocate_talents: True면 상위 5개 노드 대신 포인트 예산 내 재능 트리 배분 계획
+            talent_points: 재능 포인트 예산
+            explain: False면 이유 문자열 대신 reason_codes만 반환 (프로그램 호출용)
+            pair_synergy: True면 skill_synergies 쌍 시너지까지 포함한 조합 최적화 (optimize_skills 포함)
 
         Returns:
             추천 빌드 딕셔너리
+            (optimize_skills/pair_synergy=True면 skill_optimization, optimize_items=True면 item_optimization,
+            allocate_talents=True면 talent_allocation 포함)
         """
-        # 영웅 정보
-        hero = self.db.query(Hero).filter(Hero.id == hero_id).first()
+        # 영웅 정보 (첫 요청이면 카탈로그 스냅샷 로드 포함)
+        with span("hero_query"):
+            hero = self.catalog.get_hero(hero_id)
         if not hero:
             raise ValueError(f"Hero with id {hero_id} not found")
 
@@ -71,293 +313,484 @@ class RecommendationEngineV2:
         primary_stat = get_primary_stat_for_god_type(hero.god_type)
 
         # 스킬 추천
-        recommended_skills = self._recommend_skills_v2(hero, playstyle, max_skills)
+        skill_optimization = None
+        with span("skill_scoring"):
+            if optimize_skills or pair_synergy:
+                recommended_skills, skill_optimization = self._optimize_skills_v2(
+                    hero, playstyle, max_skills, optimize_budget_ms, pair_synergy
+                )
+            else:
+                recommended_skills = self._recommend_skills_v2(hero, playstyle, max_skills)
 
-        # 빌드 타입 분석 (DoT/Hit/Hybrid)
-        build_type = self._analyze_build_type(recommended_skills)
+            # 빌드 타입 분석 (DoT/Hit/Hybrid)
+            build_type = self._analyze_build_type(recommended_skills)
 
         # 아이템 추천 (빌드 타입 기반)
-        recommended_items = self._recommend_items_v2(
-            hero, recommended_skills, build_type, primary_stat, max_items
-        )
+        item_optimization = None
+        with span("item_scoring"):
+            if optimize_items:
+                recommended_items, item_optimization = self._assign_items_v2(
+                    hero, recommended_skills, build_type, primary_stat, max_items, optimize_budget_ms
+                )
+            else:
+                recommended_items = self._recommend_items_v2(
+                    hero, recommended_skills, build_type, primary_stat, max_items
+                )
 
         # 재능 노드 추천
-        recommended_talents = self._recommend_talent_nodes_v2(hero, build_type, max_nodes=5)
+        talent_allocation = None
+        with span("talent_nodes"):
+            if allocate_talents:
+                recommended_talents, talent_allocation = self._allocate_talent_nodes_v2(
+                    hero, build_type, talent_points
+                )
+            else:
+                recommended_talents = self._recommend_talent_nodes_v2(hero, build_type, max_nodes=5)
+
+        with span("summary"):
+            # 최종 선택된 항목만 이유 코드 변환
+            finalize_reasons(recommended_skills, explain)
+            finalize_reasons(recommended_items, explain)
+            finalize_reasons(recommended_talents, explain)
+            if item_optimization is not None:
+                finalize_reasons(item_optimization["active_set_bonuses"], explain, default="세트 보너스")
+
+            # 시너지 점수 계산 (v2)
+            synergy_score = self._calculate_synergy_score_v2(
+                recommended_skills, recommended_items, build_type
+            )
+
+            recommendation = {
+                "hero_id": hero.id,
+                "hero_name": hero.name,
+                "hero_talent": hero.talent,
+                "god_type": hero.god_type,
+                "primary_stat": primary_stat,
+                "build_type": build_type,
+                "recommended_skills": recommended_skills,
+                "recommended_items": recommended_items,
+                "recommended_talents": recommended_talents,
+                "synergy_score": round(synergy_score, 2),
+                "build_summary": self._generate_build_summary_v2(
+                    hero, recommended_skills, recommended_items, build_type
+                )
+            }
+        if skill_optimization is not None:
+            recommendation["skill_optimization"] = skill_optimization
+        if item_optimization is not None:
+            recommendation["item_optimization"] = item_optimization
+        if talent_allocation is not None:
+            recommendation["talent_allocation"] = talent_allocation
+        return recommendation
+
+    def rank_candidates(
+        self,
+        hero_id: int,
+        playstyle: Optional[str] = None,
+        max_skills: int = 50,
+        max_items: int = 50,
+        core_skills: int = 6
+    ) -> Tuple[List[SkillRecord], List[ItemRecord]]:
+        """
+        관련도 순 스킬/아이템 후보 (AI 컨텍스트 선택용, 캐시된 점수 순위만 사용)
+
+        아이템 점수는 상위 core_skills개 스킬로 정한 빌드 타입/데미지 타입 기준이며,
+        슬롯별 최고 아이템을 먼저 넣은 뒤 나머지를 점수순으로 채웁니다.
+
+        Returns:
+            (스킬 레코드 목록, 아이템 레코드 목록) - 각각 관련도 내림차순
+        """
+        hero = self.catalog.get_hero(hero_id)
+        if not hero:
+            raise ValueError(f"Hero with id {hero_id} not found")
+
+        skills = self.catalog.skills
+        scores, reasons_of = self._skill_scores(hero, playstyle)
+        top_skills = heapq.nlargest(max(max_skills, core_skills), range(len(scores)), key=scores.__getitem__)
+
+        core = [self._skill_entry(skills[i], scores[i], reasons_of(i)) for i in top_skills[:core_skills]]
+        primary_stat = get_primary_stat_for_god_type(hero.god_type)
+        ranking = self._rank_items(hero, core, self._analyze_build_type(core), primary_stat)
+
+        leaders = set(ranking.slot_leaders)
+        top_items = islice(chain(ranking.slot_leaders, (i for i in ranking.order if i not in leaders)), max_items)
+
+        items = self.catalog.items
+        return [skills[i] for i in top_skills[:max_skills]], [items[i] for i in top_items]
+
+    def recommend_builds(self, requests: List[Dict], workers: int = 0) -> List[Dict]:
+        """
+        여러 영웅/플레이스타일 빌드를 한 번에 추천 (카탈로그 1회 로드)
 
-        # 시너지 점수 계산 (v2)
-        synergy_score = self._calculate_synergy_score_v2(
-            recommended_skills, recommended_items, build_type
+        Args:
+            requests: recommend_build() 인자 딕셔너리 리스트
+                (hero_id, playstyle, focus, max_skills, max_items)
+            workers: 병렬 처리 수 (0 또는 1이면 현재 프로세스에서 실행, 최대 BATCH_POOL_MAX_WORKERS)
+                - 요청을 workers개 묶음으로 나눠 공유 프로세스 풀에서 실행
+
+        Returns:
+            요청 순서대로 정렬된 결과 리스트. 실패한 요청은
+            {"hero_id": ..., "error": ..., "status_code": ...} 형태
+        """
+        catalog = self.catalog
+
+        if workers <= 1 or len(requests) <= 1:
+            return [self._recommend_batch_entry(request) for request in requests]
+
+        # 워커에 넘길 재능 프로필 준비 (DB가 있으면 최신 상태로 갱신)
+        for hero in catalog.heroes.values():
+            self._get_talent_profile(hero.talent)
+
+        # 쌍 시너지 행렬은 요청하는 항목이 있을 때만 전달
+        skill_synergies = (
+            self.skill_synergies if any(request.get("pair_synergy") for request in requests) else None
         )
 
-        return {
-            "hero_id": hero.id,
-            "hero_name": hero.name,
-            "hero_talent": hero.talent,
-            "god_type": hero.god_type,
-            "primary_stat": primary_stat,
-            "build_type": build_type,
-            "recommended_skills": recommended_skills,
-            "recommended_items": recommended_items,
-            "recommended_talents": recommended_talents,
-            "synergy_score": round(synergy_score, 2),
-            "build_summary": self._generate_build_summary_v2(
-                hero, recommended_skills, recommended_items, build_type
+        pool = _batch_pool(catalog, self.rules, get_all_talent_profiles(), skill_synergies)
+        chunks = min(workers, BATCH_POOL_MAX_WORKERS, len(requests))
+        size = -(-len(requests) // chunks)
+        results = pool.map(_recommend_in_worker, (requests[i:i + size] for i in range(0, len(requests), size)))
+        return list(chain.from_iterable(results))
+
+    def _recommend_batch_entry(self, request: Dict) -> Dict:
+        """배치 요청 1건 처리 - 실패 시 에러 엔트리 반환"""
+        try:
+            return self.recommend_build(
+                hero_id=request["hero_id"],
+                playstyle=request.get("playstyle"),
+                focus=request.get("focus"),
+                max_skills=request.get("max_skills", 6),
+                max_items=request.get("max_items", 10),
+                optimize_skills=request.get("optimize_skills", False),
+                optimize_budget_ms=request.get("optimize_budget_ms", DEFAULT_TIME_BUDGET_MS),
+                optimize_items=request.get("optimize_items", False),
+                allocate_talents=request.get("allocate_talents", False),
+                talent_points=request.get("talent_points", DEFAULT_TALENT_POINTS),
+                explain=request.get("explain", True),
+                pair_synergy=request.get("pair_synergy", False)
             )
-        }
+        except ValueError as e:
+            return {"hero_id": request.get("hero_id"), "error": str(e), "status_code": 404}
+        except Exception as e:
+            return {
+                "hero_id": request.get("hero_id"),
+                "error": f"Recommendation failed: {str(e)}",
+                "status_code": 500
+            }
 
     def _recommend_skills_v2(
         self,
-        hero: Hero,
+        hero: HeroRecord,
         playstyle: Optional[str],
         max_skills: int
     ) -> List[Dict]:
-        """스킬 추천 v2 - 게임 메커니즘 기반"""
-        all_skills = self.db.query(Skill).all()
-        scored_skills = []
+        """스킬 추천 v2 - 게임 메커니즘 기반 (개별 점수 상위 max_skills개)"""
+        scores, reasons_of = self._skill_scores(hero, playstyle)
+        skills = self.catalog.skills
+
+        # 정렬 후 자르기와 같은 결과 (동점은 카탈로그 순서), 선택된 스킬만 항목 생성
+        top = heapq.nlargest(max_skills, range(len(scores)), key=scores.__getitem__)
+        return [self._skill_entry(skills[i], scores[i], reasons_of(i)) for i in top]
+
+    def _optimize_skills_v2(
+        self,
+        hero: HeroRecord,
+        playstyle: Optional[str],
+        max_skills: int,
+        time_budget_ms: float = DEFAULT_TIME_BUDGET_MS,
+        pair_synergy: bool = False
+    ) -> Tuple[List[Dict], Dict]:
+        """스킬 추천 v2 - 세트 시너지(및 쌍 시너지)를 고려한 조합 최적화"""
+        scores, reasons_of = self._skill_scores(hero, playstyle)
+        candidates = self._score_skills_v2(scores)
+        result = optimize_skill_set(
+            candidates, max_skills, time_budget_ms=time_budget_ms,
+            pair_synergy=self.skill_synergies if pair_synergy else None
+        )
+
+        skills = self.catalog.skills
+        chosen = [candidates[i].index for i in result.indices]
+        optimization = {
+            "objective": round(result.objective, 2),
+            "baseline_objective": round(result.baseline_objective, 2),
+            "optimal": result.optimal,
+            "nodes": result.nodes,
+            "elapsed_ms": round(result.elapsed_ms, 2)
+        }
+        if pair_synergy:
+            optimization["pair_synergy"] = round(result.pair_synergy, 2)
+        return [self._skill_entry(skills[i], scores[i], reasons_of(i)) for i in chosen], optimization
+
+    def _score_skills_v2(self, scores: List[float]) -> List[ScoredSkill]:
+        """전체 스킬 후보 (점수 내림차순, 동점은 카탈로그 순서)"""
+        skills = self.catalog.skills
+        order = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        return [
+            ScoredSkill(
+                i, skills[i].id, skills[i].damage_type, skills[i].is_dot,
+                skills[i].is_spell_burst_compatible, skills[i].is_combo, scores[i]
+            )
+            for i in order
+        ]
+
+    def _skill_entry(self, skill: SkillRecord, score: float, reasons: List[ReasonCode]) -> Dict:
+        """스킬 추천 항목"""
+        return {
+            "skill_id": skill.id,
+            "skill_name": skill.name,
+            "skill_type": skill.type,
+            "damage_type": skill.damage_type,
+            "tags": skill.tags,
+            "is_dot": skill.is_dot,
+            "is_spell_burst_compatible": skill.is_spell_burst_compatible,
+            "is_combo": skill.is_combo,
+            "score": score,
+            "reason": reasons,  # 이유 코드 (최종 선택 후 변환)
+            "priority": self._calculate_skill_priority(score, skill.is_dot)
+        }
+
+    def _skill_scores(
+        self,
+        hero: HeroRecord,
+        playstyle: Optional[str]
+    ) -> Tuple[List[float], Callable[[int], List[ReasonCode]]]:
+        """
+        스킬별 점수 (카탈로그 순서)와 이유 코드 조회 함수
+
+        플레이스타일을 참조하지 않는 규칙 구간의 점수는 영웅 컨텍스트별로 캐시하고,
+        요청마다 플레이스타일 규칙 구간만 계산해 규칙 순서대로 합칩니다.
+        (규칙 점수는 정수/0.5 단위이므로 구간별 합산 결과가 전체 평가와 같음)
+        """
+        context = self._skill_context(hero, playstyle)
+        segments = self.rules.segments("skill", SKILL_DELTA_VARIABLES)
+        base = self._skill_base_scores(context, segments)
+
+        # 1. 플레이스타일 규칙 구간 결과 (적용된 스킬만)
+        deltas = [self._skill_delta_scores(context, indices) for varying, indices in segments if varying]
+
+        # 2. 기본 점수 + 구간 점수
+        scores = list(base.totals)
+        for results in deltas:
+            for i, (score, _) in results.items():
+                scores[i] += score
+
+        # 3. 이유 코드는 선택된 스킬만 규칙 순서대로 합침
+        def reasons_of(i: int) -> List[ReasonCode]:
+            reasons: List[ReasonCode] = []
+            base_parts, delta_parts = iter(base.reasons[i]), iter(deltas)
+            for varying, _ in segments:
+                reasons += next(delta_parts).get(i, (0, ()))[1] if varying else next(base_parts)
+            return reasons
+
+        return scores, reasons_of
+
+    def _skill_base_scores(self, context: Dict, segments) -> SkillBaseScores:
+        """플레이스타일 무관 규칙 구간의 스킬별 결과 (카탈로그/규칙/영웅 컨텍스트별 캐시)"""
+        key = ("skill", self.rules) + tuple(
+            value for name, value in context.items() if name not in SKILL_DELTA_VARIABLES
+        )
+
+        def compute() -> SkillBaseScores:
+            bound = [
+                self.rules.bind("skill", context, subset=indices) for varying, indices in segments if not varying
+            ]
+            no_reasons = ((),) * len(bound)  # 이유 코드가 없는 스킬은 같은 튜플 공유
+            totals, reasons = [], []
+            for skill in self.catalog.skills:
+                results = [rules.evaluate(skill) for rules in bound]
+                totals.append(sum(score for score, _ in results))
+                codes = tuple(tuple(codes) for _, codes in results)
+                reasons.append(codes if any(codes) else no_reasons)
+            return SkillBaseScores(totals=totals, reasons=reasons)
+
+        return _cached_scores(self.catalog, key, compute)
+
+    def _skill_delta_scores(
+        self,
+        context: Dict,
+        indices: Tuple[int, ...]
+    ) -> Dict[int, Tuple[float, Tuple[ReasonCode, ...]]]:
+        """
+        플레이스타일 규칙 구간의 스킬별 결과 (규칙이 적용된 스킬 인덱스만)
 
+        구간이 참조하는 변수 값별로 캐시하므로 영웅이 달라도 같은 플레이스타일이면 재사용합니다.
+        """
+        names = sorted(self.rules.references("skill", indices))
+        key = ("skill_delta", self.rules, indices) + tuple(context[name] for name in names)
+
+        def compute() -> Dict[int, Tuple[float, Tuple[ReasonCode, ...]]]:
+            rules = self.rules.bind("skill", context, subset=indices)
+            results = {}
+            for i, skill in enumerate(self.catalog.skills):
+                score, reasons = rules.evaluate(skill)
+                if score or reasons:
+                    results[i] = (score, tuple(reasons))
+            return results
+
+        return _cached_scores(self.catalog, key, compute)
+
+    def _skill_context(self, hero: HeroRecord, playstyle: Optional[str]) -> Dict:
+        """스킬 규칙 컨텍스트 (RULE_CONTEXT["skill"])"""
         # 영웅의 주 스탯 기반 선호 데미지 타입
         primary_stat = get_primary_stat_for_god_type(hero.god_type)
         preferred_damage_types = self._get_preferred_damage_types(primary_stat, hero.god_type)
 
-        # 재능 메커니즘 가져오기
-        talent_mechanics = get_talent_mechanics(hero.talent)
-        must_have_mechanics = get_talent_must_have_mechanics(hero.talent)
-        avoid_mechanics = get_talent_avoid_mechanics(hero.talent)
-        recommended_skill_types = get_recommended_skill_types(hero.talent)
-        is_burst_talent = is_burst_focused_talent(hero.talent)
-
-        # DB에서 재능 레벨 효과 조회
-        has_60_penalty = self._has_critical_level_60_penalty(hero.talent)
-        talent_level_mechanics = self._get_talent_level_mechanics(hero.talent)
-
-        for skill in all_skills:
-            score = 0
-            reasons = []
-            skill_tags = []
-
-            # 태그 파싱
-            if skill.tags:
-                try:
-                    skill_tags = json.loads(skill.tags)
-                except json.JSONDecodeError:
-                    skill_tags = []
-
-            # 1. 스킬 타입 기본 점수
-            if skill.type == "Active Skill":
-                score += 15
-                reasons.append("핵심 액티브 스킬")
-            elif skill.type == "Support Skill":
-                score += 8
-                reasons.append("서포트 스킬")
-
-            # 2. DoT vs Hit 구분 (강화)
-            is_dot = False
-
-            # 태그 기반 DoT 감지
-            dot_keywords_in_tags = ["DoT", "Damage Over Time", "Ailment", "Burn", "Bleed", "Poison"]
-            for keyword in dot_keywords_in_tags:
-                if any(keyword.lower() in tag.lower() for tag in skill_tags):
-                    is_dot = True
-                    break
-
-            # 설명 기반 DoT 감지 (강화)
-            if skill.description:
-                desc_lower = skill.description.lower()
-                dot_keywords_in_desc = [
-                    "damage over time", "dot", "per second",
-                    "ignite", "trauma", "wilt", "bleed", "poison",
-                    "burning", "erosion", "affliction"
-                ]
-                for keyword in dot_keywords_in_desc:
-                    if keyword in desc_lower:
-                        is_dot = True
-                        break
-
-            # 데미지 타입 기반 DoT 유추 (보조)
-            if skill.damage_type in ["Fire", "Erosion"] and not is_dot:
-                # Fire와 Erosion은 DoT 경향이 있음
-                if skill.description and "over time" in skill.description.lower():
-                    is_dot = True
-
-            if is_dot:
-                score += 5
-                reasons.append("DoT 스킬")
-            else:
-                score += 3
-                reasons.append("Hit 스킬")
-
-            # 3. 데미지 타입 점수
-            if skill.damage_type:
-                score += 5
-                reasons.append(f"{skill.damage_type} 데미지")
-
-                # 영웅 선호 데미지 타입 보너스
-                if skill.damage_type in preferred_damage_types:
-                    bonus = 10 - preferred_damage_types.index(skill.damage_type) * 2  # 순서대로 10, 8, 6...
-                    score += bonus
-                    reasons.append(f"{hero.god_type} 최적 데미지")
-
-                # 상태이상 시너지
-                ailment = get_ailment_for_damage_type(skill.damage_type)
-                if ailment and ailment != "Unknown":
-                    score += 3
-                    reasons.append(f"{ailment} 상태이상")
-
-            # 4. 플레이스타일 매칭 (강화)
-            if playstyle:
-                playstyle_lower = playstyle.lower()
-                for tag in skill_tags:
-                    if playstyle_lower in tag.lower():
-                        score += 10
-                        reasons.append(f"{playstyle} 완벽 매칭")
-                        break
-
-            # 5. 스킬 태그 시너지
-            tag_synergies = get_recommended_stats_for_skill_tags(skill_tags)
-            if tag_synergies:
-                score += len(tag_synergies) * 0.5
-                reasons.append(f"{len(tag_synergies)}개 시너지 스탯")
-
-            # 6. Spell Burst 호환성
-            if is_spell_burst_compatible(skill_tags):
-                score += 5
-                reasons.append("Spell Burst 가능")
-
-            # 7. Combo 스킬
-            if is_combo_skill(skill_tags):
-                score += 7
-                reasons.append("Combo 스킬 (곱셈 스케일)")
-
-            # 8. 재능 메커니즘 기반 스코어링 ⭐ 중요!
-            if talent_mechanics:
-                # 8-1. 필수 메커니즘 체크
-                for must_have in must_have_mechanics:
-                    must_have_lower = must_have.lower()
-
-                    # 스킬 타입에서 매칭
-                    if skill.type and must_have_lower in skill.type.lower():
-                        score += 20
-                        reasons.append(f"재능 필수: {must_have}")
-                        continue
-
-                    # 스킬 태그에서 매칭
-                    if any(must_have_lower in tag.lower() for tag in skill_tags):
-                        score += 20
-                        reasons.append(f"재능 필수: {must_have}")
-                        continue
-
-                    # 설명에서 매칭 (약한 신호)
-                    if skill.description and must_have_lower in skill.description.lower():
-                        score += 10
-                        reasons.append(f"재능 권장: {must_have}")
-
-                # 8-2. 피해야 할 메커니즘 체크
-                for avoid in avoid_mechanics:
-                    avoid_lower = avoid.lower()
-
-                    # DoT 스킬인데 DoT를 피해야 하는 경우
-                    if "dot" in avoid_lower and is_dot:
-                        score -= 25  # 강한 패널티
-                        reasons.append(f"⚠️ 재능 비추천: DoT 스킬")
-
-                    # Spell 스킬인데 Spell을 피해야 하는 경우
-                    if "spell" in avoid_lower:
-                        if any("spell" in tag.lower() for tag in skill_tags):
-                            score -= 20
-                            reasons.append(f"⚠️ 재능 비추천: Spell")
-
-                    # Non-Burst 스킬 체크 (Burst 재능의 경우)
-                    if "non-burst" in avoid_lower:
-                        # Melee Attack이 아니면 페널티
-                        is_melee_attack = any("melee" in tag.lower() or "attack" in tag.lower() for tag in skill_tags)
-                        if not is_melee_attack:
-                            score -= 30  # 매우 강한 패널티 (Anger의 -80%를 반영)
-                            reasons.append(f"⚠️ Burst 재능에 부적합")
-
-                # 8-3. 추천 스킬 타입 매칭
-                for recommended_type in recommended_skill_types:
-                    recommended_lower = recommended_type.lower()
-
-                    # 스킬 타입 직접 매칭
-                    if skill.type and recommended_lower in skill.type.lower():
-                        score += 15
-                        reasons.append(f"재능 최적: {recommended_type}")
-                        continue
-
-                    # 태그 매칭
-                    if any(recommended_lower in tag.lower() for tag in skill_tags):
-                        score += 15
-                        reasons.append(f"재능 최적: {recommended_type}")
-                        continue
-
-                # 8-4. Burst 재능 특화 (Anger 등)
-                if is_burst_talent:
-                    # Melee + Attack 조합 = Burst 트리거 가능
-                    has_melee = any("melee" in tag.lower() for tag in skill_tags)
-                    has_attack = any("attack" in tag.lower() for tag in skill_tags)
-                    has_aoe = any("aoe" in tag.lower() or "area" in tag.lower() for tag in skill_tags)
-
-                    if has_melee and has_attack:
-                        score += 25
-                        reasons.append("✅ Burst 트리거 (Melee Attack)")
-
-                    if has_aoe:
-                        score += 15
-                        reasons.append("✅ Burst 데미지 증가 (Area)")
-
-                # 8-5. 60레벨 크리티컬 패널티 반영 ⚠️
-                if has_60_penalty:
-                    # Burst 재능의 경우 non-Burst 스킬에 매우 강한 패널티
-                    if is_burst_talent:
-                        is_burst_compatible = any("melee" in tag.lower() and "attack" in tag.lower() for tag in skill_tags)
-                        if not is_burst_compatible:
-                            score -= 40  # Tunnel Vision 반영 (-80% 패널티)
-                            reasons.append("⚠️⚠️ 60레벨 패널티: Burst 불가 스킬")
-
-                # 8-6. 레벨별 메커니즘 추가 보너스
-                for level, mechs in talent_level_mechanics.items():
-                    if level >= 60:  # 60레벨 이상의 중요한 메커니즘
-                        for mech in mechs:
-                            # 스킬이 해당 메커니즘을 지원하면 보너스
-                            if mech in ["melee", "attack_speed", "critical", "area"]:
-                                if any(mech in tag.lower() for tag in skill_tags):
-                                    score += 5
-                                    reasons.append(f"Lv{level} 메커니즘: {mech}")
-
-            # 9. 설명 품질 (데이터 완성도)
-            if skill.description and len(skill.description) > 100:
-                score += 2
-
-            scored_skills.append({
-                "skill_id": skill.id,
-                "skill_name": skill.name,
-                "skill_type": skill.type,
-                "damage_type": skill.damage_type,
-                "tags": skill.tags,
-                "is_dot": is_dot,
-                "is_spell_burst_compatible": is_spell_burst_compatible(skill_tags),
-                "is_combo": is_combo_skill(skill_tags),
-                "score": score,
-                "reason": ", ".join(reasons) if reasons else "기본 추천",
-                "priority": self._calculate_skill_priority(score, is_dot)
-            })
+        # 재능 프로필 (메커니즘 + 레벨 효과, 프로세스 전역 캐시)
+        profile = self._get_talent_profile(hero.talent)
 
-        # 점수순 정렬
-        scored_skills.sort(key=lambda x: x["score"], reverse=True)
-        return scored_skills[:max_skills]
+        return {
+            "playstyle": playstyle,
+            "god_type": hero.god_type,
+            "preferred_damage_types": tuple(preferred_damage_types),
+            "has_mechanics": profile.has_mechanics,
+            "must_have_mechanics": profile.must_have_mechanics,
+            "avoid_mechanics": profile.avoid_mechanics,
+            "recommended_skill_types": profile.recommended_skill_types,
+            "is_burst_talent": profile.is_burst,
+            "has_level_60_penalty": profile.has_level_60_penalty,
+            "level_bonus_mechanics": profile.level_bonus_mechanics
+        }
 
     def _recommend_items_v2(
         self,
-        hero: Hero,
+        hero: HeroRecord,
         recommended_skills: List[Dict],
         build_type: str,
         primary_stat: str,
         max_items: int
     ) -> List[Dict]:
         """아이템 추천 v2 - 빌드 타입 기반"""
-        all_items = self.db.query(Item).all()
-        scored_items = []
+        ranking = self._rank_items(hero, recommended_skills, build_type, primary_stat)
+        items = self.catalog.items
+
+        # 슬롯별 균형 (슬롯별 최고 순위 아이템 중 상위 max_items개만 항목 생성)
+        return [
+            self._item_entry(items[i], ranking.scores[i], ranking.reasons[i])
+            for i in ranking.slot_leaders[:max_items]
+        ]
+
+    def _assign_items_v2(
+        self,
+        hero: HeroRecord,
+        recommended_skills: List[Dict],
+        build_type: str,
+        primary_stat: str,
+        max_items: int,
+        time_budget_ms: float = DEFAULT_TIME_BUDGET_MS
+    ) -> Tuple[List[Dict], Dict]:
+        """아이템 추천 v2 - 세트 보너스를 고려한 슬롯 배정"""
+        score_features = self._build_item_scorer(hero, recommended_skills, build_type, primary_stat)
+        ranking = self._rank_items(hero, recommended_skills, build_type, primary_stat)
+        candidates = self._score_items_v2(ranking)
+
+        # 세트 보너스 단계별 점수 (pieces_required를 넘는 단계는 활성화 불가)
+        tier_scores = {}
+        for item_set in self.catalog.item_sets.values():
+            for tier in item_set.tiers:
+                if tier.pieces > item_set.pieces_required:
+                    continue
+                score, reasons = score_features(tier.feature_mask, None)
+                tier_scores[(item_set.set_name, tier.pieces)] = (
+                    SET_BONUS_BASE_SCORE + score, tier.effect, list(reasons)
+                )
+
+        set_bonuses = {}
+        for (set_name, pieces), (score, _, _) in tier_scores.items():
+            set_bonuses.setdefault(set_name, []).append((pieces, score))
+
+        assignment = assign_gear(candidates, set_bonuses, max_items, time_budget_ms=time_budget_ms)
+
+        items = self.catalog.items
+        assigned = [candidates[i].index for i in assignment.indices]
+        return [self._item_entry(items[i], ranking.scores[i], ranking.reasons[i]) for i in assigned], {
+            "total_score": round(assignment.total_score, 2),
+            "greedy_score": round(assignment.greedy_score, 2),
+            "set_bonus_score": round(assignment.set_bonus_score, 2),
+            "active_set_bonuses": [
+                {
+                    "set_name": set_name,
+                    "pieces": pieces,
+                    "effect": tier_scores[(set_name, pieces)][1],
+                    "score": tier_scores[(set_name, pieces)][0],
+                    "reason": tier_scores[(set_name, pieces)][2]
+                }
+                for set_name, pieces in assignment.active_bonuses
+            ],
+            "optimal": assignment.optimal,
+            "states": assignment.states,
+            "elapsed_ms": round(assignment.elapsed_ms, 2)
+        }
+
+    def _score_items_v2(self, ranking: ScoreRanking) -> List[ScoredItem]:
+        """전체 아이템 후보 (점수 내림차순)"""
+        items = self.catalog.items
+        return [ScoredItem(i, items[i].slot, items[i].set_name, ranking.scores[i]) for i in ranking.order]
+
+    def _item_entry(self, item: ItemRecord, score: float, reasons: List[ReasonCode]) -> Dict:
+        """아이템 추천 항목"""
+        return {
+            "item_id": item.id,
+            "item_name": item.name,
+            "slot": item.slot,
+            "type": item.type,
+            "rarity": item.rarity,
+            "stat_type": item.stat_type,
+            "set_name": item.set_name,
+            "score": score,
+            "reason": list(reasons)  # 이유 코드 (최종 선택 후 변환)
+        }
+
+    def _rank_items(
+        self,
+        hero: HeroRecord,
+        recommended_skills: List[Dict],
+        build_type: str,
+        primary_stat: str
+    ) -> ScoreRanking:
+        """전체 아이템 점수 순위 (카탈로그/규칙/아이템 규칙 컨텍스트별 캐시)"""
+        context = self._item_context(hero, recommended_skills, build_type, primary_stat)
+
+        def compute() -> ScoreRanking:
+            score_features = self._score_features(context)
+            items = self.catalog.items
+            ranking = _rank([score_features(item.feature_mask, item.set_name) for item in items])
+
+            # 순위순으로 처음 나오는 슬롯의 아이템 (슬롯별 균형 선택은 이 목록의 앞부분)
+            used_slots = set()
+            ranking.slot_leaders = []
+            for i in ranking.order:
+                if items[i].slot not in used_slots:
+                    used_slots.add(items[i].slot)
+                    ranking.slot_leaders.append(i)
+            return ranking
+
+        return _cached_scores(self.catalog, ("item", self.rules) + tuple(context.values()), compute)
+
+    def _build_item_scorer(
+        self,
+        hero: HeroRecord,
+        recommended_skills: List[Dict],
+        build_type: str,
+        primary_stat: str
+    ) -> Callable[[int, Optional[str]], Tuple[int, Tuple[ReasonCode, ...]]]:
+        """
+        빌드별 아이템 스코어러 생성 - 스코어링 규칙의 item 섹션을 바인딩하고 특징 마스크로 점수 계산
+
+        규칙이 참조하는 특징 비트가 같은 아이템은 점수도 같으므로 결과를 재사용합니다.
+
+        Returns:
+            score_features(feature_mask, set_name) -> (score, 이유 코드)
+        """
+        return self._score_features(self._item_context(hero, recommended_skills, build_type, primary_stat))
 
+    def _item_context(
+        self,
+        hero: HeroRecord,
+        recommended_skills: List[Dict],
+        build_type: str,
+        primary_stat: str
+    ) -> Dict:
+        """아이템 규칙 컨텍스트 (RULE_CONTEXT["item"])"""
         # 스킬 분석
         damage_types = [s.get("damage_type") for s in recommended_skills if s.get("damage_type")]
         primary_damage = Counter(damage_types).most_common(1)
@@ -368,240 +801,109 @@ class RecommendationEngineV2:
         if primary_damage_type:
             primary_ailment = get_ailment_for_damage_type(primary_damage_type)
 
-        # DoT 빌드 여부
-        is_dot_build = build_type in ["DoT", "Hybrid_DoT"]
-
-        # 재능 메커니즘 가져오기
-        talent_mechanics = get_talent_mechanics(hero.talent)
-        recommended_item_stats_list = get_recommended_item_stats(hero.talent)
-        is_burst_talent = is_burst_focused_talent(hero.talent)
-
-        for item in all_items:
-            score = 0
-            reasons = []
-
-            # 1. Stat Type 매칭 (강화)
-            if item.stat_type == primary_stat:
-                score += 15
-                reasons.append(f"{primary_stat} 스탯 매칭")
-
-            # 2. 레전더리 우선
-            if item.rarity == "Legendary":
-                score += 8
-                reasons.append("레전더리")
-
-            # 3. 세트 아이템
-            if item.set_name:
-                score += 5
-                reasons.append(f"{item.set_name} 세트")
-
-            # 4. 데미지 타입 시너지
-            if primary_damage_type and item.special_effects:
-                effects_lower = item.special_effects.lower()
-
-                # 정확한 데미지 타입 매칭
-                if primary_damage_type.lower() in effects_lower:
-                    score += 10
-                    reasons.append(f"{primary_damage_type} 강화")
-
-                # 상태이상 시너지
-                if primary_ailment:
-                    ailment_lower = primary_ailment.lower()
-                    if ailment_lower in effects_lower:
-                        score += 8
-                        reasons.append(f"{primary_ailment} 시너지")
-
-            # 5. DoT 빌드 최적화
-            if is_dot_build and item.special_effects:
-                effects_lower = item.special_effects.lower()
-
-                # DoT 관련 스탯
-                dot_keywords = ["affliction", "reaping", "damage over time", "dot"]
-                for keyword in dot_keywords:
-                    if keyword in effects_lower:
-                        score += 12
-                        reasons.append(f"DoT 최적화 ({keyword})")
-                        break
-
-                # 크리티컬 아이템 패널티
-                crit_keywords = ["critical", "crit"]
-                for keyword in crit_keywords:
-                    if keyword in effects_lower:
-                        score -= 5
-                        reasons.append("DoT 빌드에 크리티컬 불필요")
-                        break
-
-            # 6. Hit 빌드 최적화
-            if not is_dot_build and item.special_effects:
-                effects_lower = item.special_effects.lower()
-
-                # 크리티컬/더블 데미지
-                if "critical" in effects_lower or "crit" in effects_lower:
-                    score += 10
-                    reasons.append("크리티컬 강화")
-
-                if "double damage" in effects_lower:
-                    score += 8
-                    reasons.append("더블 데미지")
-
-            # 7. Spell Burst/Combo 특화
-            has_spell_burst = any(s.get("is_spell_burst_compatible") for s in recommended_skills)
-            has_combo = any(s.get("is_combo") for s in recommended_skills)
-
-            if has_spell_burst and item.special_effects:
-                if "spell burst" in item.special_effects.lower():
-                    score += 15
-                    reasons.append("Spell Burst 특화")
-
-            if has_combo and item.special_effects:
-                if "combo" in item.special_effects.lower():
-                    score += 15
-                    reasons.append("Combo 특화")
-
-            # 8. 재능 메커니즘 기반 아이템 스코어링 ⭐ 중요!
-            if talent_mechanics and item.special_effects:
-                effects_lower = item.special_effects.lower()
-
-                # 8-1. 추천 아이템 스탯 매칭
-                for recommended_stat in recommended_item_stats_list:
-                    stat_lower = recommended_stat.lower()
-
-                    if stat_lower in effects_lower:
-                        score += 12
-                        reasons.append(f"재능 최적 스탯: {recommended_stat}")
-
-                # 8-2. Burst 재능 특화 (Anger 등)
-                if is_burst_talent:
-                    # Attack Speed = Burst 쿨다운 감소
-                    if "attack speed" in effects_lower:
-                        score += 18
-                        reasons.append("✅ Burst 쿨다운 감소")
-
-                    # Critical Strike = Rage 생성
-                    if "critical" in effects_lower or "crit" in effects_lower:
-                        score += 15
-                        reasons.append("✅ Rage 생성 (Crit)")
-
-                    # Area = Burst 데미지 증가
-                    if "area" in effects_lower or "aoe" in effects_lower:
-                        score += 15
-                        reasons.append("✅ Burst 데미지 증가 (Area)")
-
-                    # Burst Damage 직접 증가
-                    if "burst" in effects_lower:
-                        score += 20
-                        reasons.append("✅ Burst 데미지 직접 증가")
-
-                    # Melee Damage
-                    if "melee" in effects_lower:
-                        score += 12
-                        reasons.append("✅ Melee 데미지 증가")
-
-                    # Rage Generation
-                    if "rage" in effects_lower:
-                        score += 15
-                        reasons.append("✅ Rage 생성 증가")
-
-                    # Cooldown Recovery
-                    if "cooldown" in effects_lower and "recovery" in effects_lower:
-                        score += 15
-                        reasons.append("✅ 쿨다운 회복")
-
-            scored_items.append({
-                "item_id": item.id,
-                "item_name": item.name,
-                "slot": item.slot,
-                "type": item.type,
-                "rarity": item.rarity,
-                "stat_type": item.stat_type,
-                "set_name": item.set_name,
-                "score": score,
-                "reason": ", ".join(reasons) if reasons else "기본 추천"
-            })
+        # 재능 프로필
+        profile = self._get_talent_profile(hero.talent)
 
-        # 점수순 정렬
-        scored_items.sort(key=lambda x: x["score"], reverse=True)
+        return {
+            "primary_stat": primary_stat,
+            "primary_damage_type": primary_damage_type,
+            "primary_ailment": primary_ailment,
+            "is_dot_build": build_type in ["DoT", "Hybrid_DoT"],
+            "has_spell_burst": any(s.get("is_spell_burst_compatible") for s in recommended_skills),
+            "has_combo": any(s.get("is_combo") for s in recommended_skills),
+            "has_mechanics": profile.has_mechanics,
+            "is_burst_talent": profile.is_burst,
+            "recommended_item_stats": profile.recommended_item_stats
+        }
 
-        # 슬롯별 균형
-        selected_items = []
-        used_slots = set()
+    def _score_features(
+        self,
+        context: Dict
+    ) -> Callable[[int, Optional[str]], Tuple[int, Tuple[ReasonCode, ...]]]:
+        """
+        아이템 규칙 컨텍스트 바인딩 → 특징 마스크 스코어러 (요구 마스크를 아이템 루프 밖에서 1회 계산)
 
-        for item in scored_items:
-            slot = item["slot"]
-            if slot not in used_slots:
-                selected_items.append(item)
-                used_slots.add(slot)
+        같은 특징의 아이템은 같은 이유 코드 튜플을 공유합니다.
+        """
+        rules = self.rules.bind("item", context, item_features=self.catalog.item_features)
+        relevant_mask = rules.feature_mask
+        results: Dict[Tuple[int, Optional[str]], Tuple[int, Tuple[ReasonCode, ...]]] = {}
 
-            if len(selected_items) >= max_items:
-                break
+        def score_features(mask: int, set_name: Optional[str]) -> Tuple[int, Tuple[ReasonCode, ...]]:
+            key = (mask & relevant_mask, set_name)
+            result = results.get(key)
+            if result is None:
+                score, reasons = rules.evaluate(ItemCandidate(mask, set_name))
+                result = results[key] = (score, tuple(reasons))
+            return result
 
-        return selected_items
+        return score_features
 
     def _recommend_talent_nodes_v2(
         self,
-        hero: Hero,
+        hero: HeroRecord,
         build_type: str,
         max_nodes: int = 5
     ) -> List[Dict]:
         """재능 노드 추천 v2"""
-        all_nodes = self.db.query(TalentNode).all()
-        scored_nodes = []
-
-        for node in all_nodes:
-            score = 0
-            reasons = []
+        ranking = self._rank_talent_nodes(hero, build_type)
+        nodes = self.catalog.talent_nodes
+        return [
+            self._talent_node_entry(nodes[i], ranking.scores[i], ranking.reasons[i])
+            for i in ranking.order[:max_nodes]
+        ]
+
+    def _allocate_talent_nodes_v2(
+        self,
+        hero: HeroRecord,
+        build_type: str,
+        talent_points: int
+    ) -> Tuple[List[Dict], Dict]:
+        """재능 노드 추천 v2 - 포인트 예산 내 재능 트리 배분 (부모 노드가 먼저 오는 순서)"""
+        ranking = self._rank_talent_nodes(hero, build_type)
+        nodes = self.catalog.talent_nodes
+        positions = {node.id: i for i, node in enumerate(nodes)}
+        tree = self.catalog.talent_tree
+        allocation = allocate_talent_points(
+            tree, {nodes[i].id: ranking.scores[i] for i in ranking.order}, talent_points
+        )
 
-            # 1. Core 노드 우선
-            if node.node_type == "Core":
-                score += 15
-                reasons.append("코어 노드")
-            else:
-                score += 5
-
-            # 2. God Class 매칭
-            if node.god_class and hero.god_type:
-                if hero.god_type.lower() in node.god_class.lower():
-                    score += 12
-                    reasons.append(f"{hero.god_type} 매칭")
-
-            # 3. Tier 점수
-            if node.tier:
-                if "Legendary" in node.tier:
-                    score += 8
-                    reasons.append("레전더리 노드")
-                elif "Large" in node.tier:
-                    score += 6
-                    reasons.append("대형 노드")
-                elif "Medium" in node.tier:
-                    score += 4
-                    reasons.append("중형 노드")
-
-            # 4. 빌드 타입 매칭
-            if node.effect and build_type:
-                effect_lower = node.effect.lower()
-
-                if "DoT" in build_type:
-                    if any(kw in effect_lower for kw in ["affliction", "reaping", "damage over time"]):
-                        score += 10
-                        reasons.append("DoT 빌드 시너지")
-
-                if "Hit" in build_type:
-                    if any(kw in effect_lower for kw in ["critical", "attack", "hit"]):
-                        score += 10
-                        reasons.append("Hit 빌드 시너지")
-
-            scored_nodes.append({
-                "node_id": node.id,
-                "node_name": node.name,
-                "node_type": node.node_type,
-                "tier": node.tier,
-                "god_class": node.god_class,
-                "score": score,
-                "reason": ", ".join(reasons) if reasons else "기본 추천"
+        plan = []
+        for node_id in allocation.node_ids:
+            i = positions[node_id]
+            tree_node = tree.get(node_id)
+            plan.append({
+                **self._talent_node_entry(nodes[i], ranking.scores[i], ranking.reasons[i]),
+                "points": tree_node.cost,
+                "parent_id": tree_node.parent_id
             })
 
-        scored_nodes.sort(key=lambda x: x["score"], reverse=True)
-        return scored_nodes[:max_nodes]
+        return plan, {
+            "points_budget": talent_points,
+            "points_used": allocation.points_used,
+            "total_score": round(allocation.total_score, 2),
+            "elapsed_ms": round(allocation.elapsed_ms, 2)
+        }
+
+    def _talent_node_entry(self, node: TalentNodeRecord, score: float, reasons: List[ReasonCode]) -> Dict:
+        """재능 노드 추천 항목"""
+        return {
+            "node_id": node.id,
+            "node_name": node.name,
+            "node_type": node.node_type,
+            "tier": node.tier,
+            "god_class": node.god_class,
+            "score": score,
+            "reason": list(reasons)  # 이유 코드 (최종 선택 후 변환)
+        }
+
+    def _rank_talent_nodes(self, hero: HeroRecord, build_type: str) -> ScoreRanking:
+        """전체 재능 노드 점수 순위 (카탈로그/규칙/God Type/빌드 타입별 캐시)"""
+        def compute() -> ScoreRanking:
+            rules = self.rules.bind("talent_node", {"god_type": hero.god_type, "build_type": build_type})
+            return _rank([rules.evaluate(node) for node in self.catalog.talent_nodes])
+
+        return _cached_scores(self.catalog, ("talent_node", self.rules, hero.god_type, build_type), compute)
 
     def _analyze_build_type(self, skills: List[Dict]) -> str:
         """추천된 스킬들을 분석하여 빌드 타입 결정"""
@@ -678,7 +980,7 @@ class RecommendationEngineV2:
 
     def _generate_build_summary_v2(
         self,
-        hero: Hero,
+        hero: HeroRecord,
         skills: List[Dict],
         items: List[Dict],
         build_type: str
@@ -732,73 +1034,6 @@ class RecommendationEngineV2:
 
         return preferences
 
-    def _get_talent_level_effects(self, talent_name: str) -> List[TalentLevel]:
-        """
-        재능의 모든 레벨 효과 조회 (DB에서 크롤링된 데이터)
-
-        Args:
-            talent_name: 재능 이름
-
-        Returns:
-            재능 레벨 효과 리스트
-        """
-        # 캐시 확인
-        if talent_name in self._talent_level_cache:
-            return self._talent_level_cache[talent_name]
-
-        # DB 조회
-        talent_levels = self.db.query(TalentLevel).filter(
-            TalentLevel.talent_name == talent_name
-        ).order_by(TalentLevel.level).all()
-
-        # 캐시 저장
-        self._talent_level_cache[talent_name] = talent_levels
-
-        return talent_levels
-
-    def _has_critical_level_60_penalty(self, talent_name: str) -> bool:
-        """
-        60레벨에 중요한 패널티가 있는지 확인
-
-        Args:
-            talent_name: 재능 이름
-
-        Returns:
-            60레벨 패널티 존재 여부
-        """
-        talent_levels = self._get_talent_level_effects(talent_name)
-
-        for level in talent_levels:
-            if level.level == 60:
-                desc_lower = level.effect_description.lower()
-                # -80%, -50% 같은 큰 패널티 확인
-                if '-80%' in desc_lower or '-50%' in desc_lower:
-                    return True
-
-                # "non-" 패턴 확인 (non-Burst, non-DoT 등)
-                if 'non-' in desc_lower and 'damage' in desc_lower:
-                    return True
-
-        return False
-
-    def _get_talent_level_mechanics(self, talent_name: str) -> Dict[str, List[str]]:
-        """
-        재능의 레벨별 메커니즘 추출
-
-        Args:
-            talent_name: 재능 이름
-
-        Returns:
-            레벨별 메커니즘 딕셔너리 {level: [mechanics]}
-        """
-        talent_levels = self._get_talent_level_effects(talent_name)
-        level_mechanics = {}
-
-        for level in talent_levels:
-            try:
-                mechanics = json.loads(level.mechanics) if level.mechanics else []
-                level_mechanics[level.level] = mechanics
-            except:
-                level_mechanics[level.level] = []
-
-        return level_mechanics
+    def _get_talent_profile(self, talent_name: str) -> TalentProfile:
+        """재능 프로필 조회 (DB 세션이 있으면 변경 시 자동 갱신)"""
+        return get_talent_profile(talent_name, self.db)
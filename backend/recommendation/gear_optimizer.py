@@ -0,0 +1,402 @@
+"""
+장비 슬롯 배정 최적화
+
+슬롯마다 아이템을 하나씩 배정하여 (아이템 점수 합 + 세트 보너스)가 최대가 되도록 합니다.
+슬롯 순서대로 진행하는 동적 계획법이며, 상태는 (배정한 아이템 수, 세트별 장착 개수)입니다.
+세트 보너스 때문에 조금 약한 아이템을 고르는 편이 나은 경우도 찾아냅니다.
+
+상태 수를 줄이기 위해:
+- 슬롯별로 "세트 무관 최고 아이템"과 "세트별 최고 아이템"만 후보로 남김 (지배 관계)
+- 보너스가 아이템 점수 손실을 넘지 못하는 세트는 제외하거나 개수를 고정하여 상태 병합
+- 남은 슬롯 최고 점수 + 세트별 (보너스 - 최소 손실) 배낭 문제로 계산한 상한이
+  하한보다 낮은 상태는 제거 (선형 완화로 먼저 거르고, 남은 상태만 정확히 계산)
+- 빔 탐색으로 먼저 좋은 하한을 구해 가지치기 효과를 높임
+
+시간 예산을 넘기면 그때까지의 최선 해를 반환합니다 (optimal=False).
+"""
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+DEFAULT_TIME_BUDGET_MS = 50
+# 하한을 구하는 1차 빔 탐색의 단계별 상태 수
+BEAM_WIDTH = 16
+
+
+@dataclass
+class GearAssignment:
+    """슬롯 배정 결과"""
+    indices: List[int]  # 선택된 후보 인덱스 (입력 순서 = 점수 내림차순)
+    total_score: float  # 아이템 점수 합 + 세트 보너스
+    item_score: float
+    set_bonus_score: float
+    active_bonuses: List[Tuple[str, int]]  # 활성화된 (세트 이름, 피스 수)
+    greedy_score: float  # 슬롯별 최고 점수 아이템만 고른 경우의 총점
+    optimal: bool  # 시간 예산 내 탐색 완료 여부 (True면 최적해 보장)
+    states: int  # 동적 계획법 상태 수
+    elapsed_ms: float
+
+
+def _evaluate(
+    candidates: List[Dict],
+    indices: Sequence[int],
+    set_bonuses: Dict[str, List[Tuple[int, float]]]
+) -> Tuple[float, float, List[Tuple[str, int]]]:
+    """배정의 (아이템 점수 합, 세트 보너스 합, 활성화된 (세트 이름, 피스 수) 목록)"""
+    counts: Dict[str, int] = {}
+    for index in indices:
+        set_name = candidates[index].get("set_name")
+        if set_name in set_bonuses:
+            counts[set_name] = counts.get(set_name, 0) + 1
+
+    active = [
+        (set_name, pieces)
+        for set_name, count in counts.items()
+        for pieces, _ in sorted(set_bonuses[set_name])
+        if count >= pieces
+    ]
+    bonus = sum(
+        value
+        for set_name, count in counts.items()
+        for pieces, value in set_bonuses[set_name]
+        if count >= pieces
+    )
+    return sum(candidates[i]["score"] for i in indices), bonus, active
+
+
+def assign_gear(
+    candidates: List[Dict],
+    set_bonuses: Dict[str, List[Tuple[int, float]]],
+    max_items: int,
+    time_budget_ms: float = DEFAULT_TIME_BUDGET_MS
+) -> GearAssignment:
+    """
+    세트 보너스를 고려한 최적 슬롯 배정
+
+    Args:
+        candidates: 점수 내림차순으로 정렬된 아이템 후보 (slot, score, set_name 키 사용,
+            딕셔너리 또는 키 조회를 지원하는 레코드)
+        set_bonuses: {세트 이름: [(필요 피스 수, 보너스 점수), ...]}
+        max_items: 배정할 최대 아이템 수 (슬롯 수보다 작으면 그 개수만큼만 배정)
+        time_budget_ms: 정확한 탐색의 시간 예산 (밀리초)
+
+    Returns:
+        GearAssignment (세트 보너스로 이득이 없으면 탐욕 해와 같은 배정)
+    """
+    started = time.perf_counter()
+
+    # 1. 슬롯 목록 (첫 등장 순서) 및 탐욕 해: 점수순으로 슬롯당 1개
+    slots: List[str] = []
+    greedy: List[int] = []
+    for index, candidate in enumerate(candidates):
+        if candidate["slot"] not in slots:
+            slots.append(candidate["slot"])
+            if len(greedy) < max_items:
+                greedy.append(index)
+    target = min(max_items, len(slots))
+
+    # 2. 점수가 0 이하인 단계는 고를 이유가 없으므로 제외
+    set_bonuses = {
+        name: sorted((pieces, value) for pieces, value in tiers if value > 0)
+        for name, tiers in set_bonuses.items()
+    }
+    greedy_items, greedy_bonus, greedy_active = _evaluate(candidates, greedy, set_bonuses)
+    greedy_score = greedy_items + greedy_bonus
+
+    def greedy_result(states: int, optimal: bool) -> GearAssignment:
+        return GearAssignment(
+            indices=greedy,
+            total_score=greedy_score,
+            item_score=greedy_items,
+            set_bonus_score=greedy_bonus,
+            active_bonuses=greedy_active,
+            greedy_score=greedy_score,
+            optimal=optimal,
+            states=states,
+            elapsed_ms=(time.perf_counter() - started) * 1000
+        )
+
+    # 3. 슬롯별 최고 점수와 세트별 최고 아이템 (점수 내림차순이므로 첫 등장)
+    best_in_slot: Dict[str, float] = {}
+    set_items: Dict[str, Dict[str, int]] = {}
+    for index, candidate in enumerate(candidates):
+        best_in_slot.setdefault(candidate["slot"], candidate["score"])
+        set_name = candidate.get("set_name")
+        if set_bonuses.get(set_name):
+            set_items.setdefault(set_name, {}).setdefault(candidate["slot"], index)
+
+    # 보너스가 최고 아이템 대비 손실을 넘을 수 있는 세트만 상태에 포함
+    # (넘지 못하면 세트 아이템을 슬롯 최고 아이템으로 바꾼 해가 항상 같거나 나음)
+    set_names = []
+    for set_name, items in set_items.items():
+        losses = sorted(best_in_slot[slot] - candidates[index]["score"] for slot, index in items.items())
+        bonus = 0.0
+        for pieces, value in set_bonuses[set_name]:
+            if pieces > min(target, len(losses)):
+                break
+            bonus += value
+            if bonus > sum(losses[:pieces]) + 1e-9:
+                set_names.append(set_name)
+                break
+
+    if not set_names or target == 0:
+        return greedy_result(0, True)
+
+    set_ids = {name: i for i, name in enumerate(set_names)}
+    set_tiers = [set_bonuses[name] for name in set_names]
+    caps = [tiers[-1][0] for tiers in set_tiers]
+    search_bonuses = {name: set_bonuses[name] for name in set_names}
+
+    def item_set_id(index: int) -> int:
+        return set_ids.get(candidates[index].get("set_name"), -1)
+
+    # 슬롯별 후보: 세트 무관 최고 아이템 + 탐색 대상 세트별 최고 아이템
+    options: Dict[str, Dict[int, int]] = {slot: {} for slot in slots}
+    for index, candidate in enumerate(candidates):
+        options[candidate["slot"]].setdefault(item_set_id(index), index)
+    slot_options = [list(options[slot].values()) for slot in slots]
+
+    # 4. 상한 계산용 테이블 (position번째 이후 남은 슬롯 기준)
+    #    - remaining_best[p][r]: 슬롯별 최고 점수 중 상위 r개 합
+    #    - set_losses[p][s][k]: 세트 s 아이템 k개를 쓸 때 최고 아이템 대비 최소 손실 합
+    best_scores = [max(candidates[i]["score"] for i in opts) for opts in slot_options]
+    remaining_best: List[List[float]] = []
+    set_losses: List[List[List[float]]] = []
+    for position in range(len(slots) + 1):
+        prefix = [0.0]
+        for value in sorted(best_scores[position:], reverse=True):
+            prefix.append(prefix[-1] + value)
+        remaining_best.append(prefix)
+
+        losses: List[List[float]] = [[] for _ in set_names]
+        for offset, opts in enumerate(slot_options[position:]):
+            for index in opts:
+                if item_set_id(index) >= 0:
+                    losses[item_set_id(index)].append(
+                        best_scores[position + offset] - candidates[index]["score"]
+                    )
+        loss_prefix = []
+        for values in losses:
+            prefix = [0.0]
+            for value in sorted(values):
+                prefix.append(prefix[-1] + value)
+            loss_prefix.append(prefix)
+        set_losses.append(loss_prefix)
+
+    Increments = Tuple[List[Tuple[float, int, float]], List[Tuple[int, float]]]
+    increment_cache: Dict[Tuple[int, int, int, int], Increments] = {}
+
+    def set_increments(
+        position: int, s: int, count: int, need: int
+    ) -> Increments:
+        """
+        세트 s를 더 장착할 때의 (이득/피스, 추가 피스, 추가 이득) 증분 목록 + (추가 피스, 이득) 선택지
+
+        단계 도달 시의 (추가 피스, 보너스 - 최소 손실) 중 이득인 것만 골라 선택지로 두고,
+        위로 볼록한 껍질을 증분으로 나눕니다. 비어 있으면 더 장착해도 이득이 없는 세트입니다.
+        """
+        key = (position, s, count, need)
+        result = increment_cache.get(key)
+        if result is None:
+            losses = set_losses[position][s]
+            choices: List[Tuple[int, float]] = []
+            points = [(0, 0.0)]
+            bonus = 0.0
+            for pieces, value in set_tiers[s]:
+                if pieces <= count:
+                    continue
+                extra = pieces - count
+                if extra > need or extra >= len(losses):
+                    break
+                bonus += value
+                gain = bonus - losses[extra]
+                if gain <= 1e-9:
+                    continue
+                choices.append((extra, gain))
+                if gain <= points[-1][1] + 1e-9:
+                    continue
+                # 볼록 껍질 유지: 기울기가 증가하는 점은 제거
+                while len(points) >= 2 and (
+                    (points[-1][1] - points[-2][1]) * (extra - points[-1][0])
+                    <= (gain - points[-1][1]) * (points[-1][0] - points[-2][0])
+                ):
+                    points.pop()
+                points.append((extra, gain))
+            increments = [
+                ((gain - prev_gain) / (extra - prev_extra), extra - prev_extra, gain - prev_gain)
+                for (prev_extra, prev_gain), (extra, gain) in zip(points, points[1:])
+            ]
+            result = (increments, choices)
+            increment_cache[key] = result
+        return result
+
+    bound_cache: Dict[Tuple[int, int, Tuple[int, ...]], Tuple[float, Tuple[int, ...]]] = {}
+
+    def bound_and_normalize(
+        counts: Tuple[int, ...], position: int, need: int
+    ) -> Tuple[float, Tuple[int, ...]]:
+        """
+        남은 슬롯에서 얻을 수 있는 점수 상한 + 정규화된 세트 개수
+
+        상한은 남은 슬롯 최고 점수 합에, 세트별 (보너스 - 최소 손실)을 남은 배정 수 안에서
+        고르는 배낭 문제의 선형 완화 값을 더한 값입니다 (세트 간 슬롯 충돌은 무시).
+        보너스가 손실을 넘지 못하는 세트는 해당 세트 아이템을 슬롯 최고 아이템으로 바꾼 해가
+        항상 같거나 낫기 때문에, 개수를 상한으로 고정(남은 보너스 무시)해도 최적해는 변하지 않습니다.
+        """
+        key = (position, need, counts)
+        cached = bound_cache.get(key)
+        if cached is not None:
+            return cached
+
+        increments = []
+        normalized = None
+        for s, count in enumerate(counts):
+            if count >= caps[s]:
+                continue
+            set_increment, _ = set_increments(position, s, count, need)
+            if set_increment:
+                increments.extend(set_increment)
+            else:
+                if normalized is None:
+                    normalized = list(counts)
+                normalized[s] = caps[s]
+
+        # 이득/피스 비율 순으로 채우고 마지막은 분수로 (선형 완화)
+        bonus = 0.0
+        capacity = need
+        for ratio, extra, gain in sorted(increments, reverse=True):
+            if extra <= capacity:
+                bonus += gain
+                capacity -= extra
+            else:
+                bonus += ratio * capacity
+                break
+
+        result = (
+            remaining_best[position][need] + bonus,
+            counts if normalized is None else tuple(normalized)
+        )
+        bound_cache[key] = result
+        return result
+
+    exact_cache: Dict[Tuple[int, int, Tuple[int, ...]], float] = {}
+
+    def exact_bound(counts: Tuple[int, ...], position: int, need: int) -> float:
+        """선형 완화로 제거되지 않은 상태에 대해 배낭 문제를 정확히 풀어 상한을 좁힘"""
+        key = (position, need, counts)
+        upper = exact_cache.get(key)
+        if upper is None:
+            table = [0.0] * (need + 1)
+            for s, count in enumerate(counts):
+                if count >= caps[s]:
+                    continue
+                _, choices = set_increments(position, s, count, need)
+                if not choices:
+                    continue
+                merged = table[:]
+                for extra, gain in choices:
+                    for j in range(extra, need + 1):
+                        if table[j - extra] + gain > merged[j]:
+                            merged[j] = table[j - extra] + gain
+                table = merged
+            upper = remaining_best[position][need] + table[need]
+            exact_cache[key] = upper
+        return upper
+
+    def search(
+        lower: float, beam_width: Optional[int], deadline: Optional[float]
+    ) -> Tuple[Optional[Tuple[float, Tuple[int, ...]]], int, bool]:
+        """
+        슬롯 순서 동적 계획법: (배정 수, 세트별 개수) → (점수, 선택 인덱스)
+
+        beam_width가 주어지면 단계마다 (점수 + 상한) 상위 상태만 남기는 근사 탐색입니다.
+        deadline을 넘기면 탐색을 중단합니다 (완료 여부 False).
+        """
+        states: Dict[Tuple[int, Tuple[int, ...]], Tuple[float, float, Tuple[int, ...]]] = {
+            (0, bound_and_normalize((0,) * len(set_names), 0, target)[1]): (0.0, 0.0, ())
+        }
+        state_count = 1
+        for position, opts in enumerate(slot_options):
+            slots_left = len(slots) - position - 1
+            next_states: Dict[Tuple[int, Tuple[int, ...]], Tuple[float, float, Tuple[int, ...]]] = {}
+
+            def push(used, counts, value, chosen):
+                need = target - used
+                if need > slots_left:
+                    return
+                # 상한이 현재 하한보다 낮으면 제거
+                upper, counts = bound_and_normalize(counts, position + 1, need)
+                if value + upper < lower - 1e-9:
+                    return
+                if beam_width is None:
+                    upper = exact_bound(counts, position + 1, need)
+                    if value + upper < lower - 1e-9:
+                        return
+                key = (used, counts)
+                current = next_states.get(key)
+                if current is None or value > current[0]:
+                    next_states[key] = (value, value + upper, chosen)
+
+            for expanded, ((used, counts), (value, _, chosen)) in enumerate(states.items()):
+                if deadline is not None and expanded % 64 == 0 and time.perf_counter() > deadline:
+                    return None, state_count, False
+                # 슬롯 비우기 (max_items가 슬롯 수보다 작을 때만 의미 있음)
+                push(used, counts, value, chosen)
+                if used >= target:
+                    continue
+
+                for index in opts:
+                    gain = candidates[index]["score"]
+                    next_counts = counts
+                    set_id = item_set_id(index)
+                    if set_id >= 0 and counts[set_id] < caps[set_id]:
+                        count = counts[set_id] + 1
+                        next_counts = counts[:set_id] + (count,) + counts[set_id + 1:]
+                        gain += sum(bonus for pieces, bonus in set_tiers[set_id] if pieces == count)
+                    push(used + 1, next_counts, value + gain, chosen + (index,))
+
+            if beam_width is not None and len(next_states) > beam_width:
+                kept = sorted(next_states.items(), key=lambda entry: entry[1][1], reverse=True)[:beam_width]
+                next_states = dict(kept)
+            states = next_states
+            state_count += len(states)
+
+        best: Optional[Tuple[float, Tuple[int, ...]]] = None
+        for (used, _), (value, _, chosen) in states.items():
+            if used == target and (best is None or value > best[0]):
+                best = (value, chosen)
+        return best, state_count, True
+
+    # 5. 빔 탐색으로 좋은 하한을 먼저 구한 뒤, 그 하한으로 가지치기하며 정확한 탐색
+    #    (시간 예산을 넘기면 그때까지의 최선 해, 빔 탐색도 끝내지 못하면 탐욕 해 사용)
+    deadline = started + time_budget_ms / 1000
+    search_greedy = greedy_items + _evaluate(candidates, greedy, search_bonuses)[1]
+    incumbent, state_count, completed = search(search_greedy, BEAM_WIDTH, deadline)
+    best = None
+    if completed:
+        lower = search_greedy if incumbent is None else max(search_greedy, incumbent[0])
+        best, exact_states, completed = search(lower, None, deadline)
+        state_count += exact_states
+    if best is None or (incumbent is not None and incumbent[0] > best[0]):
+        best = incumbent
+
+    # 6. 탐욕 해보다 나을 때만 교체 (제외한 세트의 보너스까지 포함해 비교)
+    if best is None:
+        return greedy_result(state_count, completed)
+    indices = sorted(best[1])
+    item_score, set_bonus_score, active_bonuses = _evaluate(candidates, indices, set_bonuses)
+    if item_score + set_bonus_score <= greedy_score + 1e-9:
+        indices, item_score, set_bonus_score, active_bonuses = greedy, greedy_items, greedy_bonus, greedy_active
+
+    return GearAssignment(
+        indices=indices,
+        total_score=item_score + set_bonus_score,
+        item_score=item_score,
+        set_bonus_score=set_bonus_score,
+        active_bonuses=active_bonuses,
+        greedy_score=greedy_score,
+        optimal=completed,
+        states=state_count,
+        elapsed_ms=(time.perf_counter() - started) * 1000
+    )
@@ -0,0 +1,109 @@
+"""
+아이템 특징 비트마스크
+
+아이템 효과 키워드, 스탯 타입, 등급, 슬롯, 세트 여부를 카탈로그 생성 시 한 번만 추출하여
+정수 비트마스크로 저장합니다. 아이템 스코어링은 빌드별 요구 마스크와의 비트 연산으로 처리합니다.
+"""
+from typing import Dict, Iterable, List, Optional
+
+from backend.game_mechanics import DAMAGE_TYPES, get_ailment_for_damage_type
+from backend.keyword_matcher import KeywordHits, register_keywords
+from backend.talent_mechanics import TALENT_MECHANICS
+
+
+# 아이템 효과 키워드
+ITEM_DOT_KEYWORDS = ["affliction", "reaping", "damage over time", "dot"]
+ITEM_CRIT_KEYWORDS = ["critical", "crit"]
+BURST_ITEM_KEYWORDS = [
+    "double damage", "spell burst", "combo", "attack speed", "area", "aoe",
+    "burst", "melee", "rage", "cooldown", "recovery"
+]
+
+# 비트를 할당하는 기본 효과 키워드 (엔진 키워드 + 데미지 타입/상태이상 + 재능 추천 스탯)
+ITEM_EFFECT_KEYWORDS = list(dict.fromkeys(
+    ITEM_DOT_KEYWORDS
+    + ITEM_CRIT_KEYWORDS
+    + BURST_ITEM_KEYWORDS
+    + [damage_type.lower() for damage_type in DAMAGE_TYPES]
+    + [get_ailment_for_damage_type(damage_type).lower() for damage_type in DAMAGE_TYPES]
+    + [
+        stat.lower()
+        for mechanics in TALENT_MECHANICS.values()
+        for stat in mechanics.get("recommended_item_stats", [])
+    ]
+))
+
+register_keywords(ITEM_EFFECT_KEYWORDS)
+
+
+class ItemFeatureIndex:
+    """
+    아이템 특징 → 비트 위치 매핑
+
+    카탈로그마다 하나씩 생성되어 카탈로그와 함께 전달되므로,
+    배치 워커 프로세스에서도 아이템 마스크와 요구 마스크의 비트 위치가 일치합니다.
+    """
+
+    def __init__(self, effect_keywords: Iterable[str] = ()):
+        self._bits: Dict[str, int] = {}
+        self._effect_keywords: List[str] = []
+        self.set_item = self._bit("set")  # 세트 아이템
+        self.has_effects = self._bit("effects")  # special_effects 보유
+        for keyword in list(ITEM_EFFECT_KEYWORDS) + list(effect_keywords):
+            keyword = keyword.lower()
+            if keyword and keyword not in self._bits:
+                self._bit(keyword)
+                self._effect_keywords.append(keyword)
+
+    def _bit(self, feature: str) -> int:
+        """특징의 비트 (없으면 새로 할당 - 아이템 마스크 계산 시에만 호출)"""
+        bit = self._bits.get(feature)
+        if bit is None:
+            bit = 1 << len(self._bits)
+            self._bits[feature] = bit
+        return bit
+
+    def effect(self, *keywords: str) -> int:
+        """효과 키워드 요구 마스크 (비트가 없는 키워드는 어떤 아이템에도 매칭되지 않음)"""
+        mask = 0
+        for keyword in keywords:
+            mask |= self._bits.get(keyword.lower(), 0)
+        return mask
+
+    def stat_type(self, stat_type: Optional[str]) -> int:
+        """스탯 타입 요구 마스크"""
+        return self._bits.get(f"stat:{stat_type}", 0)
+
+    def rarity(self, rarity: Optional[str]) -> int:
+        """등급 요구 마스크"""
+        return self._bits.get(f"rarity:{rarity}", 0)
+
+    def slot(self, slot: Optional[str]) -> int:
+        """슬롯 요구 마스크"""
+        return self._bits.get(f"slot:{slot}", 0)
+
+    def item_mask(
+        self,
+        effect_hits: KeywordHits,
+        special_effects: Optional[str],
+        stat_type: Optional[str],
+        rarity: Optional[str],
+        slot: Optional[str],
+        set_name: Optional[str]
+    ) -> int:
+        """아이템 특징 비트마스크 계산 (새 스탯 타입/등급/슬롯은 비트 할당)"""
+        mask = 0
+        if stat_type:
+            mask |= self._bit(f"stat:{stat_type}")
+        if rarity:
+            mask |= self._bit(f"rarity:{rarity}")
+        if slot:
+            mask |= self._bit(f"slot:{slot}")
+        if set_name:
+            mask |= self.set_item
+        if special_effects:
+            mask |= self.has_effects
+            for keyword in self._effect_keywords:
+                if keyword in effect_hits:
+                    mask |= self._bits[keyword]
+        return mask
@@ -0,0 +1,254 @@
+"""
+사전 계산된 빌드 추천 (materialized_builds 테이블)
+
+규칙 기반 빌드의 파라미터 공간은 작으므로 (영웅 × 플레이스타일 × 개수 제한),
+크롤링이 끝날 때마다 전체 그리드를 프로세스 풀에서 계산해 테이블에 저장합니다.
+추천 API는 인덱스 조회 한 번으로 결과를 돌려주고, 그리드 밖 조합만 실시간 계산합니다.
+
+행은 카탈로그 버전(카탈로그 테이블 변경 횟수 + 스코어링 규칙 해시)으로 구분하므로,
+데이터나 규칙이 바뀌면 다시 계산하기 전까지는 자동으로 실시간 계산으로 돌아갑니다.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from backend.database.models import TalentLevel, MaterializedBuild
+from backend.instrumentation import span
+from backend.recommendation.catalog import (
+    CATALOG_MODELS as ENGINE_CATALOG_MODELS,
+    catalog_fingerprint,
+    invalidate_catalog
+)
+from backend.recommendation.engine_v2 import RecommendationEngineV2
+from backend.recommendation.scoring_rules import ScoringRules, get_scoring_rules
+
+logger = logging.getLogger(__name__)
+
+
+# 사전 계산 그리드 (None = 미지정)
+MATERIALIZED_PLAYSTYLES = (None, "Melee", "Ranged", "Spell", "Attack", "Projectile", "AoE", "DoT", "Summon")
+MATERIALIZED_LIMITS = ((6, 10), (4, 6))  # (max_skills, max_items): 기본값, 빠른 추천
+MATERIALIZED_EXPLAIN = (True, False)
+
+# focus는 recommend_build()가 결과에 반영하지 않으므로 그리드/조회 키에서 제외 (초점별 결과가 모두 같음)
+
+# 이 옵션이 켜진 요청은 사전 계산 대상이 아님 (항상 실시간 계산)
+LIVE_ONLY_OPTIONS = ("optimize_skills", "optimize_items", "allocate_talents", "pair_synergy")
+
+# 카탈로그 버전 재확인 간격 (초)
+VERSION_CHECK_INTERVAL = 2.0
+
+# 카탈로그 버전 지문에 포함하는 테이블 (엔진이 읽는 데이터 전부)
+CATALOG_MODELS = ENGINE_CATALOG_MODELS + (TalentLevel,)
+
+
+@dataclass
+class MaterializeResult:
+    """사전 계산 결과"""
+    catalog_version: str
+    builds: int  # 저장한 빌드 수
+    failed: int  # 계산 실패로 저장하지 않은 조합 수
+    elapsed_ms: float
+
+
+def params_key(
+    hero_id: int,
+    playstyle: Optional[str],
+    max_skills: int,
+    max_items: int,
+    explain: bool
+) -> str:
+    """조회 키 (미지정 플레이스타일은 빈 문자열, focus는 결과에 영향이 없어 제외)"""
+    return f"{hero_id}|{playstyle or ''}|{max_skills}|{max_items}|{int(explain)}"
+
+
+def _request_key(request: Dict) -> Optional[str]:
+    """요청 딕셔너리 → 조회 키 (사전 계산 대상이 아니면 None)"""
+    if any(request.get(option) for option in LIVE_ONLY_OPTIONS):
+        return None
+    return params_key(
+        request["hero_id"],
+        request.get("playstyle"),
+        request.get("max_skills", 6),
+        request.get("max_items", 10),
+        request.get("explain", True)
+    )
+
+
+# ==============================================================================
+# 카탈로그 버전
+# ==============================================================================
+
+def catalog_version(db: Session, rules: ScoringRules) -> str:
+    """
+    카탈로그 버전 - 카탈로그 테이블 변경 횟수 + 스코어링 규칙 해시 (조회 쿼리 1회)
+
+    변경 횟수는 DB 트리거가 행 INSERT/UPDATE/DELETE마다 올리므로 (catalog_revisions),
+    크롤러의 제자리 수정은 값 길이가 같아도 새 버전이 됩니다.
+    """
+    digest = hashlib.sha1(json.dumps(rules.spec, sort_keys=True).encode("utf-8"))
+    for table in catalog_fingerprint(db, CATALOG_MODELS):
+        digest.update(repr(table).encode("utf-8"))
+    return digest.hexdigest()
+
+
+_lock = threading.Lock()
+_version: Optional[str] = None
+_version_rules: Optional[ScoringRules] = None
+_last_checked = 0.0
+
+
+def current_catalog_version(db: Session) -> str:
+    """현재 카탈로그 버전 (VERSION_CHECK_INTERVAL 간격 또는 규칙이 바뀐 경우에만 다시 계산)"""
+    global _version, _version_rules, _last_checked
+
+    rules = get_scoring_rules()
+    now = time.monotonic()
+    with _lock:
+        if _version is not None and rules is _version_rules and now - _last_checked < VERSION_CHECK_INTERVAL:
+            return _version
+
+    version = catalog_version(db, rules)
+    with _lock:
+        _version, _version_rules, _last_checked = version, rules, now
+    return version
+
+
+def invalidate_catalog_version():
+    """카탈로그 변경 시 호출 - 다음 조회 때 버전 재계산"""
+    global _version
+    with _lock:
+        _version = None
+
+
+# ==============================================================================
+# 조회
+# ==============================================================================
+
+def lookup_materialized_builds(db: Session, requests: List[Dict]) -> List[Optional[Dict]]:
+    """
+    요청별 사전 계산 결과 조회
+
+    Args:
+        db: DB 세션
+        requests: recommend_build() 인자 딕셔너리 리스트
+
+    Returns:
+        요청 순서대로 결과 리스트 (그리드 밖이거나 현재 버전에 없으면 None)
+    """
+    keys = [_request_key(request) for request in requests]
+    wanted = {key for key in keys if key is not None}
+    if not wanted:
+        return [None] * len(requests)
+
+    try:
+        with span("materialized_lookup"):
+            version = current_catalog_version(db)
+            rows = db.query(MaterializedBuild.params_key, MaterializedBuild.result).filter(
+                MaterializedBuild.catalog_version == version,
+                MaterializedBuild.params_key.in_(wanted)
+            ).all()
+    except SQLAlchemyError as e:
+        # 테이블이 아직 없는 DB 등 - 실시간 계산으로 진행
+        db.rollback()
+        logger.debug(f"Materialized build lookup skipped: {e}")
+        return [None] * len(requests)
+
+    results = dict(rows)
+    return [json.loads(results[key]) if key in results else None for key in keys]
+
+
+def lookup_materialized_build(db: Session, request: Dict) -> Optional[Dict]:
+    """요청 1건의 사전 계산 결과 (없으면 None)"""
+    return lookup_materialized_builds(db, [request])[0]
+
+
+# ==============================================================================
+# 사전 계산
+# ==============================================================================
+
+def build_parameter_grid(hero_ids: List[int]) -> List[Dict]:
+    """사전 계산할 요청 목록"""
+    return [
+        {
+            "hero_id": hero_id,
+            "playstyle": playstyle,
+            "max_skills": max_skills,
+            "max_items": max_items,
+            "explain": explain
+        }
+        for hero_id in sorted(hero_ids)
+        for playstyle in MATERIALIZED_PLAYSTYLES
+        for max_skills, max_items in MATERIALIZED_LIMITS
+        for explain in MATERIALIZED_EXPLAIN
+    ]
+
+
+def materialize_builds(db: Session, workers: Optional[int] = None) -> MaterializeResult:
+    """
+    전체 그리드를 계산하여 materialized_builds 테이블을 현재 카탈로그 버전으로 교체
+
+    Args:
+        db: DB 세션
+        workers: 프로세스 풀 워커 수 (None이면 CPU 수)
+
+    Returns:
+        MaterializeResult
+    """
+    started = time.perf_counter()
+    MaterializedBuild.__table__.create(bind=db.get_bind(), checkfirst=True)
+
+    # 1. 버전 고정 후 카탈로그 로드 (크롤링 직후이므로 공유 스냅샷도 다시 로드, 엔진이 같은 규칙 객체를 사용)
+    invalidate_catalog()
+    engine = RecommendationEngineV2(db)
+    version = catalog_version(db, engine.rules)
+    requests = build_parameter_grid(list(engine.catalog.heroes))
+
+    # 2. 프로세스 풀에서 전체 계산
+    if workers is None:
+        workers = os.cpu_count() or 1
+    results = engine.recommend_builds(requests, workers=workers)
+
+    # 3. 계산 중 카탈로그가 바뀌었으면 저장하지 않음 (다음 실행에서 다시 계산)
+    if catalog_version(db, engine.rules) != version:
+        raise RuntimeError("Catalog changed while materializing builds; nothing was written")
+
+    # 4. 이전 버전 행을 지우고 한 트랜잭션으로 교체
+    rows: List[Dict] = []
+    failed = 0
+    for request, result in zip(requests, results):
+        if "error" in result:
+            failed += 1
+            continue
+        rows.append({
+            "catalog_version": version,
+            "params_key": _request_key(request),
+            "hero_id": request["hero_id"],
+            "playstyle": request["playstyle"] or "",
+            "max_skills": request["max_skills"],
+            "max_items": request["max_items"],
+            "explain": request["explain"],
+            "result": json.dumps(result, ensure_ascii=False)
+        })
+
+    db.query(MaterializedBuild).delete(synchronize_session=False)
+    db.bulk_insert_mappings(MaterializedBuild, rows)
+    db.commit()
+    invalidate_catalog_version()
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Materialized {len(rows)} builds for catalog {version[:12]} ({elapsed_ms:.0f} ms)")
+    return MaterializeResult(
+        catalog_version=version,
+        builds=len(rows),
+        failed=failed,
+        elapsed_ms=elapsed_ms
+    )
@@ -5,6 +5,11 @@ Game Mechanics Analyzer
 from typing import List, Dict, Set, Tuple
 import json
 
+from sqlalchemy.orm import Session
+
+from backend.database.models import Skill
+from backend.keyword_matcher import register_keywords, scan_keywords
+
 
 class MechanicsAnalyzer:
     """게임 메커니즘 기반 분석기"""
@@ -24,6 +29,30 @@ class MechanicsAnalyzer:
     # Hit-based ailments
     HIT_AILMENTS = {"Shock", "Frostbite"}
 
+    # Description keywords indicating DoT
+    DOT_KEYWORDS = ['damage over time', 'dot', 'per second', 'ignite', 'trauma',
+                    'wilt', 'burning', 'bleed', 'poison', 'erosion']
+
+    # Tag keywords -> special mechanics (definition order = detection order)
+    TAG_MECHANICS = {
+        'Spell Burst': ['spell burst'],
+        'Multistrike': ['multistrike'],
+        'Combo': ['combo'],
+        'Channeled': ['channel'],
+        'Chain': ['chain'],
+        'AoE': ['aoe', 'area'],
+        'Melee': ['melee'],
+        'Ranged': ['ranged'],
+    }
+
+    # Special mechanics bitmask (skills.mechanics_mask 컬럼, TAG_MECHANICS 정의 순서 = 비트 순서)
+    # 순서/항목을 바꾸면 scripts/backfill_skill_mechanics.py --all 로 다시 계산해야 함
+    MECHANIC_BITS = {name: 1 << bit for bit, name in enumerate(TAG_MECHANICS)}
+
+    # Item effect keywords
+    COHERENCE_KEYWORDS = ['affliction', 'reaping', 'critical', 'multistrike']
+    MULTIPLICATIVE_KEYWORDS = ['additional', 'more', 'multiplied']
+
     def __init__(self):
         pass
 
@@ -59,20 +88,19 @@ class MechanicsAnalyzer:
                 tags = []
 
         tags_lower = [tag.lower() for tag in tags]
-        desc_lower = (skill.get('description') or '').lower()
+        tag_hits = scan_keywords('\n'.join(tags_lower))
+        desc_hits = scan_keywords(skill.get('description'))
 
         # Detect DoT
-        dot_keywords = ['damage over time', 'dot', 'per second', 'ignite', 'trauma',
-                        'wilt', 'burning', 'bleed', 'poison', 'erosion']
         if any(kw in tags_lower for kw in ['dot', 'ailment']) or \
-           any(kw in desc_lower for kw in dot_keywords):
+           desc_hits.any_of(self.DOT_KEYWORDS):
             result['is_dot'] = True
             result['build_style'] = 'DoT'
 
         # Detect Hit-based
         hit_keywords = ['hit', 'strike', 'attack', 'cast']
         if any(kw in tags_lower for kw in hit_keywords) or \
-           'hit' in desc_lower:
+           'hit' in desc_hits:
             result['is_hit'] = True
             if not result['is_dot']:
                 result['build_style'] = 'Hit'
@@ -84,25 +112,47 @@ class MechanicsAnalyzer:
             result['ailment'] = self.DAMAGE_TO_AILMENT.get(result['damage_type'])
 
         # Detect special mechanics
-        if any('spell burst' in tag.lower() for tag in tags):
-            result['mechanics'].add('Spell Burst')
-        if any('multistrike' in tag.lower() for tag in tags):
-            result['mechanics'].add('Multistrike')
-        if any('combo' in tag.lower() for tag in tags):
-            result['mechanics'].add('Combo')
-        if any('channel' in tag.lower() for tag in tags):
-            result['mechanics'].add('Channeled')
-        if any('chain' in tag.lower() for tag in tags):
-            result['mechanics'].add('Chain')
-        if any('aoe' in tag.lower() or 'area' in tag.lower() for tag in tags):
-            result['mechanics'].add('AoE')
-        if any('melee' in tag.lower() for tag in tags):
-            result['mechanics'].add('Melee')
-        if any('ranged' in tag.lower() for tag in tags):
-            result['mechanics'].add('Ranged')
+        result['mechanics'].update(tag_hits.concepts(self.TAG_MECHANICS))
 
         return result
 
+    def skill_mechanics_columns(self, skill: Dict) -> Dict:
+        """
+        스킬 저장 시 함께 기록하는 파생 컬럼
+
+        Returns:
+            {'build_style': str, 'ailment': str, 'mechanics_mask': int}
+        """
+        analysis = self.analyze_skill_mechanics(skill)
+        return {
+            'build_style': analysis['build_style'],
+            'ailment': analysis['ailment'],
+            'mechanics_mask': self.mechanics_to_mask(analysis['mechanics'])
+        }
+
+    def apply_to_skill(self, skill) -> None:
+        """Skill 행(ORM 객체)의 파생 컬럼 갱신 (크롤러 저장/백필용)"""
+        columns = self.skill_mechanics_columns({
+            'tags': skill.tags,
+            'description': skill.description,
+            'damage_type': skill.damage_type
+        })
+        for key, value in columns.items():
+            setattr(skill, key, value)
+
+    @classmethod
+    def mechanics_to_mask(cls, mechanics) -> int:
+        """메커니즘 이름들 → 비트마스크"""
+        mask = 0
+        for mechanic in mechanics:
+            mask |= cls.MECHANIC_BITS[mechanic]
+        return mask
+
+    @classmethod
+    def mask_to_mechanics(cls, mask: int) -> List[str]:
+        """비트마스크 → 메커니즘 이름 목록 (정의 순서)"""
+        return [name for name, bit in cls.MECHANIC_BITS.items() if mask & bit]
+
     def get_recommended_stats(self, skill_analysis: Dict) -> List[str]:
         """
         스킬 분석 결과 기반 추천 스탯 리스트
@@ -218,41 +268,40 @@ class MechanicsAnalyzer:
             all_recommended_stats.update(self.get_recommended_stats(analysis))
 
         # Check item effects match
-        item_effects_lower = ' '.join(item_effects).lower()
+        item_hits = scan_keywords(' '.join(item_effects))
 
         matches = 0
         for stat in all_recommended_stats:
-            if stat and stat.lower() in item_effects_lower:
+            if stat and stat.lower() in item_hits:
                 matches += 1
                 score += 10
                 reasons.append(f"✓ {stat} synergy")
 
         # Build coherence bonus
         if dominant_style == 'DoT':
-            if 'affliction' in item_effects_lower:
+            if 'affliction' in item_hits:
                 score += 15
                 reasons.append("✓ Affliction (DoT multiplier)")
-            if 'reaping' in item_effects_lower:
+            if 'reaping' in item_hits:
                 score += 15
                 reasons.append("✓ Reaping (instant DoT damage)")
-            if 'critical' in item_effects_lower:
+            if 'critical' in item_hits:
                 score -= 5
                 reasons.append("⚠ Critical (not valuable for DoT)")
 
         elif dominant_style == 'Hit':
-            if 'critical' in item_effects_lower:
+            if 'critical' in item_hits:
                 score += 15
                 reasons.append("✓ Critical Strike (Hit build essential)")
-            if 'multistrike' in item_effects_lower:
+            if 'multistrike' in item_hits:
                 score += 10
                 reasons.append("✓ Multistrike (free extra attacks)")
-            if 'affliction' in item_effects_lower and 'reaping' not in item_effects_lower:
+            if 'affliction' in item_hits and 'reaping' not in item_hits:
                 score -= 5
                 reasons.append("⚠ Affliction (better for DoT builds)")
 
         # Multiplicative bonus detection
-        multiplicative_keywords = ['additional', 'more', 'multiplied']
-        if any(kw in item_effects_lower for kw in multiplicative_keywords):
+        if item_hits.any_of(self.MULTIPLICATIVE_KEYWORDS):
             score += 20
             reasons.append("✓✓ Multiplicative bonus (high value!)")
 
@@ -329,3 +378,46 @@ class MechanicsAnalyzer:
             ])
 
         return tips
+
+
+register_keywords(
+    MechanicsAnalyzer.DOT_KEYWORDS,
+    ['hit'],
+    MechanicsAnalyzer.TAG_MECHANICS,
+    MechanicsAnalyzer.COHERENCE_KEYWORDS,
+    MechanicsAnalyzer.MULTIPLICATIVE_KEYWORDS
+)
+
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def backfill_skill_mechanics(db: Session, recompute: bool = False, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    skills 테이블의 메커니즘 파생 컬럼 채우기 (기존 행 백필)
+
+    Args:
+        db: DB 세션
+        recompute: True면 전체 행 다시 계산 (MECHANIC_BITS 변경 시), False면 NULL 행만
+        batch_size: 커밋 단위 행 수
+
+    Returns:
+        갱신한 행 수
+    """
+    analyzer = MechanicsAnalyzer()
+    query = db.query(Skill).order_by(Skill.id)
+    if not recompute:
+        query = query.filter(Skill.mechanics_mask.is_(None))
+
+    updated = 0
+    last_id = 0
+    while True:
+        batch = query.filter(Skill.id > last_id).limit(batch_size).all()
+        if not batch:
+            break
+        for skill in batch:
+            analyzer.apply_to_skill(skill)
+        db.commit()
+        updated += len(batch)
+        last_id = batch[-1].id
+    return updated
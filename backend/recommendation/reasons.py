@@ -0,0 +1,100 @@
+"""
+추천 이유 코드
+
+스코어링 중에는 후보마다 짧은 이유 코드만 기록하고 (문자열 조합 없음),
+최종 선택된 후보에 대해서만 사람이 읽는 이유 문자열로 변환합니다.
+- 코드: "active_skill" 처럼 인자가 없는 문자열
+- 인자가 있는 코드: ("damage_type", "Fire") 처럼 (코드, 인자...) 튜플
+"""
+from typing import Dict, List, Sequence, Union
+
+
+ReasonCode = Union[str, tuple]
+
+REASON_TEXTS: Dict[str, str] = {
+    # 스킬
+    "active_skill": "핵심 액티브 스킬",
+    "support_skill": "서포트 스킬",
+    "dot_skill": "DoT 스킬",
+    "hit_skill": "Hit 스킬",
+    "damage_type": "{} 데미지",
+    "preferred_damage": "{} 최적 데미지",
+    "ailment": "{} 상태이상",
+    "playstyle_match": "{} 완벽 매칭",
+    "tag_synergy": "{}개 시너지 스탯",
+    "spell_burst_skill": "Spell Burst 가능",
+    "combo_skill": "Combo 스킬 (곱셈 스케일)",
+    "talent_required": "재능 필수: {}",
+    "talent_suggested": "재능 권장: {}",
+    "talent_avoid_dot": "⚠️ 재능 비추천: DoT 스킬",
+    "talent_avoid_spell": "⚠️ 재능 비추천: Spell",
+    "burst_unfit": "⚠️ Burst 재능에 부적합",
+    "talent_optimal": "재능 최적: {}",
+    "burst_trigger": "✅ Burst 트리거 (Melee Attack)",
+    "burst_area": "✅ Burst 데미지 증가 (Area)",
+    "level_60_penalty": "⚠️⚠️ 60레벨 패널티: Burst 불가 스킬",
+    "level_mechanic": "Lv{} 메커니즘: {}",
+
+    # 아이템
+    "stat_match": "{} 스탯 매칭",
+    "legendary": "레전더리",
+    "set_item": "{} 세트",
+    "damage_boost": "{} 강화",
+    "ailment_synergy": "{} 시너지",
+    "dot_optimized": "DoT 최적화 ({})",
+    "dot_crit_unneeded": "DoT 빌드에 크리티컬 불필요",
+    "crit_boost": "크리티컬 강화",
+    "double_damage": "더블 데미지",
+    "spell_burst_item": "Spell Burst 특화",
+    "combo_item": "Combo 특화",
+    "talent_stat": "재능 최적 스탯: {}",
+    "burst_cooldown": "✅ Burst 쿨다운 감소",
+    "rage_crit": "✅ Rage 생성 (Crit)",
+    "burst_damage": "✅ Burst 데미지 직접 증가",
+    "melee_damage": "✅ Melee 데미지 증가",
+    "rage_generation": "✅ Rage 생성 증가",
+    "cooldown_recovery": "✅ 쿨다운 회복",
+
+    # 재능 노드
+    "core_node": "코어 노드",
+    "god_class_match": "{} 매칭",
+    "legendary_node": "레전더리 노드",
+    "large_node": "대형 노드",
+    "medium_node": "중형 노드",
+    "dot_synergy": "DoT 빌드 시너지",
+    "hit_synergy": "Hit 빌드 시너지"
+}
+
+DEFAULT_REASON = "기본 추천"
+
+
+def render_reasons(codes: Sequence[ReasonCode], default: str = DEFAULT_REASON) -> str:
+    """이유 코드 → 사람이 읽는 이유 문자열 (코드가 없으면 default)"""
+    if not codes:
+        return default
+    return ", ".join(
+        REASON_TEXTS[code] if isinstance(code, str) else REASON_TEXTS[code[0]].format(*code[1:])
+        for code in codes
+    )
+
+
+def format_reason_codes(codes: Sequence[ReasonCode]) -> List[str]:
+    """이유 코드 → 프로그램용 문자열 목록 ("damage_type:Fire" 형태)"""
+    return [
+        code if isinstance(code, str) else ":".join([code[0]] + [str(arg) for arg in code[1:]])
+        for code in codes
+    ]
+
+
+def finalize_reasons(entries: Sequence[Dict], explain: bool, default: str = DEFAULT_REASON) -> None:
+    """
+    최종 선택된 추천 항목의 "reason" 코드를 변환 (제자리 수정)
+
+    explain=True면 reason을 이유 문자열로 바꾸고 (키 순서 유지),
+    False면 reason을 빼고 reason_codes 목록만 남깁니다.
+    """
+    for entry in entries:
+        if explain:
+            entry["reason"] = render_reasons(entry["reason"], default)
+        else:
+            entry["reason_codes"] = format_reason_codes(entry.pop("reason"))
@@ -0,0 +1,836 @@
+"""
+선언형 스코어링 규칙
+
+RecommendationEngineV2의 스킬/아이템/재능 노드 점수 규칙을 JSON 파일로 정의합니다.
+(기본 규칙: rules/default_scoring_rules.json, 환경 변수 SCORING_RULES_PATH로 교체 가능)
+
+- 로드 시: 규칙 파일을 검증하고 조건/점수/이유를 바인더로 컴파일
+- 요청 시: 빌드 컨텍스트(재능 프로필, 빌드 타입 등)를 바인딩하여 컨텍스트만으로 정해지는
+  조건은 상수로 접고 for_each는 펼친 뒤, 남은 후보 조건만으로 분기가 최소화된 평가 함수를
+  생성합니다. 생성된 함수는 컨텍스트별로 캐시하고, 아이템 요구 마스크는 카탈로그마다 1회 계산
+- 최상위 규칙별로 참조하는 컨텍스트 변수를 기록하여, 일부 규칙만 바인딩할 수 있습니다
+  (엔진은 플레이스타일을 참조하지 않는 규칙 구간의 점수를 영웅별로 캐시)
+- 규칙 파일이 바뀌면 워커 재시작 없이 다시 로드 (RELOAD_CHECK_INTERVAL 간격으로 mtime 확인)
+
+규칙 형식:
+    {"when": 조건, "score": 점수, "reason": 이유, "else": 규칙}   - 점수 규칙
+    {"when": 조건, "rules": [규칙, ...], "else": 규칙}             - 그룹
+        "first": true        → 처음 적용된 하위 규칙에서 멈춤
+        "for_each": "목록"   → 컨텍스트 목록의 원소마다 하위 규칙 반복 ("as": 변수 이름)
+
+값 참조: "$이름"은 컨텍스트/반복 변수 ("$index"는 반복 순번), "@이름"은 후보 속성, 그 외는 리터럴
+점수: 숫자 | {"attr": "@속성", "times": 배수} | {"base": 기본, "step": 반복 순번당 증감}
+이유: null | "코드" | ["코드", 인자, ...] (코드는 reasons.REASON_TEXTS에 정의된 것만)
+
+조건:
+    공통: all, any, not, has, eq, contains, icontains, longer
+    skill: tag, description, tag_contains_all
+    item: effect, effect_all, stat_type, rarity, set_item, has_effects (특징 비트마스크 연산)
+    talent_node: effect
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from backend.keyword_matcher import register_keywords
+from backend.recommendation.reasons import REASON_TEXTS, ReasonCode
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_RULES_PATH = Path(__file__).parent / "rules" / "default_scoring_rules.json"
+RULES_PATH_ENV = "SCORING_RULES_PATH"
+
+# 규칙 파일 변경 여부 재확인 간격 (초)
+RELOAD_CHECK_INTERVAL = 2.0
+
+# 컨텍스트별 생성 함수 캐시 크기 (규칙 종류 합계)
+EVALUATOR_CACHE_SIZE = 256
+
+# 규칙 종류별 컨텍스트 변수 (엔진이 바인딩 시 모두 제공)
+RULE_CONTEXT = {
+    "skill": (
+        "playstyle", "god_type", "preferred_damage_types",
+        "has_mechanics", "must_have_mechanics", "avoid_mechanics", "recommended_skill_types",
+        "is_burst_talent", "has_level_60_penalty", "level_bonus_mechanics"
+    ),
+    "item": (
+        "primary_stat", "primary_damage_type", "primary_ailment", "is_dot_build",
+        "has_spell_burst", "has_combo", "has_mechanics", "is_burst_talent", "recommended_item_stats"
+    ),
+    "talent_node": ("god_type", "build_type")
+}
+
+# 아이템 규칙의 후보 속성 (아이템은 특징 비트마스크로만 평가)
+ITEM_ATTRIBUTES = ("set_name",)
+
+RULE_KEYS = {"id", "when", "score", "reason", "else", "rules", "first", "for_each", "as"}
+
+
+class ScoringRuleError(ValueError):
+    """규칙 파일 형식 오류"""
+
+
+class ItemCandidate(NamedTuple):
+    """아이템 규칙 평가 대상"""
+    feature_mask: int
+    set_name: Optional[str]
+
+
+# 바인딩 후 조건: 상수로 접히면 bool, 아니면 후보 c에 대한 파이썬 식
+Condition = Union[bool, str]
+
+
+# ==============================================================================
+# 생성 코드에서 쓰는 보조 함수
+# ==============================================================================
+
+def _contains(text, part) -> bool:
+    return bool(text) and part is not None and part in text
+
+
+def _icontains(text, part) -> bool:
+    return bool(text) and bool(part) and part.lower() in text.lower()
+
+
+def _longer(text, length) -> bool:
+    return bool(text) and len(text) > length
+
+
+def _tag_contains_all(tags_lower, keywords) -> bool:
+    """태그 하나에 모든 키워드가 포함되는지 (예: "melee attack")"""
+    return any(all(keyword in tag for keyword in keywords) for tag in tags_lower)
+
+
+_HELPERS = {
+    "_contains": _contains,
+    "_icontains": _icontains,
+    "_longer": _longer,
+    "_tag_contains_all": _tag_contains_all
+}
+
+
+# ==============================================================================
+# 바인딩 (요청 컨텍스트 → 평가 함수 소스)
+# ==============================================================================
+
+class _Binding:
+    """평가 함수 생성 상태 (상수 테이블, 마스크 계산식, 반복 변수)"""
+
+    def __init__(self, values: Dict, constants: Optional[Dict] = None, masks: Optional[List[str]] = None):
+        self.values = values
+        self.constants = constants if constants is not None else {}
+        self.masks = masks if masks is not None else []  # 카탈로그별로 1회 계산할 요구 마스크 식
+
+    def child(self, values: Dict) -> "_Binding":
+        return _Binding(values, self.constants, self.masks)
+
+    def const(self, value) -> str:
+        """상수를 생성 코드의 전역 이름으로 등록 (규칙 파일 값은 소스에 직접 넣지 않음)"""
+        name = f"k{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+    def mask(self, expression: str) -> str:
+        """요구 마스크 계산식 등록 → 마스크 변수 이름"""
+        name = f"m{len(self.masks)}"
+        self.masks.append(f"{name} = {expression}")
+        return name
+
+
+class _Leaf(NamedTuple):
+    condition: Condition
+    score: str
+    reason: Optional[str]
+    otherwise: Tuple
+
+
+class _Group(NamedTuple):
+    condition: Condition
+    ops: Tuple
+    first: bool
+    otherwise: Tuple
+
+
+class _SourceWriter:
+    """바인딩된 규칙 → 파이썬 소스 (flag: 규칙 적용 여부를 기록할 변수)"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self._flags = 0
+
+    def emit(self, ops, indent: int, flag: Optional[str] = None):
+        for op in ops:
+            if isinstance(op, _Leaf):
+                self._leaf(op, indent, flag)
+            elif op.first:
+                self._first_group(op, indent, flag)
+            else:
+                self._block(op.condition, op.otherwise, indent, flag, lambda i: self.emit(op.ops, i, flag))
+
+    def _block(self, condition: Condition, otherwise, indent: int, flag, body: Callable[[int], None]):
+        pad = "    " * indent
+        if condition is True:
+            body(indent)
+            return
+        self.lines.append(f"{pad}if {condition}:")
+        body(indent + 1)
+        if otherwise:
+            self.lines.append(f"{pad}else:")
+            self.emit(otherwise, indent + 1, flag)
+
+    def _leaf_body(self, op: _Leaf, indent: int, flag: Optional[str]):
+        pad = "    " * indent
+        self.lines.append(f"{pad}score += {op.score}")
+        if op.reason is not None:
+            self.lines.append(f"{pad}reasons.append({op.reason})")
+        if flag:
+            self.lines.append(f"{pad}{flag} = True")
+
+    def _leaf(self, op: _Leaf, indent: int, flag: Optional[str]):
+        self._block(op.condition, op.otherwise, indent, flag, lambda i: self._leaf_body(op, i, flag))
+
+    def _first_group(self, op: _Group, indent: int, flag: Optional[str]):
+        def body(i: int):
+            pad = "    " * i
+            if all(isinstance(child, _Leaf) and not child.otherwise for child in op.ops):
+                # 단순 점수 규칙만 있으면 if/elif 체인
+                for j, child in enumerate(op.ops):
+                    if child.condition is True:
+                        self.lines.append(f"{pad}else:" if j else f"{pad}if True:")
+                        self._leaf_body(child, i + 1, flag)
+                        break
+                    self.lines.append(f"{pad}{'elif' if j else 'if'} {child.condition}:")
+                    self._leaf_body(child, i + 1, flag)
+                return
+
+            self._flags += 1
+            local = f"f{self._flags}"
+            self.lines.append(f"{pad}{local} = False")
+            for j, child in enumerate(op.ops):
+                if j:
+                    self.lines.append(f"{pad}if not {local}:")
+                self.emit([child], i + 1 if j else i, local)
+            if flag:
+                self.lines.append(f"{pad}if {local}:")
+                self.lines.append(f"{pad}    {flag} = True")
+
+        self._block(op.condition, op.otherwise, indent, flag, body)
+
+
+class BoundRules:
+    """컨텍스트가 바인딩된 평가 함수 (요청 1건 동안 사용)"""
+
+    __slots__ = ("evaluate", "feature_mask", "source")
+
+    def __init__(self, evaluate: Callable[[Any], Tuple[float, List[ReasonCode]]], feature_mask: int, source: str):
+        self.evaluate = evaluate  # evaluate(후보) -> (점수, 이유 코드)
+        self.feature_mask = feature_mask  # 아이템 규칙이 참조하는 특징 비트 (나머지 비트는 점수 무관)
+        self.source = source  # 생성된 소스 (디버깅용)
+
+
+# ==============================================================================
+# 컴파일 (로드 시 1회)
+# ==============================================================================
+
+def _and(binders: List[Callable], binding: "_Binding") -> Condition:
+    """조건 AND (상수 False가 나오면 뒤 조건은 바인딩하지 않음)"""
+    expressions = []
+    for binder in binders:
+        condition = binder(binding)
+        if condition is False:
+            return False
+        if condition is not True:
+            expressions.append(condition)
+    if not expressions:
+        return True
+    return expressions[0] if len(expressions) == 1 else "(" + " and ".join(expressions) + ")"
+
+
+def _or(binders: List[Callable], binding: "_Binding") -> Condition:
+    """조건 OR (상수 True가 나오면 뒤 조건은 바인딩하지 않음)"""
+    expressions = []
+    for binder in binders:
+        condition = binder(binding)
+        if condition is True:
+            return True
+        if condition is not False:
+            expressions.append(condition)
+    if not expressions:
+        return False
+    return expressions[0] if len(expressions) == 1 else "(" + " or ".join(expressions) + ")"
+
+
+class _RuleCompiler:
+    """규칙 종류 하나(skill/item/talent_node)의 컴파일러"""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.keywords: List[str] = []  # 리터럴 키워드 (공유 매처 등록용)
+        self.effect_keywords: List[str] = []  # 아이템 효과 리터럴 키워드 (특징 비트 할당용)
+        self.references: set = set()  # 참조한 변수 이름 (최상위 규칙마다 초기화)
+        self.conditions = {
+            "all": self._all,
+            "any": self._any,
+            "not": self._not,
+            "has": self._has,
+            "eq": self._binary(lambda a, b: a == b, self._eq),
+            "contains": self._binary(_contains, self._contains),
+            "icontains": self._binary(_icontains, self._icontains),
+            "longer": self._binary(_longer, self._longer)
+        }
+        if kind == "skill":
+            self.conditions.update({
+                "tag": self._keywords("tag_hits"),
+                "description": self._keywords("description_hits"),
+                "tag_contains_all": self._tag_contains_all
+            })
+        elif kind == "item":
+            self.conditions.update({
+                "effect": self._item_effect(require_all=False),
+                "effect_all": self._item_effect(require_all=True),
+                "stat_type": self._item_feature("features.stat_type"),
+                "rarity": self._item_feature("features.rarity"),
+                "set_item": self._item_flag("features.set_item"),
+                "has_effects": self._item_flag("features.has_effects")
+            })
+        elif kind == "talent_node":
+            self.conditions["effect"] = self._keywords("effect_hits")
+        else:
+            raise ScoringRuleError(f"unknown rule kind: {kind}")
+
+    # ----- 값 참조 -----
+
+    def operand(self, value, scope: frozenset, path: str):
+        """값 참조 → binder(binding) -> (상수 여부, 상수 값 또는 후보 속성 식)"""
+        if isinstance(value, str) and value.startswith("$"):
+            name = value[1:]
+            if name not in scope:
+                raise ScoringRuleError(f"{path}: unknown variable {value}")
+            self.references.add(name)
+            return lambda binding: (True, binding.values[name])
+        if isinstance(value, str) and value.startswith("@"):
+            name = value[1:]
+            if not name.isidentifier() or name.startswith("_"):
+                raise ScoringRuleError(f"{path}: invalid attribute {value}")
+            if self.kind == "item" and name not in ITEM_ATTRIBUTES:
+                raise ScoringRuleError(f"{path}: item rules can only read {ITEM_ATTRIBUTES}")
+            expression = f"c.{name}"
+            return lambda binding: (False, expression)
+        return lambda binding: (True, value)
+
+    def constant(self, value, scope: frozenset, path: str):
+        """컨텍스트/리터럴 값 (후보 속성 참조 불가)"""
+        if isinstance(value, str) and value.startswith("@"):
+            raise ScoringRuleError(f"{path}: candidate attribute not allowed here")
+        binder = self.operand(value, scope, path)
+        return lambda binding: binder(binding)[1]
+
+    def keyword_list(self, value, scope: frozenset, path: str, collect: List[str]):
+        """키워드 또는 키워드 목록 → binder(binding) -> 소문자 키워드 튜플 (빈 값 제외)"""
+        values = value if isinstance(value, list) else [value]
+        binders = []
+        for i, item in enumerate(values):
+            if not isinstance(item, str):
+                raise ScoringRuleError(f"{path}[{i}]: keyword must be a string")
+            if not item.startswith("$"):
+                collect.append(item.lower())
+            binders.append(self.constant(item, scope, f"{path}[{i}]"))
+        return lambda binding: tuple(
+            keyword.lower() for keyword in (binder(binding) for binder in binders) if keyword
+        )
+
+    # ----- 조건 -----
+
+    def condition(self, spec, scope: frozenset, path: str):
+        """조건 → binder(binding) -> bool(상수로 접힘) 또는 후보 c에 대한 식"""
+        if not isinstance(spec, dict) or len(spec) != 1:
+            raise ScoringRuleError(f"{path}: condition must be an object with one operator")
+        (operator, args), = spec.items()
+        compile_condition = self.conditions.get(operator)
+        if compile_condition is None:
+            raise ScoringRuleError(f"{path}: unknown condition '{operator}' for {self.kind} rules")
+        return compile_condition(args, scope, f"{path}.{operator}")
+
+    def _children(self, args, scope: frozenset, path: str):
+        if not isinstance(args, list) or not args:
+            raise ScoringRuleError(f"{path}: expected a non-empty list of conditions")
+        return [self.condition(arg, scope, f"{path}[{i}]") for i, arg in enumerate(args)]
+
+    def _all(self, args, scope, path):
+        binders = self._children(args, scope, path)
+        return lambda binding: _and(binders, binding)
+
+    def _any(self, args, scope, path):
+        binders = self._children(args, scope, path)
+        return lambda binding: _or(binders, binding)
+
+    def _not(self, args, scope, path):
+        binder = self.condition(args, scope, path)
+
+        def bind(binding: _Binding) -> Condition:
+            condition = binder(binding)
+            return (not condition) if isinstance(condition, bool) else f"(not {condition})"
+        return bind
+
+    def _has(self, args, scope, path):
+        operand = self.operand(args, scope, path)
+
+        def bind(binding: _Binding) -> Condition:
+            is_constant, value = operand(binding)
+            return bool(value) if is_constant else value
+        return bind
+
+    def _binary(self, test: Callable[[Any, Any], bool], specialize: Callable):
+        """[왼쪽, 오른쪽] 비교 조건 (둘 다 상수면 접고, 오른쪽만 상수면 특화 식)"""
+        helper = {_contains: "_contains", _icontains: "_icontains", _longer: "_longer"}.get(test)
+
+        def compile_binary(args, scope, path):
+            if not isinstance(args, list) or len(args) != 2:
+                raise ScoringRuleError(f"{path}: expected [left, right]")
+            left = self.operand(args[0], scope, f"{path}[0]")
+            right = self.operand(args[1], scope, f"{path}[1]")
+
+            def bind(binding: _Binding) -> Condition:
+                (left_constant, a), (right_constant, b) = left(binding), right(binding)
+                if left_constant and right_constant:
+                    return bool(test(a, b))
+                if right_constant:
+                    return specialize(binding, a, b)
+                a = binding.const(a) if left_constant else a
+                if helper is None:
+                    return f"({a} == {b})"
+                return f"{helper}({a}, {b})"
+            return bind
+        return compile_binary
+
+    @staticmethod
+    def _eq(binding: _Binding, expression: str, value) -> Condition:
+        return f"({expression} == {binding.const(value)})"
+
+    @staticmethod
+    def _contains(binding: _Binding, expression: str, part) -> Condition:
+        if part is None:
+            return False
+        return f"({expression} and {binding.const(part)} in {expression})"
+
+    @staticmethod
+    def _icontains(binding: _Binding, expression: str, part) -> Condition:
+        if not part:
+            return False
+        return f"({expression} and {binding.const(part.lower())} in {expression}.lower())"
+
+    @staticmethod
+    def _longer(binding: _Binding, expression: str, length) -> Condition:
+        return f"({expression} and len({expression}) > {binding.const(length)})"
+
+    def _keywords(self, attribute: str):
+        """KeywordHits 속성에 키워드 중 하나라도 포함되는지"""
+        def compile_keywords(args, scope, path):
+            keywords_of = self.keyword_list(args, scope, path, self.keywords)
+
+            def bind(binding: _Binding) -> Condition:
+                keywords = keywords_of(binding)
+                if not keywords:
+                    return False
+                if len(keywords) == 1:
+                    return f"({binding.const(keywords[0])} in c.{attribute})"
+                return f"c.{attribute}.any_of({binding.const(keywords)})"
+            return bind
+        return compile_keywords
+
+    def _tag_contains_all(self, args, scope, path):
+        keywords_of = self.keyword_list(args, scope, path, [])
+        return lambda binding: f"_tag_contains_all(c.tags_lower, {binding.const(keywords_of(binding))})"
+
+    def _item_effect(self, require_all: bool):
+        def compile_effect(args, scope, path):
+            keywords_of = self.keyword_list(args, scope, path, self.effect_keywords)
+
+            def bind(binding: _Binding) -> Condition:
+                keywords = keywords_of(binding)
+                if not keywords:
+                    return True if require_all else False
+                mask = binding.mask(f"features.effect(*{binding.const(keywords)})")
+                return f"(mask & {mask} == {mask})" if require_all else f"(mask & {mask})"
+            return bind
+        return compile_effect
+
+    def _item_feature(self, method: str):
+        def compile_feature(args, scope, path):
+            value_of = self.constant(args, scope, path)
+            return lambda binding: f"(mask & {binding.mask(f'{method}({binding.const(value_of(binding))})')})"
+        return compile_feature
+
+    def _item_flag(self, attribute: str):
+        def compile_flag(args, scope, path):
+            if args is not True:
+                raise ScoringRuleError(f"{path}: expected true")
+            return lambda binding: f"(mask & {binding.mask(attribute)})"
+        return compile_flag
+
+    # ----- 점수/이유 -----
+
+    def score(self, spec, scope: frozenset, path: str):
+        """점수 → binder(binding) -> 점수 식"""
+        if isinstance(spec, (int, float)) and not isinstance(spec, bool):
+            return lambda binding: binding.const(spec)
+        if isinstance(spec, dict) and set(spec) == {"attr", "times"}:
+            attribute, times = spec["attr"], spec["times"]
+            if not isinstance(attribute, str) or not attribute.startswith("@"):
+                raise ScoringRuleError(f"{path}.attr: expected a candidate attribute (@name)")
+            expression = self.operand(attribute, scope, f"{path}.attr")(None)[1]
+            return lambda binding: f"{expression} * {binding.const(times)}"
+        if isinstance(spec, dict) and set(spec) == {"base", "step"}:
+            if "index" not in scope:
+                raise ScoringRuleError(f"{path}: base/step score requires for_each")
+            base, step = spec["base"], spec["step"]
+            return lambda binding: binding.const(base + step * binding.values["index"])
+        raise ScoringRuleError(f"{path}: invalid score")
+
+    def reason(self, spec, scope: frozenset, path: str):
+        """이유 → binder(binding) -> None 또는 이유 코드 식"""
+        if spec is None:
+            return lambda binding: None
+        code, args = (spec, []) if isinstance(spec, str) else (spec[0] if spec else None, spec[1:])
+        if not isinstance(code, str) or code not in REASON_TEXTS:
+            raise ScoringRuleError(f"{path}: unknown reason code {code!r}")
+        if not args:
+            return lambda binding: binding.const(code)
+        operands = [self.operand(arg, scope, f"{path}[{i + 1}]") for i, arg in enumerate(args)]
+
+        def bind(binding: _Binding) -> str:
+            values = [operand(binding) for operand in operands]
+            if all(is_constant for is_constant, _ in values):
+                return binding.const((code,) + tuple(value for _, value in values))
+            parts = [binding.const(code)] + [
+                binding.const(value) if is_constant else value for is_constant, value in values
+            ]
+            return "(" + ", ".join(parts) + ")"
+        return bind
+
+    # ----- 규칙 -----
+
+    def rules(self, specs, scope: frozenset, path: str):
+        """규칙 목록 → binder(binding) -> 규칙별 바인딩 결과 목록"""
+        if not isinstance(specs, list):
+            raise ScoringRuleError(f"{path}: expected a list of rules")
+        binders = [self.rule(spec, scope, f"{path}[{i}]") for i, spec in enumerate(specs)]
+        return lambda binding: [binder(binding) for binder in binders]
+
+    def rule(self, spec, scope: frozenset, path: str):
+        """규칙 → binder(binding) -> 바인딩된 규칙 목록 (조건이 상수로 접히면 0개 또는 여러 개)"""
+        if not isinstance(spec, dict):
+            raise ScoringRuleError(f"{path}: rule must be an object")
+        unknown = set(spec) - RULE_KEYS
+        if unknown:
+            raise ScoringRuleError(f"{path}: unknown keys {sorted(unknown)}")
+
+        when = self.condition(spec["when"], scope, f"{path}.when") if "when" in spec else None
+        otherwise = self.rule(spec["else"], scope, f"{path}.else") if "else" in spec else None
+
+        if "rules" in spec:
+            if "score" in spec or "reason" in spec:
+                raise ScoringRuleError(f"{path}: group rules cannot have score/reason")
+            return self._group(spec, when, otherwise, scope, path)
+
+        if "score" not in spec:
+            raise ScoringRuleError(f"{path}: rule needs score or rules")
+        if "first" in spec or "for_each" in spec:
+            raise ScoringRuleError(f"{path}: first/for_each are only valid on group rules")
+        score = self.score(spec["score"], scope, f"{path}.score")
+        reason = self.reason(spec.get("reason"), scope, f"{path}.reason")
+
+        def bind(binding: _Binding) -> List:
+            condition = when(binding) if when else True
+            if condition is False:
+                return otherwise(binding) if otherwise else []
+            fallback = tuple(otherwise(binding)) if otherwise and condition is not True else ()
+            return [_Leaf(condition, score(binding), reason(binding), fallback)]
+        return bind
+
+    def _group(self, spec, when, otherwise, scope: frozenset, path: str):
+        first = spec.get("first", False)
+        if not isinstance(first, bool):
+            raise ScoringRuleError(f"{path}.first: expected true/false")
+
+        loop, names = spec.get("for_each"), ()
+        if loop is not None:
+            if loop not in scope:
+                raise ScoringRuleError(f"{path}.for_each: unknown variable {loop!r}")
+            self.references.add(loop)
+            names = spec.get("as", ())
+            names = (names,) if isinstance(names, str) else tuple(names)
+            if not names or not all(isinstance(name, str) for name in names):
+                raise ScoringRuleError(f"{path}.as: expected a variable name or list of names")
+            scope = scope | set(names) | {"index"}
+        elif "as" in spec:
+            raise ScoringRuleError(f"{path}.as: only valid with for_each")
+
+        children = self.rules(spec["rules"], scope, f"{path}.rules")
+
+        def element_values(binding: _Binding, index: int, element) -> Dict:
+            values = dict(binding.values, index=index)
+            if len(names) == 1:
+                values[names[0]] = element
+            else:
+                values.update(zip(names, element))
+            return values
+
+        def bind(binding: _Binding) -> List:
+            condition = when(binding) if when else True
+            if condition is False:
+                return otherwise(binding) if otherwise else []
+
+            if loop is None:
+                results = children(binding)
+            else:
+                results = [
+                    result
+                    for index, element in enumerate(binding.values[loop] or ())
+                    for result in children(binding.child(element_values(binding, index, element)))
+                ]
+
+            # first 그룹은 하위 규칙 단위로 멈추므로 여러 개로 펼쳐진 결과는 다시 묶음
+            if first:
+                ops = [
+                    result[0] if len(result) == 1 else _Group(True, tuple(result), False, ())
+                    for result in results if result
+                ]
+            else:
+                ops = [op for result in results for op in result]
+
+            fallback = tuple(otherwise(binding)) if otherwise and condition is not True else ()
+            if condition is True and not first:
+                return ops
+            if not ops and not fallback:
+                return []
+            return [_Group(condition, tuple(ops), first, fallback)]
+        return bind
+
+
+def _freeze(value):
+    """컨텍스트 값 → 캐시 키 (리스트는 튜플로)"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class ScoringRules:
+    """
+    컴파일된 스코어링 규칙 (읽기 전용)
+
+    바인더는 피클링할 수 없으므로, 배치 워커로 전달할 때는 원본 정의로 다시 컴파일합니다.
+    """
+
+    def __init__(self, spec: Dict, source: str = "<memory>"):
+        if not isinstance(spec, dict):
+            raise ScoringRuleError(f"{source}: rule file must be a JSON object")
+        unknown = set(spec) - set(RULE_CONTEXT) - {"version"}
+        if unknown:
+            raise ScoringRuleError(f"{source}: unknown sections {sorted(unknown)}")
+
+        self.spec = spec
+        self.source = source
+        self.version = spec.get("version")
+
+        self._binders: Dict[str, List[Callable]] = {}  # 종류별 최상위 규칙 바인더
+        self._references: Dict[str, List[frozenset]] = {}  # 최상위 규칙별 참조 컨텍스트 변수
+        keywords: List[str] = []
+        effect_keywords: List[str] = []
+        for kind, context in RULE_CONTEXT.items():
+            compiler = _RuleCompiler(kind)
+            scope, path, specs = frozenset(context), f"{source}:{kind}", spec.get(kind, [])
+            if not isinstance(specs, list):
+                raise ScoringRuleError(f"{path}: expected a list of rules")
+            self._binders[kind], self._references[kind] = [], []
+            for i, rule_spec in enumerate(specs):
+                compiler.references = set()
+                self._binders[kind].append(compiler.rule(rule_spec, scope, f"{path}[{i}]"))
+                self._references[kind].append(frozenset(compiler.references & scope))
+            keywords += compiler.keywords + compiler.effect_keywords
+            effect_keywords += compiler.effect_keywords
+
+        self.keywords = tuple(dict.fromkeys(keywords))  # 태그/설명/효과 리터럴 키워드
+        self.effect_keywords = tuple(dict.fromkeys(effect_keywords))  # 아이템 효과 리터럴 키워드
+
+        self._lock = threading.Lock()
+        self._factories: "OrderedDict[Tuple, Tuple[Callable, str]]" = OrderedDict()
+
+    def __reduce__(self):
+        return ScoringRules, (self.spec, self.source)
+
+    def segments(self, kind: str, variables) -> Tuple[Tuple[bool, Tuple[int, ...]], ...]:
+        """
+        최상위 규칙을 variables 참조 여부로 나눈 연속 구간
+
+        구간 점수를 규칙 순서대로 더하고 이유 코드를 이어 붙이면 전체 바인딩 결과와 같습니다.
+
+        Returns:
+            ((variables 참조 여부, 규칙 번호 튜플), ...) - 규칙 순서
+        """
+        variables = set(variables)
+        segments: List[Tuple[bool, List[int]]] = []
+        for i, references in enumerate(self._references[kind]):
+            varying = bool(references & variables)
+            if segments and segments[-1][0] == varying:
+                segments[-1][1].append(i)
+            else:
+                segments.append((varying, [i]))
+        return tuple((varying, tuple(indices)) for varying, indices in segments)
+
+    def references(self, kind: str, indices) -> frozenset:
+        """최상위 규칙들이 참조하는 컨텍스트 변수 이름"""
+        return frozenset().union(*(self._references[kind][i] for i in indices))
+
+    def bind(self, kind: str, context: Dict, item_features=None, subset: Optional[Tuple[int, ...]] = None) -> BoundRules:
+        """
+        컨텍스트 바인딩
+
+        Args:
+            kind: "skill" / "item" / "talent_node"
+            context: RULE_CONTEXT[kind]의 모든 변수 값
+            item_features: 아이템 규칙용 ItemFeatureIndex (요구 마스크 계산)
+            subset: 바인딩할 최상위 규칙 번호 (None이면 전체, segments() 참고)
+
+        Returns:
+            BoundRules
+        """
+        missing = [name for name in RULE_CONTEXT[kind] if name not in context]
+        if missing:
+            raise ScoringRuleError(f"missing {kind} rule context: {missing}")
+        if kind == "item" and item_features is None:
+            raise ScoringRuleError("item rules need item_features")
+
+        # 캐시 키에는 선택된 규칙이 참조하는 변수만 사용 (참조하지 않는 값이 달라도 같은 함수)
+        indices = range(len(self._binders[kind])) if subset is None else subset
+        references = self.references(kind, indices)
+        key = (kind, subset) + tuple(
+            _freeze(context[name]) if name in references else None for name in RULE_CONTEXT[kind]
+        )
+        with self._lock:
+            cached = self._factories.get(key)
+            if cached is not None:
+                self._factories.move_to_end(key)
+        if cached is None:
+            cached = self._generate(kind, context, indices)
+            with self._lock:
+                self._factories[key] = cached
+                if len(self._factories) > EVALUATOR_CACHE_SIZE:
+                    self._factories.popitem(last=False)
+
+        factory, source = cached
+        evaluate, feature_mask = factory(item_features)
+        return BoundRules(evaluate, feature_mask, source)
+
+    def _generate(self, kind: str, context: Dict, indices) -> Tuple[Callable, str]:
+        """바인딩된 규칙 → 평가 함수 팩토리 (factory(item_features) -> (evaluate, 참조 비트))"""
+        binding = _Binding({name: context[name] for name in RULE_CONTEXT[kind]})
+        binders = self._binders[kind]
+        ops = [op for i in indices for op in binders[i](binding)]
+
+        writer = _SourceWriter()
+        writer.emit(ops, 2)
+        body = writer.lines or ["        pass"]
+        lines = ["def factory(features):"]
+        lines += [f"    {mask}" for mask in binding.masks]
+        lines += [
+            "    def evaluate(c):",
+            "        score = 0",
+            "        reasons = []"
+        ]
+        if kind == "item":
+            lines.append("        mask = c.feature_mask")
+        lines += body
+        lines += [
+            "        return score, reasons",
+            "    return evaluate, " + (" | ".join(f"m{i}" for i in range(len(binding.masks))) or "0")
+        ]
+        source = "\n".join(lines)
+
+        namespace = dict(_HELPERS, **binding.constants)
+        exec(compile(source, f"<scoring rules: {kind}>", "exec"), namespace)
+        return namespace["factory"], source
+
+
+def load_scoring_rules(path: Union[str, Path]) -> ScoringRules:
+    """규칙 파일 로드 및 컴파일 (형식 오류 시 ScoringRuleError)"""
+    path = Path(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            spec = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ScoringRuleError(f"{path}: invalid JSON ({e})") from e
+
+    rules = ScoringRules(spec, str(path))
+    register_keywords(rules.keywords)
+    return rules
+
+
+# ==============================================================================
+# 프로세스 전역 규칙 저장소 (핫 리로드)
+# ==============================================================================
+
+_lock = threading.Lock()
+_rules: Optional[ScoringRules] = None
+_rules_path: Optional[Path] = None
+_mtime: Optional[int] = None
+_last_checked = 0.0
+
+
+def scoring_rules_path() -> Path:
+    """사용할 규칙 파일 경로 (SCORING_RULES_PATH 환경 변수 우선)"""
+    return Path(os.getenv(RULES_PATH_ENV) or DEFAULT_RULES_PATH)
+
+
+def _reload(path: Path):
+    """규칙 파일을 다시 로드하여 설치"""
+    global _rules, _rules_path, _mtime, _last_checked
+
+    mtime = path.stat().st_mtime_ns
+    rules = load_scoring_rules(path)
+    with _lock:
+        _rules, _rules_path, _mtime = rules, path, mtime
+        _last_checked = time.monotonic()
+    logger.info(f"Loaded scoring rules from {path} (version {rules.version})")
+
+
+def invalidate_scoring_rules():
+    """다음 조회 때 규칙 파일을 다시 확인하도록 표시"""
+    global _last_checked, _mtime
+    with _lock:
+        _last_checked = 0.0
+        _mtime = None
+
+
+def get_scoring_rules() -> ScoringRules:
+    """
+    현재 스코어링 규칙
+
+    처음 조회하거나 경로가 바뀌면 로드하고 (실패 시 예외), 이후에는 RELOAD_CHECK_INTERVAL
+    간격으로 mtime을 확인하여 바뀐 경우에만 다시 로드합니다. 다시 로드하다 실패하면
+    오류를 기록하고 기존 규칙을 계속 사용합니다.
+    """
+    global _last_checked
+
+    path = scoring_rules_path()
+    if _rules is None or path != _rules_path:
+        _reload(path)
+        return _rules
+
+    now = time.monotonic()
+    if now - _last_checked < RELOAD_CHECK_INTERVAL:
+        return _rules
+
+    _last_checked = now
+    try:
+        if path.stat().st_mtime_ns != _mtime:
+            _reload(path)
+    except (OSError, ScoringRuleError) as e:
+        logger.error(f"Failed to reload scoring rules, keeping previous rules: {e}")
+    return _rules
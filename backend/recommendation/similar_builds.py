@@ -0,0 +1,353 @@
+"""
+유사 빌드 최근접 이웃 인덱스
+
+각 빌드(스킬 구성, 아이템 구성, 데미지 타입 분포, DoT/Hit 비율, 메커니즘 플래그)를
+고정 길이 벡터로 인코딩하고, 사전 계산된 빌드(materialized_builds)와 메타 빌드(meta_builds)를
+하나의 행렬로 묶어 코사인 유사도로 상위 k개를 찾습니다.
+
+- 스킬/아이템 ID는 해시 버킷 멀티핫으로 인코딩 (카탈로그 크기와 무관한 고정 길이)
+- 블록마다 단위 길이로 정규화 후 BLOCK_WEIGHTS를 곱하고, 전체를 다시 정규화
+- 질의 벡터는 희소하므로 (0이 아닌 차원 20개 안팎) 열 우선 행렬에서 해당 열만 곱함
+- 인덱스는 카탈로그 버전 + 메타 빌드 지문이 바뀔 때만 다시 만듭니다 (프로세스 전역)
+- 사전 계산된 빌드와 질의 빌드는 추천 결과의 스킬 항목으로 바로 인코딩 (카탈로그 불필요)
+"""
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from backend.database.models import MetaBuild, MaterializedBuild
+from backend.game_mechanics import DAMAGE_TYPES
+from backend.recommendation.catalog import RECHECK_INTERVAL, catalog_fingerprint, get_catalog
+from backend.recommendation.materialized import current_catalog_version
+from backend.recommendation.scoring_rules import get_scoring_rules
+
+logger = logging.getLogger(__name__)
+
+
+SKILL_BUCKETS = 64
+ITEM_BUCKETS = 64
+DAMAGE_TYPE_ORDER = tuple(DAMAGE_TYPES)
+MECHANIC_FLAGS = ("is_dot", "is_spell_burst_compatible", "is_combo")
+
+# 블록별 가중치 (스킬, 아이템, 데미지 타입, 메커니즘)
+BLOCK_WEIGHTS = {
+    "skills": 1.0,
+    "items": 0.7,
+    "damage_types": 0.8,
+    "mechanics": 0.6
+}
+
+VECTOR_SIZE = SKILL_BUCKETS + ITEM_BUCKETS + len(DAMAGE_TYPE_ORDER) + len(MECHANIC_FLAGS)
+DEFAULT_SIMILAR_LIMIT = 10
+
+
+class SkillFeatures(NamedTuple):
+    """벡터 인코딩에 쓰는 스킬 특징"""
+    id: int
+    damage_type: Optional[str]
+    is_dot: bool
+    is_spell_burst_compatible: bool
+    is_combo: bool
+
+
+@dataclass
+class IndexedBuild:
+    """인덱스에 저장된 빌드"""
+    source: str  # "materialized" / "meta"
+    hero_id: int
+    hero_name: Optional[str]
+    playstyle: Optional[str]
+    build_name: Optional[str]  # 메타 빌드 이름
+    build_type: str  # DoT / Hybrid_DoT / Hit (메타 빌드는 스킬 구성으로 판정)
+    skill_ids: Tuple[int, ...]
+    item_ids: Tuple[int, ...]
+
+
+def skill_features_from_entry(entry: Dict) -> SkillFeatures:
+    """추천 결과의 스킬 항목 → 스킬 특징"""
+    return SkillFeatures(
+        id=entry["skill_id"],
+        damage_type=entry.get("damage_type"),
+        is_dot=bool(entry.get("is_dot")),
+        is_spell_burst_compatible=bool(entry.get("is_spell_burst_compatible")),
+        is_combo=bool(entry.get("is_combo"))
+    )
+
+
+def _bucket(value: int, buckets: int) -> int:
+    """ID → 해시 버킷 (곱셈 해시로 연속 ID를 분산)"""
+    return (value * 2654435761) % (2 ** 32) % buckets
+
+
+def encode_build(skills: Sequence[SkillFeatures], item_ids: Sequence[int]) -> np.ndarray:
+    """
+    빌드 → 단위 길이 특징 벡터
+
+    Args:
+        skills: 빌드의 스킬 특징 (SkillFeatures 또는 같은 속성을 가진 SkillRecord)
+        item_ids: 빌드의 아이템 ID
+    """
+    blocks = []
+
+    # 1. 스킬 구성 (해시 멀티핫)
+    block = np.zeros(SKILL_BUCKETS, dtype=np.float32)
+    for skill in skills:
+        block[_bucket(skill.id, SKILL_BUCKETS)] = 1.0
+    blocks.append(("skills", block))
+
+    # 2. 아이템 구성 (해시 멀티핫)
+    block = np.zeros(ITEM_BUCKETS, dtype=np.float32)
+    for item_id in item_ids:
+        block[_bucket(item_id, ITEM_BUCKETS)] = 1.0
+    blocks.append(("items", block))
+
+    # 3. 데미지 타입 분포
+    block = np.zeros(len(DAMAGE_TYPE_ORDER), dtype=np.float32)
+    for skill in skills:
+        if skill.damage_type in DAMAGE_TYPES:
+            block[DAMAGE_TYPE_ORDER.index(skill.damage_type)] += 1.0
+    blocks.append(("damage_types", block))
+
+    # 4. 메커니즘 비율 (DoT, Spell Burst, Combo)
+    block = np.zeros(len(MECHANIC_FLAGS), dtype=np.float32)
+    if skills:
+        for i, flag in enumerate(MECHANIC_FLAGS):
+            block[i] = sum(1 for skill in skills if getattr(skill, flag)) / len(skills)
+    blocks.append(("mechanics", block))
+
+    parts = []
+    for name, block in blocks:
+        norm = np.linalg.norm(block)
+        parts.append(block * (BLOCK_WEIGHTS[name] / norm) if norm > 0 else block)
+    vector = np.concatenate(parts)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def _build_type(skills: Sequence[SkillFeatures]) -> str:
+    """스킬 구성의 빌드 타입 (엔진의 _analyze_build_type과 같은 기준)"""
+    if not skills:
+        return "Unknown"
+    dot_ratio = sum(1 for skill in skills if skill.is_dot) / len(skills)
+    if dot_ratio >= 0.7:
+        return "DoT"
+    elif dot_ratio >= 0.3:
+        return "Hybrid_DoT"
+    return "Hit"
+
+
+def _parse_ids(raw: Optional[str]) -> Tuple[int, ...]:
+    """JSON ID 배열 파싱 (형식이 잘못되면 빈 튜플)"""
+    if not raw:
+        return ()
+    try:
+        values = json.loads(raw)
+    except json.JSONDecodeError:
+        return ()
+    if not isinstance(values, list):
+        return ()
+    return tuple(value for value in values if isinstance(value, int))
+
+
+class SimilarBuildIndex:
+    """빌드 벡터 행렬 + 메타데이터 (읽기 전용, 요청 간 공유)"""
+
+    def __init__(self, builds: List[IndexedBuild], vectors: np.ndarray):
+        self.builds = builds
+        self.vectors = np.asfortranarray(vectors)  # (빌드 수, VECTOR_SIZE), 행마다 단위 길이, 열 우선
+        self._signatures = {self.signature(build): i for i, build in enumerate(builds)}
+
+    @staticmethod
+    def signature(build: IndexedBuild) -> Tuple:
+        """동일 빌드 판정 키 (영웅 + 스킬/아이템 구성)"""
+        return build.hero_id, tuple(sorted(build.skill_ids)), tuple(sorted(build.item_ids))
+
+    def __len__(self) -> int:
+        return len(self.builds)
+
+    def query(
+        self,
+        vector: np.ndarray,
+        limit: int = DEFAULT_SIMILAR_LIMIT,
+        exclude: Optional[Tuple] = None
+    ) -> List[Tuple[IndexedBuild, float]]:
+        """
+        코사인 유사도 상위 limit개 (유사도 내림차순)
+
+        Args:
+            vector: 단위 길이 질의 벡터
+            limit: 반환할 빌드 수
+            exclude: 제외할 빌드의 signature() (질의 빌드 자신)
+        """
+        if not self.builds or limit <= 0:
+            return []
+
+        columns = np.flatnonzero(vector)
+        similarities = self.vectors[:, columns] @ vector[columns]
+        excluded = self._signatures.get(exclude) if exclude is not None else None
+        if excluded is not None:
+            similarities[excluded] = -np.inf
+
+        k = min(limit, len(self.builds) - (excluded is not None))
+        if k <= 0:
+            return []
+        top = np.argpartition(similarities, -k)[-k:]
+        top = top[np.argsort(-similarities[top], kind="stable")]
+        return [(self.builds[i], float(similarities[i])) for i in top]
+
+
+def build_similar_build_index(db: Session, version: str) -> SimilarBuildIndex:
+    """
+    사전 계산된 빌드(해당 버전의 explain=True 행) + 메타 빌드로 인덱스 생성 (동일 빌드는 한 번만)
+
+    Args:
+        db: DB 세션
+        version: 사전 계산 카탈로그 버전
+    """
+    builds: List[IndexedBuild] = []
+    vectors: List[np.ndarray] = []
+    seen = set()
+
+    def add(build: IndexedBuild, skills: Sequence[SkillFeatures]):
+        signature = SimilarBuildIndex.signature(build)
+        if signature not in seen:
+            seen.add(signature)
+            builds.append(build)
+            vectors.append(encode_build(skills, build.item_ids))
+
+    # 1. 사전 계산된 빌드 (결과의 스킬 항목으로 인코딩)
+    rows = db.query(MaterializedBuild.hero_id, MaterializedBuild.playstyle, MaterializedBuild.result).filter(
+        MaterializedBuild.catalog_version == version,
+        MaterializedBuild.explain.is_(True)
+    ).order_by(MaterializedBuild.id).all()
+    for hero_id, playstyle, result in rows:
+        recommendation = json.loads(result)
+        skills = [skill_features_from_entry(s) for s in recommendation["recommended_skills"]]
+        add(IndexedBuild(
+            source="materialized",
+            hero_id=hero_id,
+            hero_name=recommendation.get("hero_name"),
+            playstyle=playstyle or None,
+            build_name=None,
+            build_type=recommendation["build_type"],
+            skill_ids=tuple(skill.id for skill in skills),
+            item_ids=tuple(i["item_id"] for i in recommendation["recommended_items"])
+        ), skills)
+
+    # 2. 메타 빌드 (스킬 특징은 카탈로그에서, 카탈로그에 없는 스킬 ID는 무시)
+    metas = db.query(MetaBuild).order_by(MetaBuild.id).all()
+    if metas:
+        catalog = get_catalog(db, get_scoring_rules().effect_keywords)
+        skills_by_id = {skill.id: skill for skill in catalog.skills}
+        for meta in metas:
+            skills = [skills_by_id[i] for i in _parse_ids(meta.skill_combination) if i in skills_by_id]
+            hero = catalog.get_hero(meta.hero_id)
+            add(IndexedBuild(
+                source="meta",
+                hero_id=meta.hero_id,
+                hero_name=hero.name if hero else None,
+                playstyle=meta.playstyle,
+                build_name=meta.build_name,
+                build_type=_build_type(skills),
+                skill_ids=tuple(skill.id for skill in skills),
+                item_ids=_parse_ids(meta.item_recommendation)
+            ), skills)
+
+    matrix = np.vstack(vectors) if vectors else np.zeros((0, VECTOR_SIZE), dtype=np.float32)
+    return SimilarBuildIndex(builds, matrix)
+
+
+# ==============================================================================
+# 프로세스 전역 인덱스
+# ==============================================================================
+
+_lock = threading.Lock()
+_index: Optional[SimilarBuildIndex] = None
+_index_key: Optional[Tuple] = None
+_bind = None
+_last_checked = 0.0
+
+
+def meta_build_fingerprint(db: Session) -> Tuple:
+    """meta_builds 테이블 변경 횟수 (DB 트리거가 유지하는 catalog_revisions, 조회 쿼리 1회)"""
+    return catalog_fingerprint(db, (MetaBuild,))
+
+
+def get_similar_build_index(db: Session) -> SimilarBuildIndex:
+    """
+    현재 카탈로그 버전 + 메타 빌드 기준 인덱스
+
+    RECHECK_INTERVAL 간격으로만 변경을 확인하고, 바뀐 경우에만 다시 생성합니다.
+    """
+    global _index, _index_key, _bind, _last_checked
+
+    bind = db.get_bind()
+    now = time.monotonic()
+    with _lock:
+        if _index is not None and bind is _bind and now - _last_checked < RECHECK_INTERVAL:
+            return _index
+
+    key = (current_catalog_version(db), meta_build_fingerprint(db))
+    with _lock:
+        if _index is not None and bind is _bind and key == _index_key:
+            _last_checked = now
+            return _index
+
+    index = build_similar_build_index(db, key[0])
+    with _lock:
+        _index, _index_key, _bind, _last_checked = index, key, bind, now
+    logger.info(f"Built similar build index ({len(index)} builds)")
+    return index
+
+
+def invalidate_similar_build_index():
+    """다음 조회 때 인덱스 재생성"""
+    global _index, _index_key, _bind
+    with _lock:
+        _index = None
+        _index_key = None
+        _bind = None
+
+
+def find_similar_builds(db: Session, recommendation: Dict, limit: int = DEFAULT_SIMILAR_LIMIT) -> List[Dict]:
+    """
+    추천 빌드와 비슷한 빌드 목록
+
+    Args:
+        db: DB 세션
+        recommendation: recommend_build() 결과
+        limit: 반환할 빌드 수
+
+    Returns:
+        유사도 내림차순 빌드 딕셔너리 리스트 (질의 빌드 자신은 제외)
+    """
+    index = get_similar_build_index(db)
+
+    skills = [skill_features_from_entry(s) for s in recommendation["recommended_skills"]]
+    item_ids = [i["item_id"] for i in recommendation["recommended_items"]]
+    exclude = (
+        recommendation["hero_id"],
+        tuple(sorted(skill.id for skill in skills)),
+        tuple(sorted(item_ids))
+    )
+
+    return [
+        {
+            "source": build.source,
+            "hero_id": build.hero_id,
+            "hero_name": build.hero_name,
+            "build_name": build.build_name,
+            "playstyle": build.playstyle,
+            "build_type": build.build_type,
+            "skill_ids": list(build.skill_ids),
+            "item_ids": list(build.item_ids),
+            "similarity": round(similarity, 4)
+        }
+        for build, similarity in index.query(encode_build(skills, item_ids), limit, exclude=exclude)
+    ]
@@ -0,0 +1,352 @@
+"""
+스킬 세트 조합 최적화
+
+개별 스킬 점수의 합 + 스킬 세트 시너지(빌드 일관성, 데미지 타입 일관성, Spell Burst/Combo 보유)가
+최대인 스킬 조합을 찾습니다. 빔 서치로 초기해를 만든 뒤 허용 가능한(admissible) 상한을 사용하는
+분기 한정법(branch-and-bound)으로 개선하며, 시간 예산이 끝나면 그때까지의 최선 해를 반환합니다.
+
+시너지 항목은 engine_v2의 `_analyze_build_type` / `_calculate_synergy_score_v2` 중
+스킬에 의존하는 부분과 동일합니다 (아이템 관련 항목은 스킬 선택과 무관하므로 제외).
+
+pair_synergy(스킬 쌍 시너지 행렬)가 주어지면 선택한 스킬 쌍마다 행렬 조회 1회로
+PAIR_SYNERGY_WEIGHT × 쌍 시너지를 목적 함수에 더합니다. 쌍 시너지는 스킬마다 다르므로
+이때는 특징 클래스 지배 관계 가지치기를 쓰지 않습니다.
+"""
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Protocol, Sequence, Tuple
+
+
+# 빌드 타입 보너스 (_calculate_synergy_score_v2 기준)
+BUILD_TYPE_BONUS = {"DoT": 20, "Hit": 20, "Hybrid_DoT": 10}
+CONSISTENCY_WEIGHT = 25  # 데미지 타입 일관성 비율 가중치
+MECHANIC_BONUS = 5  # Spell Burst / Combo 보유 보너스
+PAIR_SYNERGY_WEIGHT = 10  # 쌍 시너지 1.0당 점수
+
+DEFAULT_TIME_BUDGET_MS = 50
+DEFAULT_BEAM_WIDTH = 8
+
+
+@dataclass
+class SkillSetResult:
+    """최적화 결과"""
+    indices: List[int]  # 선택된 후보 인덱스 (입력 순서 기준)
+    objective: float  # 선택된 조합의 목적 함수 값
+    baseline_objective: float  # 개별 점수 상위 k개 조합의 목적 함수 값
+    optimal: bool  # 시간 예산 내 탐색 완료 여부 (True면 최적해 보장)
+    nodes: int  # 분기 한정법 탐색 노드 수
+    elapsed_ms: float
+    pair_synergy: float = 0.0  # 선택된 조합의 쌍 시너지 점수 합 (pair_synergy 사용 시)
+
+
+class PairSynergy(Protocol):
+    """스킬 쌍 시너지 조회 (skill_synergy.SkillSynergyMatrix)"""
+    max_value: float
+
+    def get(self, skill_a_id: int, skill_b_id: int) -> float: ...
+
+
+def build_type_for(dot_count: int, total: int) -> str:
+    """DoT 비율로 빌드 타입 결정 (_analyze_build_type과 동일한 기준)"""
+    if total == 0:
+        return "Unknown"
+    dot_ratio = dot_count / total
+    if dot_ratio >= 0.7:
+        return "DoT"
+    elif dot_ratio >= 0.3:
+        return "Hybrid_DoT"
+    return "Hit"
+
+
+def skill_set_synergy(
+    dot_count: int,
+    total: int,
+    type_counts: Sequence[int],
+    has_spell_burst: bool,
+    has_combo: bool
+) -> float:
+    """스킬 세트 시너지 (빌드 타입 + 데미지 타입 일관성 + 스킬 개수 + 특수 메커니즘)"""
+    synergy = BUILD_TYPE_BONUS.get(build_type_for(dot_count, total), 0)
+
+    typed = sum(type_counts)
+    if typed:
+        synergy += max(type_counts) / typed * CONSISTENCY_WEIGHT
+
+    synergy += min(total * 4, 20)
+
+    if has_spell_burst:
+        synergy += MECHANIC_BONUS
+    if has_combo:
+        synergy += MECHANIC_BONUS
+    return synergy
+
+
+class _Pool:
+    """탐색 대상 후보 (점수 내림차순) + 상한 계산용 접미사 누적값"""
+
+    def __init__(
+        self,
+        candidates: List[Dict],
+        indices: List[int],
+        type_index: Dict[str, int],
+        pairs: Optional[PairSynergy] = None
+    ):
+        self.indices = indices
+        self.pairs = pairs
+        self.skill_ids = [candidates[i].get("skill_id") for i in indices] if pairs is not None else []
+        self.scores = [candidates[i]["score"] for i in indices]
+        self.is_dot = [bool(candidates[i].get("is_dot")) for i in indices]
+        self.types = [type_index.get(candidates[i].get("damage_type"), -1) for i in indices]
+        self.spell_burst = [bool(candidates[i].get("is_spell_burst_compatible")) for i in indices]
+        self.combo = [bool(candidates[i].get("is_combo")) for i in indices]
+
+        # 특징 클래스 (DoT, 데미지 타입, Spell Burst, Combo가 모두 같으면 같은 클래스,
+        # 쌍 시너지를 쓰면 후보마다 다른 클래스)
+        if pairs is not None:
+            self.classes = list(range(len(indices)))
+        else:
+            class_ids: Dict[Tuple, int] = {}
+            self.classes = [
+                class_ids.setdefault(key, len(class_ids))
+                for key in zip(self.is_dot, self.types, self.spell_burst, self.combo)
+            ]
+
+        n = len(indices)
+        type_total = len(type_index)
+        self.prefix = [0.0] * (n + 1)
+        self.dot_suffix = [0] * (n + 1)
+        self.type_suffix = [[0] * type_total for _ in range(n + 1)]
+        self.spell_burst_suffix = [False] * (n + 1)
+        self.combo_suffix = [False] * (n + 1)
+        for i in range(n):
+            self.prefix[i + 1] = self.prefix[i] + self.scores[i]
+        for i in range(n - 1, -1, -1):
+            self.dot_suffix[i] = self.dot_suffix[i + 1] + self.is_dot[i]
+            self.type_suffix[i] = list(self.type_suffix[i + 1])
+            if self.types[i] >= 0:
+                self.type_suffix[i][self.types[i]] += 1
+            self.spell_burst_suffix[i] = self.spell_burst_suffix[i + 1] or self.spell_burst[i]
+            self.combo_suffix[i] = self.combo_suffix[i + 1] or self.combo[i]
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def pair_gain(self, p: int, chosen: Sequence[int]) -> float:
+        """p번째 후보를 추가할 때 늘어나는 쌍 시너지 점수 (쌍마다 조회 1회)"""
+        skill_id = self.skill_ids[p]
+        return PAIR_SYNERGY_WEIGHT * sum(self.pairs.get(skill_id, self.skill_ids[q]) for q in chosen)
+
+    def pair_bound(self, chosen_count: int, remaining: int) -> float:
+        """remaining개를 더 고를 때 늘어날 수 있는 쌍 시너지 점수 상한"""
+        if self.pairs is None:
+            return 0.0
+        new_pairs = remaining * chosen_count + remaining * (remaining - 1) // 2
+        return PAIR_SYNERGY_WEIGHT * self.pairs.max_value * new_pairs
+
+    def upper_bound(
+        self, i: int, remaining: int, k: int, score_sum: float,
+        dot_count: int, type_counts: Tuple[int, ...], has_spell_burst: bool, has_combo: bool
+    ) -> float:
+        """i번째 후보부터 remaining개를 더 고를 때 얻을 수 있는 목적 함수 상한"""
+        # 1. 개별 점수: 남은 후보 중 상위 remaining개 (점수 내림차순이므로 연속 구간)
+        bound = score_sum + self.prefix[i + remaining] - self.prefix[i]
+
+        # 2. 빌드 타입: 도달 가능한 DoT 개수 범위에서 최대 보너스
+        non_dot = (len(self) - i) - self.dot_suffix[i]
+        dot_min = dot_count + max(0, remaining - non_dot)
+        dot_max = dot_count + min(remaining, self.dot_suffix[i])
+        best_type_bonus = 0
+        for dots in (dot_min, dot_max):
+            best_type_bonus = max(best_type_bonus, BUILD_TYPE_BONUS.get(build_type_for(dots, k), 0))
+        bound += best_type_bonus
+
+        # 3. 데미지 타입 일관성: 한 타입을 최대한 추가한 경우의 비율 상한
+        typed = sum(type_counts)
+        best_ratio = 0.0
+        suffix = self.type_suffix[i]
+        for t, count in enumerate(type_counts):
+            added = min(remaining, suffix[t])
+            if typed + added:
+                best_ratio = max(best_ratio, (count + added) / (typed + added))
+        bound += best_ratio * CONSISTENCY_WEIGHT
+
+        # 4. 스킬 개수 + 특수 메커니즘 + 쌍 시너지
+        bound += min(k * 4, 20)
+        bound += self.pair_bound(k - remaining, remaining)
+        if has_spell_burst or self.spell_burst_suffix[i]:
+            bound += MECHANIC_BONUS
+        if has_combo or self.combo_suffix[i]:
+            bound += MECHANIC_BONUS
+        return bound
+
+
+def _pair_total(pool: _Pool, chosen: Sequence[int]) -> float:
+    """선택된 조합의 쌍 시너지 점수 합"""
+    if pool.pairs is None:
+        return 0.0
+    return sum(pool.pair_gain(p, chosen[:n]) for n, p in enumerate(chosen))
+
+
+def _evaluate(pool: _Pool, chosen: Sequence[int], type_total: int) -> float:
+    """풀 위치 목록으로 목적 함수 계산"""
+    type_counts = [0] * type_total
+    for p in chosen:
+        if pool.types[p] >= 0:
+            type_counts[pool.types[p]] += 1
+    return sum(pool.scores[p] for p in chosen) + _pair_total(pool, chosen) + skill_set_synergy(
+        sum(pool.is_dot[p] for p in chosen),
+        len(chosen),
+        type_counts,
+        any(pool.spell_burst[p] for p in chosen),
+        any(pool.combo[p] for p in chosen)
+    )
+
+
+def optimize_skill_set(
+    candidates: List[Dict],
+    max_skills: int,
+    time_budget_ms: float = DEFAULT_TIME_BUDGET_MS,
+    beam_width: int = DEFAULT_BEAM_WIDTH,
+    pair_synergy: Optional[PairSynergy] = None
+) -> SkillSetResult:
+    """
+    개별 점수 + 세트 시너지가 최대인 스킬 조합 탐색
+
+    Args:
+        candidates: 점수 내림차순으로 정렬된 스킬 후보 (딕셔너리 또는 키 조회를 지원하는 레코드)
+            (score, is_dot, damage_type, is_spell_burst_compatible, is_combo 키 사용)
+        max_skills: 선택할 스킬 개수 (후보가 적으면 후보 전체)
+        time_budget_ms: 탐색 시간 예산 (밀리초)
+        beam_width: 초기해를 만드는 빔 서치 폭
+        pair_synergy: 스킬 쌍 시너지 행렬 (주어지면 skill_id 키 사용, 쌍 시너지를 목적 함수에 포함)
+
+    Returns:
+        SkillSetResult (시간 예산 초과 시 그때까지의 최선 해)
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget_ms / 1000
+    k = min(max_skills, len(candidates))
+    if k <= 0:
+        return SkillSetResult([], 0.0, 0.0, True, 0, 0.0)
+
+    type_index: Dict[str, int] = {}
+    for candidate in candidates:
+        damage_type = candidate.get("damage_type")
+        if damage_type and damage_type not in type_index:
+            type_index[damage_type] = len(type_index)
+    type_total = len(type_index)
+
+    # 1. 지배 관계 가지치기: 특징 클래스(DoT, 데미지 타입, Spell Burst, Combo)가 같은 후보는
+    #    시너지 기여가 같으므로 클래스 내 점수 상위 후보부터 선택하는 해만 보면 됨 (클래스당 최대 k개)
+    per_class: Dict[Tuple, int] = {}
+    pool_indices = []
+    for index, candidate in enumerate(candidates):
+        key = (
+            bool(candidate.get("is_dot")),
+            candidate.get("damage_type"),
+            bool(candidate.get("is_spell_burst_compatible")),
+            bool(candidate.get("is_combo"))
+        )
+        if pair_synergy is not None or per_class.get(key, 0) < k:
+            per_class[key] = per_class.get(key, 0) + 1
+            pool_indices.append(index)
+
+    # 2. 기준 해: 개별 점수 상위 k개 (풀의 앞 k개와 동일)
+    best_chosen: Tuple[int, ...] = tuple(range(k))
+    pool = _Pool(candidates, pool_indices[:k], type_index, pair_synergy)
+    baseline = best = _evaluate(pool, best_chosen, type_total)
+
+    # 3. 점수 하한 가지치기: 상위 k-1개 + 최대 시너지로도 기준 해를 넘지 못하는 후보 제외
+    max_synergy = max(BUILD_TYPE_BONUS.values()) + CONSISTENCY_WEIGHT + min(k * 4, 20) + 2 * MECHANIC_BONUS
+    max_synergy += pool.pair_bound(0, k)
+    top_rest = sum(candidates[i]["score"] for i in pool_indices[:k - 1])
+    pool_indices = pool_indices[:k] + [
+        i for i in pool_indices[k:] if candidates[i]["score"] + top_rest + max_synergy > best
+    ]
+    pool = _Pool(candidates, pool_indices, type_index, pair_synergy)
+
+    # 4. 빔 서치로 초기해 개선 (상한을 휴리스틱으로 사용)
+    beam = [((), 0.0, 0, (0,) * type_total, False, False)]
+    for step in range(k):
+        remaining = k - step - 1
+        expanded = []
+        for chosen, score_sum, dot_count, type_counts, has_spell_burst, has_combo in beam:
+            start = chosen[-1] + 1 if chosen else 0
+            seen_classes = set()
+            for p in range(start, len(pool) - remaining):
+                # 클래스별 최고 점수 후보만 확장
+                if pool.classes[p] in seen_classes:
+                    continue
+                seen_classes.add(pool.classes[p])
+                t = pool.types[p]
+                gain = pool.scores[p] + pool.pair_gain(p, chosen) if pair_synergy is not None else pool.scores[p]
+                state = (
+                    chosen + (p,),
+                    score_sum + gain,
+                    dot_count + pool.is_dot[p],
+                    type_counts[:t] + (type_counts[t] + 1,) + type_counts[t + 1:] if t >= 0 else type_counts,
+                    has_spell_burst or pool.spell_burst[p],
+                    has_combo or pool.combo[p]
+                )
+                expanded.append((pool.upper_bound(p + 1, remaining, k, *state[1:]), state))
+        expanded.sort(key=lambda entry: entry[0], reverse=True)
+        beam = [state for _, state in expanded[:beam_width]]
+        if time.perf_counter() > deadline:
+            beam = []
+            break
+    for chosen, score_sum, dot_count, type_counts, has_spell_burst, has_combo in beam:
+        value = score_sum + skill_set_synergy(dot_count, k, type_counts, has_spell_burst, has_combo)
+        if value > best:
+            best, best_chosen = value, chosen
+
+    # 5. 분기 한정법 (포함 우선 깊이 우선 탐색)
+    nodes = 0
+    completed = True
+    stack = [(0, (), 0.0, 0, (0,) * type_total, False, False, 0)]
+    while stack:
+        nodes += 1
+        if nodes % 256 == 0 and time.perf_counter() > deadline:
+            completed = False
+            break
+
+        i, chosen, score_sum, dot_count, type_counts, has_spell_burst, has_combo, excluded = stack.pop()
+        remaining = k - len(chosen)
+        if remaining == 0:
+            value = score_sum + skill_set_synergy(dot_count, k, type_counts, has_spell_burst, has_combo)
+            if value > best:
+                best, best_chosen = value, chosen
+            continue
+        if len(pool) - i < remaining:
+            continue
+        if pool.upper_bound(i, remaining, k, score_sum, dot_count, type_counts,
+                            has_spell_burst, has_combo) <= best:
+            continue
+
+        # 같은 클래스의 상위 후보를 제외했다면 하위 후보도 선택하지 않음 (대칭 제거)
+        class_bit = 1 << pool.classes[i]
+        if excluded & class_bit:
+            stack.append((i + 1, chosen, score_sum, dot_count, type_counts,
+                          has_spell_burst, has_combo, excluded))
+            continue
+
+        # 제외 분기를 먼저 쌓아 포함 분기를 먼저 탐색
+        stack.append((i + 1, chosen, score_sum, dot_count, type_counts,
+                      has_spell_burst, has_combo, excluded | class_bit))
+        t = pool.types[i]
+        if t >= 0:
+            type_counts = type_counts[:t] + (type_counts[t] + 1,) + type_counts[t + 1:]
+        gain = pool.scores[i] + pool.pair_gain(i, chosen) if pair_synergy is not None else pool.scores[i]
+        stack.append((
+            i + 1, chosen + (i,), score_sum + gain, dot_count + pool.is_dot[i],
+            type_counts, has_spell_burst or pool.spell_burst[i], has_combo or pool.combo[i], excluded
+        ))
+
+    return SkillSetResult(
+        indices=sorted(pool.indices[p] for p in best_chosen),
+        objective=best,
+        baseline_objective=baseline,
+        optimal=completed,
+        nodes=nodes,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+        pair_synergy=_pair_total(pool, best_chosen)
+    )
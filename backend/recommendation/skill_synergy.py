@@ -0,0 +1,261 @@
+"""
+스킬 쌍 시너지 행렬 (skill_synergies 테이블)
+
+배치 작업이 전체 스킬 쌍의 시너지를 NumPy 특징 행렬 연산으로 계산하고,
+임계값 이상인 쌍만 희소하게 skill_synergies 테이블에 저장합니다.
+- 같은 데미지 타입: 데미지 타입 원핫 행렬의 곱
+- 태그 유사도: 정규화한 태그 멀티핫 행렬의 곱 (코사인)
+- 서포트/액티브 호환: 서포트 × 액티브 외적 (태그를 공유하지 않으면 절반)
+- Spell Burst/Combo 쌍: 같은 메커니즘끼리의 외적
+
+엔진은 저장된 쌍을 (작은 ID, 큰 ID) 키의 희소 행렬로 한 번 로드하여,
+스킬 세트 점수에 쌍마다 조회 한 번으로 쌍 시너지를 더합니다.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from backend.database.models import Skill, SkillSynergy
+from backend.game_mechanics import DAMAGE_TYPES
+from backend.recommendation.catalog import SkillRecord, build_skill_record, catalog_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+# 시너지 항목별 가중치 (합이 1을 넘으면 1로 자름)
+SYNERGY_WEIGHTS = {
+    "damage_type": 0.35,
+    "tag_overlap": 0.35,
+    "support_active": 0.2,
+    "mechanic": 0.2
+}
+SIGNIFICANT_SYNERGY = 0.5  # 저장할 최소 시너지
+BLOCK_ROWS = 256  # 한 번에 계산할 행 수 (메모리 상한: BLOCK_ROWS × 스킬 수)
+
+RECHECK_INTERVAL = 2.0  # 테이블 변경 확인 간격 (초)
+
+SYNERGY_DESCRIPTIONS = {
+    "damage_type": "같은 데미지 타입",
+    "tag_overlap": "태그 공유",
+    "support_active": "서포트/액티브 호환",
+    "mechanic": "Spell Burst/Combo 연계"
+}
+
+
+@dataclass
+class SynergyPair:
+    """계산된 스킬 쌍 시너지 (skill_a_id < skill_b_id)"""
+    skill_a_id: int
+    skill_b_id: int
+    synergy_score: float
+    synergy_type: str  # 가장 크게 기여한 항목
+
+
+class SkillSynergyMatrix:
+    """
+    대칭 희소 시너지 행렬 (키 딕셔너리 형식, 읽기 전용)
+
+    저장되지 않은 쌍은 0입니다.
+    """
+
+    def __init__(self, pairs: Dict[Tuple[int, int], float]):
+        self._pairs = pairs
+        self.max_value = max(pairs.values(), default=0.0)
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def __reduce__(self):
+        return SkillSynergyMatrix, (self._pairs,)
+
+    def get(self, skill_a_id: int, skill_b_id: int) -> float:
+        """두 스킬의 시너지 (조회 1회)"""
+        key = (skill_a_id, skill_b_id) if skill_a_id < skill_b_id else (skill_b_id, skill_a_id)
+        return self._pairs.get(key, 0.0)
+
+
+# ==============================================================================
+# 계산
+# ==============================================================================
+
+def _feature_matrices(skills: Sequence[SkillRecord]):
+    """스킬 특징 행렬 (데미지 타입 원핫, 정규화 태그 멀티핫, 서포트/액티브/메커니즘 벡터)"""
+    damage_types = {name: i for i, name in enumerate(DAMAGE_TYPES)}
+    vocabulary: Dict[str, int] = {}
+    for skill in skills:
+        for tag in skill.tags_lower:
+            vocabulary.setdefault(tag, len(vocabulary))
+
+    n = len(skills)
+    damage = np.zeros((n, len(damage_types)), dtype=np.float32)
+    tags = np.zeros((n, max(len(vocabulary), 1)), dtype=np.float32)
+    for row, skill in enumerate(skills):
+        if skill.damage_type in damage_types:
+            damage[row, damage_types[skill.damage_type]] = 1.0
+        for tag in skill.tags_lower:
+            tags[row, vocabulary[tag]] = 1.0
+    norms = np.linalg.norm(tags, axis=1, keepdims=True)
+    tags = np.divide(tags, norms, out=np.zeros_like(tags), where=norms > 0)
+
+    support = np.array(["support" in skill.type_lower for skill in skills], dtype=np.float32)
+    active = np.array(["active" in skill.type_lower for skill in skills], dtype=np.float32)
+    spell_burst = np.array([skill.is_spell_burst_compatible for skill in skills], dtype=np.float32)
+    combo = np.array([skill.is_combo for skill in skills], dtype=np.float32)
+    return damage, tags, support, active, spell_burst, combo
+
+
+def compute_skill_synergies(
+    skills: Sequence[SkillRecord],
+    threshold: float = SIGNIFICANT_SYNERGY
+) -> List[SynergyPair]:
+    """
+    전체 스킬 쌍 시너지 계산 (BLOCK_ROWS 행씩 블록 단위 행렬 연산)
+
+    Args:
+        skills: 스킬 레코드
+        threshold: 이 값 이상인 쌍만 반환
+
+    Returns:
+        SynergyPair 목록 (skill_a_id < skill_b_id, ID 순)
+    """
+    skills = sorted(skills, key=lambda s: s.id)
+    ids = np.array([skill.id for skill in skills], dtype=np.int64)
+    damage, tags, support, active, spell_burst, combo = _feature_matrices(skills)
+    types = list(SYNERGY_WEIGHTS)
+
+    def component_values(rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """선택된 쌍의 항목별 가중 기여 (항목 수 × 쌍 수)"""
+        shares_tag = np.einsum("ij,ij->i", tags[rows], tags[cols])
+        support_active = np.maximum(support[rows] * active[cols], active[rows] * support[cols])
+        return np.stack([
+            np.einsum("ij,ij->i", damage[rows], damage[cols]) * SYNERGY_WEIGHTS["damage_type"],
+            shares_tag * SYNERGY_WEIGHTS["tag_overlap"],
+            support_active * np.where(shares_tag > 0, 1.0, 0.5) * SYNERGY_WEIGHTS["support_active"],
+            np.maximum(spell_burst[rows] * spell_burst[cols], combo[rows] * combo[cols])
+            * SYNERGY_WEIGHTS["mechanic"]
+        ])
+
+    pairs: List[SynergyPair] = []
+    for start in range(0, len(skills), BLOCK_ROWS):
+        end = min(start + BLOCK_ROWS, len(skills))
+
+        # 1. 블록 행 × 전체 열 시너지 (항목별 가중합)
+        tag_overlap = tags[start:end] @ tags.T
+        support_active = np.maximum(np.outer(support[start:end], active), np.outer(active[start:end], support))
+        support_active *= np.where(tag_overlap > 0, 1.0, 0.5)
+        scores = (damage[start:end] @ damage.T) * SYNERGY_WEIGHTS["damage_type"]
+        scores += tag_overlap * SYNERGY_WEIGHTS["tag_overlap"]
+        scores += support_active * SYNERGY_WEIGHTS["support_active"]
+        scores += np.maximum(
+            np.outer(spell_burst[start:end], spell_burst), np.outer(combo[start:end], combo)
+        ) * SYNERGY_WEIGHTS["mechanic"]
+
+        # 2. 위쪽 삼각(j > i)에서 임계값 이상인 쌍만 추출
+        rows, cols = np.nonzero(scores >= threshold)
+        upper = cols > rows + start
+        rows, cols = rows[upper], cols[upper]
+        if not len(rows):
+            continue
+
+        # 3. 가장 크게 기여한 항목 (선택된 쌍만 다시 계산)
+        dominant = component_values(rows + start, cols).argmax(axis=0)
+        for row, col, score, kind in zip(rows, cols, scores[rows, cols], dominant):
+            pairs.append(SynergyPair(
+                skill_a_id=int(ids[start + row]),
+                skill_b_id=int(ids[col]),
+                synergy_score=round(min(float(score), 1.0), 4),
+                synergy_type=types[kind]
+            ))
+    return pairs
+
+
+def populate_skill_synergies(db: Session, threshold: float = SIGNIFICANT_SYNERGY) -> int:
+    """
+    skill_synergies 테이블을 현재 스킬 데이터 기준으로 다시 계산 (기존 행 교체)
+
+    Returns:
+        저장한 쌍 수
+    """
+    started = time.perf_counter()
+    skills = [build_skill_record(skill) for skill in db.query(Skill).all()]
+    pairs = compute_skill_synergies(skills, threshold)
+
+    db.query(SkillSynergy).delete(synchronize_session=False)
+    db.bulk_insert_mappings(SkillSynergy, [
+        {
+            "skill_a_id": pair.skill_a_id,
+            "skill_b_id": pair.skill_b_id,
+            "synergy_score": pair.synergy_score,
+            "synergy_type": pair.synergy_type,
+            "description": SYNERGY_DESCRIPTIONS[pair.synergy_type]
+        }
+        for pair in pairs
+    ])
+    db.commit()
+    invalidate_skill_synergy_matrix()
+
+    logger.info(
+        f"Stored {len(pairs)} skill synergy pairs for {len(skills)} skills "
+        f"({(time.perf_counter() - started) * 1000:.0f} ms)"
+    )
+    return len(pairs)
+
+
+# ==============================================================================
+# 프로세스 전역 시너지 행렬
+# ==============================================================================
+
+_lock = threading.Lock()
+_matrix: Optional[SkillSynergyMatrix] = None
+_fingerprint: Optional[Tuple] = None
+_last_checked = 0.0
+
+
+def skill_synergy_fingerprint(db: Session) -> Tuple:
+    """skill_synergies 테이블 변경 횟수 (DB 트리거가 유지하는 catalog_revisions, 조회 쿼리 1회)"""
+    return catalog_fingerprint(db, (SkillSynergy,))
+
+
+def load_skill_synergy_matrix(db: Session) -> SkillSynergyMatrix:
+    """skill_synergies 테이블 → 희소 행렬"""
+    pairs: Dict[Tuple[int, int], float] = {}
+    rows = db.query(SkillSynergy.skill_a_id, SkillSynergy.skill_b_id, SkillSynergy.synergy_score).all()
+    for skill_a_id, skill_b_id, score in rows:
+        key = (skill_a_id, skill_b_id) if skill_a_id < skill_b_id else (skill_b_id, skill_a_id)
+        pairs[key] = max(score, pairs.get(key, 0.0))
+    return SkillSynergyMatrix(pairs)
+
+
+def get_skill_synergy_matrix(db: Session) -> SkillSynergyMatrix:
+    """현재 시너지 행렬 (RECHECK_INTERVAL 간격으로 테이블 변경 확인 후 필요 시 다시 로드)"""
+    global _matrix, _fingerprint, _last_checked
+
+    now = time.monotonic()
+    with _lock:
+        if _matrix is not None and now - _last_checked < RECHECK_INTERVAL:
+            return _matrix
+
+    fingerprint = skill_synergy_fingerprint(db)
+    with _lock:
+        if _matrix is not None and fingerprint == _fingerprint:
+            _last_checked = now
+            return _matrix
+
+    matrix = load_skill_synergy_matrix(db)
+    with _lock:
+        _matrix, _fingerprint, _last_checked = matrix, fingerprint, now
+    logger.info(f"Loaded {len(matrix)} skill synergy pairs")
+    return matrix
+
+
+def invalidate_skill_synergy_matrix():
+    """다음 조회 때 시너지 행렬 다시 로드"""
+    global _matrix, _fingerprint
+    with _lock:
+        _matrix = None
+        _fingerprint = None
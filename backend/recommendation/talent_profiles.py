@@ -0,0 +1,236 @@
+"""
+재능 프로필 - 재능별 메커니즘 정보를 미리 컴파일한 불변 객체
+
+TALENT_MECHANICS 참조 데이터와 DB의 TalentLevel(크롤링된 레벨 효과)을 병합하여
+재능당 한 번만 생성합니다. 프로세스 전역으로 공유되며 재능 데이터가 바뀔 때만 다시 생성됩니다.
+"""
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from backend.database.models import TalentLevel
+from backend.keyword_matcher import register_keywords
+from backend.recommendation.catalog import catalog_fingerprint
+from backend.talent_mechanics import TALENT_MECHANICS
+
+logger = logging.getLogger(__name__)
+
+
+# 60레벨 이상에서 스킬 태그와 매칭하는 레벨 메커니즘
+LEVEL_BONUS_MECHANICS = ("melee", "attack_speed", "critical", "area")
+
+# 재능 데이터 변경 여부 재확인 간격 (초, 카탈로그 스냅샷과 같은 간격)
+RECHECK_INTERVAL = 2.0
+
+# 재능 키워드를 공유 키워드 매처에 등록 (스킬 태그/설명, 아이템 효과 매칭용)
+register_keywords(
+    LEVEL_BONUS_MECHANICS,
+    [
+        keyword
+        for mechanics in TALENT_MECHANICS.values()
+        for key in ("must_have_mechanics", "avoid_mechanics",
+                    "recommended_skill_types", "recommended_item_stats")
+        for keyword in mechanics.get(key, [])
+    ]
+)
+
+
+@dataclass(frozen=True)
+class TalentProfile:
+    """재능 프로필 (불변)"""
+    talent_name: str
+    mechanics: Mapping  # TALENT_MECHANICS 항목 (읽기 전용)
+    build_focus: str
+    playstyle: str
+    is_burst: bool
+    # (원본 이름, 소문자 키워드) 쌍 - 매칭용
+    must_have_mechanics: Tuple[Tuple[str, str], ...]
+    avoid_mechanics: Tuple[Tuple[str, str], ...]
+    recommended_skill_types: Tuple[Tuple[str, str], ...]
+    recommended_item_stats: Tuple[Tuple[str, str], ...]
+    # DB 레벨 효과에서 추출
+    has_level_60_penalty: bool
+    level_mechanics: Tuple[Tuple[int, Tuple[str, ...]], ...]  # ((level, mechanics), ...)
+    level_bonus_mechanics: Tuple[Tuple[int, str], ...]  # 60레벨 이상 보너스 대상 (level, mechanic)
+
+    @property
+    def has_mechanics(self) -> bool:
+        """TALENT_MECHANICS에 정의된 재능인지 여부"""
+        return bool(self.mechanics)
+
+
+def _keyword_pairs(values: Iterable[str]) -> Tuple[Tuple[str, str], ...]:
+    """(원본, 소문자) 쌍 튜플 생성"""
+    return tuple((value, value.lower()) for value in values)
+
+
+def _parse_level_mechanics(raw_mechanics: Optional[str]) -> Tuple[str, ...]:
+    """TalentLevel.mechanics JSON 파싱 (실패 시 빈 튜플)"""
+    if not raw_mechanics:
+        return ()
+    try:
+        mechanics = json.loads(raw_mechanics)
+    except (json.JSONDecodeError, TypeError):
+        return ()
+    return tuple(mechanics) if isinstance(mechanics, list) else ()
+
+
+def _is_level_60_penalty(effect_description: Optional[str]) -> bool:
+    """60레벨 효과가 큰 패널티(-80%, -50%, non-X damage)인지 판단"""
+    desc_lower = (effect_description or "").lower()
+
+    # -80%, -50% 같은 큰 패널티 확인
+    if '-80%' in desc_lower or '-50%' in desc_lower:
+        return True
+
+    # "non-" 패턴 확인 (non-Burst, non-DoT 등)
+    return 'non-' in desc_lower and 'damage' in desc_lower
+
+
+def compile_talent_profile(talent_name: str, talent_levels: Iterable) -> TalentProfile:
+    """
+    재능 프로필 생성
+
+    Args:
+        talent_name: 재능 이름
+        talent_levels: 해당 재능의 레벨 효과 (level, effect_description, mechanics 속성 보유)
+
+    Returns:
+        불변 TalentProfile
+    """
+    mechanics = TALENT_MECHANICS.get(talent_name, {})
+
+    has_penalty = False
+    level_mechanics: Dict[int, Tuple[str, ...]] = {}
+    for talent_level in sorted(talent_levels, key=lambda tl: tl.level):
+        if talent_level.level == 60 and _is_level_60_penalty(talent_level.effect_description):
+            has_penalty = True
+        level_mechanics[talent_level.level] = _parse_level_mechanics(talent_level.mechanics)
+
+    level_bonus_mechanics = tuple(
+        (level, mech)
+        for level, mechs in level_mechanics.items()
+        if level >= 60
+        for mech in mechs
+        if mech in LEVEL_BONUS_MECHANICS
+    )
+
+    return TalentProfile(
+        talent_name=talent_name,
+        mechanics=MappingProxyType(dict(mechanics)),
+        build_focus=mechanics.get("build_focus", "Hit"),
+        playstyle=mechanics.get("playstyle", "Unknown"),
+        is_burst=mechanics.get("core_mechanic") == "Burst Damage",
+        must_have_mechanics=_keyword_pairs(mechanics.get("must_have_mechanics", [])),
+        avoid_mechanics=_keyword_pairs(mechanics.get("avoid_mechanics", [])),
+        recommended_skill_types=_keyword_pairs(mechanics.get("recommended_skill_types", [])),
+        recommended_item_stats=_keyword_pairs(mechanics.get("recommended_item_stats", [])),
+        has_level_60_penalty=has_penalty,
+        level_mechanics=tuple(level_mechanics.items()),
+        level_bonus_mechanics=level_bonus_mechanics
+    )
+
+
+# ==============================================================================
+# 프로세스 전역 프로필 저장소
+# ==============================================================================
+
+_lock = threading.Lock()
+_profiles: Dict[str, TalentProfile] = {}
+_fingerprint: Optional[Tuple] = None
+_last_checked = 0.0
+_built = False
+
+
+def talent_data_fingerprint(db: Session) -> Tuple:
+    """talent_levels 테이블 변경 횟수 (DB 트리거가 유지하는 catalog_revisions, 조회 쿼리 1회)"""
+    return catalog_fingerprint(db, (TalentLevel,))
+
+
+def build_talent_profiles(db: Session) -> Dict[str, TalentProfile]:
+    """DB의 재능 레벨 효과로 전체 프로필을 (재)생성하여 전역 저장소에 설치"""
+    global _fingerprint, _last_checked
+
+    # 읽기 전에 지문을 잡아 두면 읽는 도중의 변경은 다음 확인 때 다시 반영됨
+    fingerprint = talent_data_fingerprint(db)
+    levels_by_talent: Dict[str, list] = {}
+    for talent_level in db.query(TalentLevel).order_by(TalentLevel.level).all():
+        levels_by_talent.setdefault(talent_level.talent_name, []).append(talent_level)
+
+    talent_names = set(TALENT_MECHANICS) | set(levels_by_talent)
+    profiles = {
+        name: compile_talent_profile(name, levels_by_talent.get(name, []))
+        for name in talent_names
+    }
+
+    with _lock:
+        install_talent_profiles(profiles)
+        _fingerprint = fingerprint
+        _last_checked = time.monotonic()
+
+    logger.info(f"Built {len(profiles)} talent profiles")
+    return profiles
+
+
+def install_talent_profiles(profiles: Dict[str, TalentProfile]):
+    """미리 생성된 프로필 설치 (배치 워커 등 DB 없는 프로세스용)"""
+    global _profiles, _built
+    _profiles = dict(profiles)
+    _built = True
+
+
+def get_all_talent_profiles() -> Dict[str, TalentProfile]:
+    """현재 설치된 전체 프로필"""
+    return dict(_profiles)
+
+
+def invalidate_talent_profiles():
+    """재능 데이터 변경 시 호출 - 다음 조회 때 프로필 재생성"""
+    global _built, _fingerprint
+    with _lock:
+        _built = False
+        _fingerprint = None
+
+
+def _refresh_if_stale(db: Session):
+    """프로필이 없거나 재능 데이터가 바뀌었으면 재생성 (RECHECK_INTERVAL 간격으로만 확인)"""
+    global _last_checked
+
+    if not _built:
+        build_talent_profiles(db)
+        return
+
+    now = time.monotonic()
+    if now - _last_checked < RECHECK_INTERVAL:
+        return
+
+    _last_checked = now
+    if talent_data_fingerprint(db) != _fingerprint:
+        build_talent_profiles(db)
+
+
+def get_talent_profile(talent_name: str, db: Optional[Session] = None) -> TalentProfile:
+    """
+    재능 프로필 조회
+
+    Args:
+        talent_name: 재능 이름
+        db: DB 세션 (주어지면 필요 시 프로필을 생성/갱신)
+
+    Returns:
+        TalentProfile (DB에 레벨 효과가 없는 재능은 참조 데이터만으로 생성)
+    """
+    if db is not None:
+        _refresh_if_stale(db)
+
+    profile = _profiles.get(talent_name)
+    if profile is None:
+        profile = compile_talent_profile(talent_name, [])
+        with _lock:
+            _profiles.setdefault(talent_name, profile)
+    return profile
@@ -0,0 +1,180 @@
+"""
+재능 트리 모델 및 포인트 배분
+
+DB에는 노드 배치(인접 정보)가 없으므로, God Class별로 티어 순서
+(Micro → Medium → Large/Legendary → Core)의 열을 만들고 각 노드를 이전 열의 노드에
+균등하게 연결한 트리로 모델링합니다. 노드를 찍으려면 부모 노드가 먼저 찍혀 있어야 합니다.
+
+배분은 전위 순회 순서의 트리 배낭 DP로 풉니다 (O(노드 수 × 포인트 예산)).
+- dp[i][b]: 전위 순서 i번째 이후 노드들로 포인트 b 안에서 얻는 최대 점수
+- i번 노드를 건너뛰면 서브트리 전체를 건너뜀 (dp[subtree_end[i]][b])
+- i번 노드를 찍으면 자식부터 이어서 선택 가능 (score[i] + dp[i + 1][b - cost[i]])
+"""
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+
+# 티어별 포인트 비용 (Legendary는 "Legendary Medium" 등 복합 티어 포함)
+TIER_POINT_COSTS = {
+    "Micro": 1,
+    "Medium": 2,
+    "Large": 3,
+    "Legendary": 3
+}
+CORE_NODE_COST = 3
+DEFAULT_TALENT_POINTS = 24
+
+# 트리 열 순서 (앞 열의 노드가 부모)
+TIER_COLUMNS = ["Micro", "Medium", "Large", "Core"]
+
+
+@dataclass
+class TalentTreeNode:
+    """재능 트리 노드 (전위 순회 순서로 저장)"""
+    node_id: int
+    parent_id: Optional[int]  # None이면 루트 (바로 찍을 수 있음)
+    cost: int
+    subtree_end: int = 0  # 전위 순서에서 서브트리 다음 위치
+
+
+@dataclass
+class TalentAllocation:
+    """포인트 배분 결과"""
+    node_ids: List[int]  # 찍는 순서 (부모가 항상 먼저)
+    total_score: float
+    points_used: int
+    elapsed_ms: float
+
+
+def node_cost(node_type: Optional[str], tier: Optional[str]) -> int:
+    """노드 포인트 비용"""
+    if node_type == "Core":
+        return CORE_NODE_COST
+    if tier:
+        for name in ("Legendary", "Large", "Medium", "Micro"):
+            if name in tier:
+                return TIER_POINT_COSTS[name]
+    return TIER_POINT_COSTS["Micro"]
+
+
+def node_column(node_type: Optional[str], tier: Optional[str]) -> int:
+    """트리 열 (Micro=0, Medium=1, Large/Legendary=2, Core=3)"""
+    if node_type == "Core":
+        return TIER_COLUMNS.index("Core")
+    if tier and ("Large" in tier or "Legendary" in tier):
+        return TIER_COLUMNS.index("Large")
+    if tier and "Medium" in tier:
+        return TIER_COLUMNS.index("Medium")
+    return TIER_COLUMNS.index("Micro")
+
+
+class TalentTree:
+    """
+    God Class별 재능 트리 숲
+
+    카탈로그 생성 시 한 번만 만들고 요청 간 공유합니다 (읽기 전용).
+    """
+
+    def __init__(self, nodes: Sequence):
+        """
+        Args:
+            nodes: 재능 노드 레코드 (id, node_type, god_class, tier 속성 사용)
+        """
+        # 1. God Class별 열 구성 (ID 순으로 정렬하여 배치 고정)
+        trees: Dict[str, List[List]] = {}
+        for node in sorted(nodes, key=lambda n: n.id):
+            columns = trees.setdefault(node.god_class or "", [[] for _ in TIER_COLUMNS])
+            columns[node_column(node.node_type, node.tier)].append(node)
+
+        # 2. 각 노드를 가장 가까운 앞 열에 균등 분배하여 부모 지정
+        parents: Dict[int, Optional[int]] = {}
+        children: Dict[Optional[int], List[int]] = {}
+        for god_class in sorted(trees):
+            previous: List = []
+            for column in trees[god_class]:
+                if not column:
+                    continue
+                for j, node in enumerate(column):
+                    parent_id = previous[j * len(previous) // len(column)].id if previous else None
+                    parents[node.id] = parent_id
+                    children.setdefault(parent_id, []).append(node.id)
+                previous = column
+
+        # 3. 전위 순회 순서로 저장 (부모가 None인 노드가 루트)
+        costs = {node.id: node_cost(node.node_type, node.tier) for node in nodes}
+        self.nodes: List[TalentTreeNode] = []
+        self._positions: Dict[int, int] = {}
+        stack = [(node_id, False) for node_id in reversed(children.get(None, []))]
+        while stack:
+            node_id, closing = stack.pop()
+            if closing:
+                self.nodes[self._positions[node_id]].subtree_end = len(self.nodes)
+                continue
+            self._positions[node_id] = len(self.nodes)
+            self.nodes.append(
+                TalentTreeNode(node_id=node_id, parent_id=parents[node_id], cost=costs[node_id])
+            )
+            stack.append((node_id, True))
+            stack.extend((child, False) for child in reversed(children.get(node_id, [])))
+
+    def get(self, node_id: int) -> Optional[TalentTreeNode]:
+        """노드 조회"""
+        position = self._positions.get(node_id)
+        return self.nodes[position] if position is not None else None
+
+
+def allocate_talent_points(
+    tree: TalentTree,
+    scores: Dict[int, float],
+    points: int = DEFAULT_TALENT_POINTS
+) -> TalentAllocation:
+    """
+    포인트 예산 안에서 점수 합이 최대인 연결된 노드 집합 선택
+
+    Args:
+        tree: 재능 트리
+        scores: {노드 ID: 점수} (없는 노드는 0점)
+        points: 포인트 예산
+
+    Returns:
+        TalentAllocation (노드는 부모가 먼저 오는 순서)
+    """
+    started = time.perf_counter()
+    nodes = tree.nodes
+    budget = max(points, 0)
+
+    # 1. 뒤에서부터 DP 테이블 계산
+    dp: List[List[float]] = [[0.0] * (budget + 1) for _ in range(len(nodes) + 1)]
+    for i in range(len(nodes) - 1, -1, -1):
+        node = nodes[i]
+        skip = dp[node.subtree_end]
+        take = dp[i + 1]
+        score = scores.get(node.node_id, 0)
+        row = skip[:]
+        for b in range(node.cost, budget + 1):
+            value = score + take[b - node.cost]
+            if value > row[b]:
+                row[b] = value
+        dp[i] = row
+
+    # 2. 선택 복원 (전위 순서이므로 부모가 항상 먼저)
+    node_ids: List[int] = []
+    points_used = 0
+    i, b = 0, budget
+    while i < len(nodes):
+        node = nodes[i]
+        if dp[i][b] == dp[node.subtree_end][b]:
+            i = node.subtree_end
+        else:
+            node_ids.append(node.node_id)
+            points_used += node.cost
+            b -= node.cost
+            i += 1
+
+    return TalentAllocation(
+        node_ids=node_ids,
+        total_score=dp[0][budget] if nodes else 0.0,
+        points_used=points_used,
+        elapsed_ms=(time.perf_counter() - started) * 1000
+    )
@@ -3,7 +3,7 @@ Pydantic 스키마 정의 - API 요청/응답 모델
 """
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # ============================================================================
@@ -47,6 +47,9 @@ class SkillBase(BaseModel):
 class SkillResponse(SkillBase):
     """스킬 응답 스키마"""
     id: int
+    build_style: Optional[str] = None  # DoT, Hit, Hybrid, Unknown
+    ailment: Optional[str] = None
+    mechanics_mask: Optional[int] = None  # MechanicsAnalyzer.MECHANIC_BITS 비트마스크
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
@@ -167,3 +170,25 @@ class BuildRecommendationResponse(BaseModel):
     recommended_skills: List[SkillRecommendation]
     recommended_items: List[ItemRecommendation]
     synergy_score: float
+
+
+class BatchBuildItem(BaseModel):
+    """배치 빌드 추천 요청 항목"""
+    hero_id: int
+    playstyle: Optional[str] = None  # Melee, Ranged, Tank, etc.
+    focus: Optional[str] = None  # Damage, Defense, Utility
+    max_skills: int = Field(6, ge=1, le=10)
+    max_items: int = Field(10, ge=1, le=20)
+    optimize_skills: bool = False  # 세트 시너지 기반 스킬 조합 최적화
+    optimize_budget_ms: float = Field(50, gt=0, le=1000)  # 조합 최적화 시간 예산
+    optimize_items: bool = False  # 세트 보너스를 고려한 장비 슬롯 배정
+    allocate_talents: bool = False  # 포인트 예산 내 재능 트리 배분
+    talent_points: int = Field(24, ge=1, le=200)  # 재능 포인트 예산
+    explain: bool = True  # False면 이유 문자열 대신 reason_codes 반환
+    pair_synergy: bool = False  # 스킬 쌍 시너지(skill_synergies)까지 고려한 조합 최적화
+
+
+class BatchBuildRequest(BaseModel):
+    """배치 빌드 추천 요청 스키마"""
+    requests: List[BatchBuildItem] = Field(..., min_length=1, max_length=500)
+    workers: int = Field(0, ge=0, le=16)  # 병렬 처리 수 (0이면 단일 프로세스, 공유 풀 크기로 제한)
@@ -0,0 +1,83 @@
+"""
+Single-flight 요청 병합
+
+같은 키의 작업이 이미 진행 중이면 새로 실행하지 않고 진행 중인 작업의 결과를 함께 기다립니다.
+(인기 영웅에 같은 AI 요청이 동시에 몰릴 때 업스트림 호출을 1회로 줄임)
+
+- 동기 호출(do)과 비동기 호출(do_async)이 같은 진행 중 목록을 공유하므로
+  스레드풀의 동기 라우트와 async 라우트의 동일 요청도 서로 병합됩니다.
+- 결과는 완료 즉시 목록에서 빠지므로 캐시가 아닙니다 (완료 후 요청은 새로 실행).
+- 작업이 예외로 끝나면 기다리던 호출 모두 같은 예외를 받습니다.
+
+Usage:
+    flight = SingleFlight("ai_openai")
+    result, shared = flight.do(key, lambda: call_upstream())
+    result, shared = await flight.do_async(key, lambda: call_upstream())
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Tuple, TypeVar
+
+from backend.instrumentation import SINGLE_FLIGHT_CALLS
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """키별 진행 중 작업 병합 (스레드 안전)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """(진행 중 Future, 내가 실행해야 하는지)"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                SINGLE_FLIGHT_CALLS.inc(self.name, "coalesced")
+                return future, False
+            future = self._calls[key] = Future()
+            SINGLE_FLIGHT_CALLS.inc(self.name, "executed")
+            return future, True
+
+    def _finish(self, key: str, future: Future, fn: Callable[[], T]) -> None:
+        """작업 실행 후 결과/예외를 Future에 기록하고 진행 중 목록에서 제거"""
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        동기 실행 (진행 중이면 완료까지 대기)
+
+        Returns:
+            (결과, 다른 호출의 결과를 공유했는지)
+        """
+        future, leader = self._join(key)
+        if leader:
+            self._finish(key, future, fn)
+        return future.result(), not leader
+
+    async def do_async(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        비동기 실행 (fn은 워커 스레드에서 실행, 대기 중에는 이벤트 루프를 막지 않음)
+
+        Returns:
+            (결과, 다른 호출의 결과를 공유했는지)
+        """
+        future, leader = self._join(key)
+        if leader:
+            await asyncio.to_thread(self._finish, key, future, fn)
+        return await asyncio.wrap_future(future), not leader
+
+    def in_flight(self) -> int:
+        """진행 중인 키 수"""
+        with self._lock:
+            return len(self._calls)
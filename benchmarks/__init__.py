@@ -0,0 +1,6 @@
+"""
+성능 벤치마크 스위트
+
+생성된 SQLite 카탈로그를 대상으로 추천 엔진, AI 컨텍스트 생성, 메커니즘 분석,
+목록 API 라우트를 프로세스 안에서 측정합니다. (실행: python benchmarks/run_benchmarks.py)
+"""
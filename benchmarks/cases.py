@@ -0,0 +1,173 @@
+"""
+벤치마크 케이스 정의
+
+- engine:    RecommendationEngine / RecommendationEngineV2 빌드 추천
+- context:   ContextBuilder.build_hero_context / format_context_for_prompt / format_context_with_budget,
+             AI 응답 검증/복구 (repair_ai_build)
+- mechanics: MechanicsAnalyzer 스킬 분석 / 시너지 점수 / 빌드 타입
+- routes:    경로 파라미터가 없는 모든 GET 목록 라우트 (FastAPI TestClient)
+
+영웅 ID는 호출마다 순환하여 특정 영웅의 캐시 상태에 치우치지 않게 합니다.
+"""
+import itertools
+import json
+from typing import Callable, List
+
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from backend.database.db import get_db_session
+from backend.database.models import Hero, Item, Skill
+from backend.main import app
+from backend.recommendation.ai_service import DEFAULT_PROMPT_TOKEN_BUDGET
+from backend.recommendation.ai_validation import repair_ai_build
+from backend.recommendation.catalog import RecommendationCatalog
+from backend.recommendation.context_builder import ContextBuilder
+from backend.recommendation.engine import RecommendationEngine
+from backend.recommendation.engine_v2 import RecommendationEngineV2
+from backend.recommendation.mechanics_analyzer import MechanicsAnalyzer
+from backend.recommendation.scoring_rules import get_scoring_rules
+from benchmarks.harness import BenchmarkCase
+
+
+def _cycle(values: List) -> Callable[[], object]:
+    """호출마다 다음 값을 돌려주는 함수"""
+    iterator = itertools.cycle(values)
+    return lambda: next(iterator)
+
+
+def engine_cases(db: Session) -> List[BenchmarkCase]:
+    """빌드 추천 엔진"""
+    hero_ids = [hero_id for hero_id, in db.query(Hero.id).order_by(Hero.id)]
+    next_hero = _cycle(hero_ids)
+    rules = get_scoring_rules()
+
+    return [
+        BenchmarkCase(
+            "engine_v1.recommend_build", "engine",
+            lambda: RecommendationEngine(db).recommend_build(next_hero())
+        ),
+        BenchmarkCase(
+            "engine_v2.recommend_build", "engine",
+            lambda: RecommendationEngineV2(db).recommend_build(next_hero())
+        ),
+        # 카탈로그를 매번 새로 로드 (공유 스냅샷/점수 캐시 없는 첫 요청 비용)
+        BenchmarkCase(
+            "engine_v2.recommend_build[cold_catalog]", "engine",
+            lambda: RecommendationEngineV2(
+                db, catalog=RecommendationCatalog.load(db, rules.effect_keywords)
+            ).recommend_build(next_hero())
+        ),
+        BenchmarkCase(
+            "engine_v2.recommend_build[optimize]", "engine",
+            lambda: RecommendationEngineV2(db).recommend_build(
+                next_hero(), optimize_skills=True, optimize_items=True, allocate_talents=True
+            )
+        )
+    ]
+
+
+def context_cases(db: Session) -> List[BenchmarkCase]:
+    """AI 프롬프트 컨텍스트 생성"""
+    hero_ids = [hero_id for hero_id, in db.query(Hero.id).order_by(Hero.id)]
+    next_hero = _cycle(hero_ids)
+    builder = ContextBuilder(db)
+    next_context = _cycle([builder.build_hero_context(hero_id) for hero_id in hero_ids])
+
+    # AI 응답 예시: 정상 항목 + 틀린 ID 1개 + 오타 이름 1개 + 없는 항목 1개 (복구 시 원본을 수정하므로 매번 파싱)
+    catalog = RecommendationEngineV2(db).catalog
+    skills, items = catalog.skills[:6], catalog.items[:10]
+    recommended_skills = [{"skill_name": skill.name, "skill_id": skill.id} for skill in skills]
+    recommended_skills[1]["skill_id"] = skills[2].id
+    recommended_skills[3]["skill_name"] = skills[3].name.lower() + "s"
+    recommended_skills.append({"skill_name": "Unknown Skill", "skill_id": -1})
+    ai_response = json.dumps({
+        "build_type": "Hit",
+        "build_summary": "",
+        "recommended_skills": recommended_skills,
+        "recommended_items": [{"item_name": item.name, "item_id": item.id, "slot": item.slot} for item in items]
+    })
+
+    return [
+        BenchmarkCase(
+            "context_builder.build_hero_context", "context",
+            lambda: builder.build_hero_context(next_hero())
+        ),
+        BenchmarkCase(
+            "context_builder.format_context_for_prompt", "context",
+            lambda: builder.format_context_for_prompt(next_context())
+        ),
+        BenchmarkCase(
+            "context_builder.format_context_with_budget", "context",
+            lambda: builder.format_context_with_budget(next_context(), DEFAULT_PROMPT_TOKEN_BUDGET)
+        ),
+        BenchmarkCase(
+            "ai_validation.repair_ai_build", "context",
+            lambda: repair_ai_build(json.loads(ai_response), catalog)
+        )
+    ]
+
+
+def mechanics_cases(db: Session) -> List[BenchmarkCase]:
+    """MechanicsAnalyzer (1회 = 카탈로그 전체 스킬 분석 등)"""
+    analyzer = MechanicsAnalyzer()
+    skills = [
+        {"tags": skill.tags, "description": skill.description, "damage_type": skill.damage_type}
+        for skill in db.query(Skill).order_by(Skill.id)
+    ]
+    analyses = [analyzer.analyze_skill_mechanics(skill) for skill in skills]
+    item_effects = [
+        effect
+        for raw, in db.query(Item.special_effects).order_by(Item.id).limit(10)
+        for effect in json.loads(raw or "[]")
+    ]
+
+    return [
+        BenchmarkCase(
+            "mechanics_analyzer.analyze_skill_mechanics[all_skills]", "mechanics",
+            lambda: [analyzer.analyze_skill_mechanics(skill) for skill in skills]
+        ),
+        BenchmarkCase(
+            "mechanics_analyzer.calculate_synergy_score", "mechanics",
+            lambda: analyzer.calculate_synergy_score(analyses[:6], item_effects)
+        ),
+        BenchmarkCase(
+            "mechanics_analyzer.get_build_type_from_skills", "mechanics",
+            lambda: analyzer.get_build_type_from_skills(analyses)
+        )
+    ]
+
+
+def list_route_paths() -> List[str]:
+    """경로 파라미터가 없는 GET API 라우트 (목록 라우트)"""
+    return sorted(
+        route.path
+        for route in app.routes
+        if isinstance(route, APIRoute) and "GET" in route.methods
+        and route.path.startswith("/api/") and "{" not in route.path
+    )
+
+
+def route_cases(db: Session) -> List[BenchmarkCase]:
+    """목록 라우트 (TestClient, DB 의존성을 벤치마크 세션으로 교체)"""
+    app.dependency_overrides[get_db_session] = lambda: db
+    client = TestClient(app)
+
+    def request(path: str) -> Callable[[], object]:
+        def call():
+            response = client.get(path)
+            response.raise_for_status()
+            return response
+        return call
+
+    return [BenchmarkCase(f"GET {path}", "routes", request(path)) for path in list_route_paths()]
+
+
+# 그룹 이름 → 케이스 생성 함수
+CASE_GROUPS = {
+    "engine": engine_cases,
+    "context": context_cases,
+    "mechanics": mechanics_cases,
+    "routes": route_cases
+}
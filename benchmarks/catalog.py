@@ -0,0 +1,300 @@
+"""
+합성 카탈로그 생성기 (시드 고정, 스케일 테스트용)
+
+backend/database/models.py 스키마의 영웅/스킬/아이템/세트/재능 레벨/재능 노드/성운 행을
+현재 크롤링 데이터 규모(1x) 기준 1x ~ 1000x 배수로 생성합니다.
+
+- 어휘는 game_mechanics / talent_mechanics 참조 데이터에서 가져옴
+  (스킬 태그, 데미지 타입, 상태이상, 스탯 이름) → 키워드 매칭/스코어링 경로가 실제처럼 동작
+- 스킬은 BUILD_ARCHETYPES 중 하나를 골라 태그/데미지 타입/설명을 일관되게 구성
+  (크롤러와 같이 MechanicsAnalyzer 파생 컬럼도 함께 저장)
+- 실제 재능(TALENT_MECHANICS)을 가진 영웅을 먼저 넣고 나머지는 합성 재능 (Hero.talent 고유)
+- 같은 시드와 배수면 항상 같은 카탈로그, 대량 배수는 배치 단위 bulk insert
+"""
+import json
+import random
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database.models import (
+    Base, Hero, Skill, Item, ItemSet, TalentNode, TalentLevel, Destiny
+)
+from backend.game_mechanics import (
+    AILMENTS, BUILD_ARCHETYPES, COMBO, DAMAGE_TYPES, SKILL_TAG_SYNERGIES, SPELL_BURST, STAT_EFFECTS
+)
+from backend.recommendation.mechanics_analyzer import MechanicsAnalyzer
+from backend.talent_mechanics import TALENT_MECHANICS
+
+
+# 1x 기준 행 수 (현재 크롤링 데이터 규모)
+BASE_COUNTS = {
+    "heroes": 12,
+    "skills": 60,
+    "items": 80,
+    "item_sets": 4,
+    "talent_nodes": 40,
+    "destinies": 30
+}
+TALENT_LEVELS = (1, 45, 60, 75)
+MAX_SCALE = 1000
+BATCH_SIZE = 5000  # bulk insert 1회 행 수
+
+
+# ==============================================================================
+# 어휘 (게임 메커니즘 참조 데이터 기반)
+# ==============================================================================
+
+def _unique(values: Iterable[str]) -> List[str]:
+    """순서 유지 중복 제거"""
+    return list(dict.fromkeys(values))
+
+
+DAMAGE_TYPE_NAMES = list(DAMAGE_TYPES)
+SKILL_TAGS = _unique(list(SKILL_TAG_SYNERGIES) + DAMAGE_TYPE_NAMES + ["Combo", "Ranged", "Cooldown"])
+AILMENT_NAMES = list(AILMENTS)
+STAT_NAMES = _unique(
+    [stat for synergy in SKILL_TAG_SYNERGIES.values() for stat in synergy["recommended_stats"]]
+    + [stat for ailment in AILMENTS.values() for stat in ailment.get("scaling_stats", [])]
+    + [stat for effect in STAT_EFFECTS.values() for stat in effect["typical_bonuses"]]
+    + SPELL_BURST["scaling_stats"] + COMBO["scaling_stats"]
+    + [stat for talent in TALENT_MECHANICS.values() for stat in talent.get("recommended_item_stats", [])]
+)
+HERO_NAMES = ["Rehan", "Carino", "Gemma", "Erika", "Youga", "Moto", "Thea", "Iris", "Bing", "Selena"]
+GOD_TYPES = _unique(
+    [talent["god_type"] for talent in TALENT_MECHANICS.values()]
+    + [god for effect in STAT_EFFECTS.values() for god in effect["primary_for"] if god not in HERO_NAMES]
+)
+GOD_CLASSES = ["God of Might", "God of Wisdom", "God of War", "God of Machines", "New God"]
+
+SKILL_TYPES = ["Active Skill", "Support Skill", "Passive Skill"]
+SKILL_SHAPES = ["Strike", "Nova", "Bolt", "Slash", "Barrage", "Wave", "Orb", "Burst", "Storm", "Totem"]
+TALENT_WORDS = ["Blazing", "Frozen", "Silent", "Eternal", "Savage", "Hollow", "Radiant", "Wild",
+                "Heart", "Soul", "Rage", "Echo", "Oath", "Pulse", "Shadow", "Crown"]
+ITEM_PREFIXES = ["Ancient", "Cursed", "Gilded", "Runic", "Shattered", "Vengeful", "Ashen", "Storm"]
+SLOTS = [("Helmet", "Head"), ("Armor", "Chest"), ("Gloves", "Hands"), ("Boots", "Feet"),
+         ("Weapon", "MainHand"), ("Shield", "OffHand"), ("Necklace", "Neck"), ("Ring", "Finger"),
+         ("Belt", "Waist")]
+RARITIES = ["Legendary", "Rare", "Magic", None]
+NODE_TIERS = ["Micro", "Medium", "Large"]
+STAT_RANGES = {"Micro": (2, 6), "Medium": (6, 14), "Large": (14, 30)}
+
+
+# ==============================================================================
+# 생성
+# ==============================================================================
+
+def create_catalog_database(path: Path, scale: int = 1, seed: int = 0) -> sessionmaker:
+    """
+    카탈로그 DB 생성 (기존 파일은 덮어씀)
+
+    Args:
+        path: SQLite 파일 경로
+        scale: 1x 기준 행 수 배수 (1 ~ MAX_SCALE)
+        seed: 난수 시드
+
+    Returns:
+        생성된 DB에 연결된 세션 팩토리
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = session_factory()
+    try:
+        generate_catalog(db, scale, seed)
+        db.commit()
+    finally:
+        db.close()
+    return session_factory
+
+
+def generate_catalog(db: Session, scale: int = 1, seed: int = 0) -> Dict[str, int]:
+    """
+    빈 DB에 합성 카탈로그 추가 (커밋은 호출자)
+
+    Returns:
+        테이블별 생성 행 수
+    """
+    if not 1 <= scale <= MAX_SCALE:
+        raise ValueError(f"scale must be between 1 and {MAX_SCALE}, got {scale}")
+
+    rnd = random.Random(seed)
+    counts = {table: count * scale for table, count in BASE_COUNTS.items()}
+
+    # 1. 영웅 (재능 레벨이 영웅 재능 이름을 참조하므로 목록 유지)
+    heroes = list(_heroes(rnd, counts["heroes"]))
+    _insert(db, Hero, heroes)
+
+    # 2. 세트 (아이템이 세트 이름을 참조)
+    set_names = [f"{rnd.choice(ITEM_PREFIXES)} {rnd.choice(TALENT_WORDS)} Set {i + 1}"
+                 for i in range(counts["item_sets"])]
+    _insert(db, ItemSet, _item_sets(rnd, set_names))
+
+    # 3. 나머지 테이블
+    counts["talent_levels"] = _insert(db, TalentLevel, _talent_levels(rnd, heroes))
+    _insert(db, Skill, _skills(rnd, counts["skills"]))
+    _insert(db, Item, _items(rnd, counts["items"], set_names))
+    _insert(db, TalentNode, _talent_nodes(rnd, counts["talent_nodes"]))
+    _insert(db, Destiny, _destinies(rnd, counts["destinies"]))
+    return counts
+
+
+def _insert(db: Session, model, rows: Iterable[Dict]) -> int:
+    """배치 단위 bulk insert (대량 배수에서 메모리 제한)"""
+    rows = iter(rows)
+    total = 0
+    while batch := list(islice(rows, BATCH_SIZE)):
+        db.bulk_insert_mappings(model, batch)
+        total += len(batch)
+    return total
+
+
+def _stat_line(rnd: random.Random, low: int = 5, high: int = 40) -> str:
+    """"+N% <스탯>" 효과 문구"""
+    return f"+{rnd.randint(low, high)}% {rnd.choice(STAT_NAMES)}"
+
+
+def _heroes(rnd: random.Random, count: int) -> Iterator[Dict]:
+    """실제 재능 영웅 먼저, 이후 합성 재능 (이름은 영웅당 재능 2개씩 공유)"""
+    for talent, mechanics in islice(TALENT_MECHANICS.items(), count):
+        yield {
+            "name": mechanics["hero"],
+            "god_type": mechanics["god_type"],
+            "talent": talent,
+            "description": mechanics.get("description", mechanics.get("playstyle")),
+            "popularity_score": round(rnd.uniform(0, 100), 1)
+        }
+
+    for i in range(len(TALENT_MECHANICS), count):
+        playstyle = rnd.choice(list(BUILD_ARCHETYPES))
+        yield {
+            "name": f"{HERO_NAMES[(i // 2) % len(HERO_NAMES)]} {i // (2 * len(HERO_NAMES)) + 1}",
+            "god_type": rnd.choice(GOD_TYPES),
+            "talent": f"{rnd.choice(TALENT_WORDS)} {rnd.choice(TALENT_WORDS)} {i + 1}",
+            "description": f"{playstyle} hero. {_stat_line(rnd)} and {_stat_line(rnd)}.",
+            "popularity_score": round(rnd.uniform(0, 100), 1)
+        }
+
+
+def _talent_levels(rnd: random.Random, heroes: List[Dict]) -> Iterator[Dict]:
+    """영웅 재능별 레벨 효과 (실제 재능은 필수 메커니즘 사용)"""
+    for hero in heroes:
+        talent = hero["talent"]
+        mechanics = TALENT_MECHANICS.get(talent, {}).get("must_have_mechanics") \
+            or rnd.sample(STAT_NAMES, 3)
+        for level in TALENT_LEVELS:
+            yield {
+                "talent_name": talent,
+                "level": level,
+                "effect_name": f"{rnd.choice(TALENT_WORDS)} {rnd.choice(TALENT_WORDS)}",
+                "effect_description": f"{_stat_line(rnd, 10, 90)}. Gains {rnd.choice(mechanics)} on hit.",
+                "mechanics": json.dumps(rnd.sample(mechanics, min(2, len(mechanics))))
+            }
+
+
+def _skills(rnd: random.Random, count: int) -> Iterator[Dict]:
+    """아키타입 기반 스킬 (태그/데미지 타입/설명 일관)"""
+    archetypes = list(BUILD_ARCHETYPES.values())
+    mechanics_analyzer = MechanicsAnalyzer()
+    for i in range(count):
+        archetype = rnd.choice(archetypes)
+        damage_type = rnd.choice(archetype.get("damage_types") or [None])
+        tags = _unique(
+            archetype["skill_tags"]
+            + ([damage_type] if damage_type else [])
+            + rnd.sample(SKILL_TAGS, rnd.randint(0, 2))
+        )
+
+        sentences = [f"Deals {damage_type or 'minion'} damage to enemies in front of you."]
+        if "DoT" in archetype.get("damage_forms", []) or "DoT" in tags:
+            ailment = rnd.choice(AILMENT_NAMES)
+            sentences.append(f"Inflicts {ailment}, dealing damage over time per second.")
+        if "Spell" in tags and "Cooldown" not in tags:
+            sentences.append("Triggers Spell Burst when fully charged.")
+        if "Melee" in tags and rnd.random() < 0.3:
+            sentences.append("Combo Finisher: consumes all Combo Points.")
+        sentences.append(f"Benefits from {rnd.choice(archetype['recommended_stats'])}.")
+
+        skill = {
+            "name": f"{damage_type or 'Shadow'} {rnd.choice(SKILL_SHAPES)} {i + 1}",
+            "type": rnd.choices(SKILL_TYPES, weights=[5, 3, 2])[0],
+            "description": " ".join(sentences),
+            "tags": json.dumps(tags),
+            "damage_type": damage_type,
+            "cooldown": rnd.choice([None, None, 1.0, 2.5, 6.0]) if "Cooldown" in tags else None,
+            "mana_cost": rnd.randint(5, 60)
+        }
+        skill.update(mechanics_analyzer.skill_mechanics_columns(skill))
+        yield skill
+
+
+def _items(rnd: random.Random, count: int, set_names: List[str]) -> Iterator[Dict]:
+    """슬롯별 아이템 (전설은 상태이상/메커니즘 효과 추가)"""
+    for i in range(count):
+        item_type, slot = rnd.choice(SLOTS)
+        rarity = rnd.choices(RARITIES, weights=[3, 4, 2, 1])[0]
+        effects = [_stat_line(rnd) for _ in range(rnd.randint(0, 3))]
+        if rarity == "Legendary":
+            effects.append(f"+{rnd.randint(10, 50)}% chance to inflict {rnd.choice(AILMENT_NAMES)}")
+            effects.append(f"{rnd.randint(5, 25)}% additional {rnd.choice(DAMAGE_TYPE_NAMES)} Damage")
+        yield {
+            "name": f"{rnd.choice(ITEM_PREFIXES)} {item_type} {i + 1}",
+            "type": item_type,
+            "slot": slot,
+            "rarity": rarity,
+            "stat_type": rnd.choice(list(STAT_EFFECTS) + [None]),
+            "base_stats": json.dumps({"armor": rnd.randint(0, 300), "life": rnd.randint(0, 120)}),
+            "special_effects": json.dumps(effects),
+            "set_name": rnd.choice(set_names + [None] * 6) if set_names else None
+        }
+
+
+def _item_sets(rnd: random.Random, set_names: List[str]) -> Iterator[Dict]:
+    for name in set_names:
+        yield {
+            "set_name": name,
+            "pieces_required": rnd.choice([4, 6]),
+            "set_bonus_2": _stat_line(rnd),
+            "set_bonus_4": _stat_line(rnd, 20, 60),
+            "set_bonus_6": f"{rnd.randint(10, 30)}% additional {rnd.choice(DAMAGE_TYPE_NAMES)} Damage"
+        }
+
+
+def _talent_nodes(rnd: random.Random, count: int) -> Iterator[Dict]:
+    """코어 노드 약 15%, 나머지 일반 노드 (티어별 수치 범위)"""
+    for i in range(count):
+        core = rnd.random() < 0.15
+        tier = None if core else rnd.choice(NODE_TIERS)
+        low, high = STAT_RANGES[tier or "Large"]
+        yield {
+            "name": f"{rnd.choice(TALENT_WORDS)} {rnd.choice(TALENT_WORDS)} {i + 1}",
+            "node_type": "Core" if core else "Regular",
+            "god_class": rnd.choice(GOD_CLASSES),
+            "tier": tier,
+            "effect": _stat_line(rnd, low, high)
+        }
+
+
+def _destinies(rnd: random.Random, count: int) -> Iterator[Dict]:
+    for i in range(count):
+        tier = rnd.choice(NODE_TIERS)
+        low, high = STAT_RANGES[tier]
+        category = rnd.choice(STAT_NAMES)
+        yield {
+            "name": f"{tier} Fate: {category} {i + 1}",
+            "tier": tier,
+            "category": category,
+            "effect": f"+{rnd.randint(low, high)}% {category}",
+            "stat_range": f"({low}-{high})"
+        }
@@ -0,0 +1,181 @@
+"""
+벤치마크 타이밍 하네스
+
+- 워밍업 후 최소 시간/최소 횟수를 채울 때까지 반복 호출하여 호출별 시간 기록
+- 초당 처리량(ops/sec)과 p50/p99 지연 시간 계산
+- 결과를 JSON으로 저장하고, 이전 결과와 p50 비교
+- 여러 카탈로그 배수 결과는 케이스별 p50 스케일링 곡선으로 출력
+"""
+import json
+import math
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_MIN_TIME = 0.5  # 케이스당 최소 측정 시간 (초)
+DEFAULT_MIN_ROUNDS = 20
+DEFAULT_MAX_ROUNDS = 10_000
+DEFAULT_WARMUP = 2
+
+# 비교 시 변화로 표시할 p50 비율 기준 (이보다 작으면 "~")
+CHANGE_THRESHOLD = 0.05
+
+
+@dataclass
+class BenchmarkCase:
+    """측정 대상 (func는 인자 없이 1회 작업 수행)"""
+    name: str
+    group: str
+    func: Callable[[], object]
+
+
+@dataclass
+class BenchmarkResult:
+    """케이스 측정 결과 (시간 단위: 밀리초)"""
+    name: str
+    group: str
+    rounds: int
+    ops_per_sec: float
+    mean_ms: float
+    p50_ms: float
+    p99_ms: float
+    min_ms: float
+    max_ms: float
+    scale: int = 1  # 카탈로그 배수
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """최근접 순위 백분위수 (정렬된 값)"""
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def measure(
+    case: BenchmarkCase,
+    min_time: float = DEFAULT_MIN_TIME,
+    min_rounds: int = DEFAULT_MIN_ROUNDS,
+    max_rounds: int = DEFAULT_MAX_ROUNDS,
+    warmup: int = DEFAULT_WARMUP,
+    scale: int = 1
+) -> BenchmarkResult:
+    """
+    케이스 1개 측정
+
+    Args:
+        case: 측정 대상
+        min_time: 최소 측정 시간 (초, 워밍업 제외)
+        min_rounds: 최소 호출 횟수
+        max_rounds: 최대 호출 횟수
+        warmup: 측정 전 호출 횟수 (캐시/지연 로드 준비)
+        scale: 결과에 기록할 카탈로그 배수
+    """
+    for _ in range(warmup):
+        case.func()
+
+    timings: List[float] = []
+    started = time.perf_counter()
+    while len(timings) < max_rounds:
+        call_started = time.perf_counter()
+        case.func()
+        timings.append((time.perf_counter() - call_started) * 1000)
+        if len(timings) >= min_rounds and time.perf_counter() - started >= min_time:
+            break
+
+    total_ms = sum(timings)
+    timings.sort()
+    return BenchmarkResult(
+        name=case.name,
+        group=case.group,
+        rounds=len(timings),
+        ops_per_sec=round(len(timings) / (total_ms / 1000), 2) if total_ms else 0.0,
+        mean_ms=round(statistics.fmean(timings), 4),
+        p50_ms=round(statistics.median(timings), 4),
+        p99_ms=round(percentile(timings, 0.99), 4),
+        min_ms=round(timings[0], 4),
+        max_ms=round(timings[-1], 4),
+        scale=scale
+    )
+
+
+# ==============================================================================
+# 결과 저장 / 비교
+# ==============================================================================
+
+def _git_commit() -> Optional[str]:
+    """현재 커밋 해시 (git이 없으면 None)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(path: Path, results: List[BenchmarkResult], settings: Dict) -> None:
+    """측정 결과 JSON 저장 (실행 환경/설정 포함)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": settings,
+        "results": [asdict(result) for result in results]
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+
+
+def load_results(path: Path) -> Dict[Tuple[str, int], BenchmarkResult]:
+    """저장된 JSON → (케이스 이름, 배수)별 결과"""
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    results = [BenchmarkResult(**entry) for entry in document["results"]]
+    return {(result.name, result.scale): result for result in results}
+
+
+def print_results(results: List[BenchmarkResult]) -> None:
+    """결과 표 출력 (그룹별)"""
+    print(f"{'benchmark':<58} {'rounds':>7} {'ops/sec':>10} {'p50 ms':>9} {'p99 ms':>9}")
+    header = None
+    for result in results:
+        if (result.scale, result.group) != header:
+            header = (result.scale, result.group)
+            print(f"[{result.group} @ {result.scale}x]")
+        print(f"  {result.name:<56} {result.rounds:>7} {result.ops_per_sec:>10.1f} "
+              f"{result.p50_ms:>9.3f} {result.p99_ms:>9.3f}")
+
+
+def print_scaling(results: List[BenchmarkResult]) -> None:
+    """케이스별 배수에 따른 p50 (밀리초) 표"""
+    scales = sorted({result.scale for result in results})
+    p50 = {(result.name, result.scale): result.p50_ms for result in results}
+    names = list(dict.fromkeys(result.name for result in results))
+
+    print(f"{'benchmark (p50 ms)':<58}" + "".join(f"{f'{scale}x':>11}" for scale in scales))
+    for name in names:
+        cells = [p50.get((name, scale)) for scale in scales]
+        print(f"  {name:<56}" + "".join(f"{'-' if cell is None else f'{cell:.3f}':>11}" for cell in cells))
+
+
+def print_comparison(
+    results: List[BenchmarkResult], baseline: Dict[Tuple[str, int], BenchmarkResult]
+) -> None:
+    """이전 결과 대비 p50 비교 출력 (같은 배수끼리, 비율 < 1이면 빨라짐)"""
+    print(f"{'benchmark':<58} {'base p50':>9} {'p50':>9} {'ratio':>7}")
+    for result in results:
+        label = result.name if result.scale == 1 else f"{result.name} @{result.scale}x"
+        before = baseline.get((result.name, result.scale))
+        if before is None:
+            print(f"  {label:<56} {'-':>9} {result.p50_ms:>9.3f} {'new':>7}")
+            continue
+        ratio = result.p50_ms / before.p50_ms if before.p50_ms else float("inf")
+        marker = "~" if abs(ratio - 1) < CHANGE_THRESHOLD else ("faster" if ratio < 1 else "slower")
+        print(f"  {label:<56} {before.p50_ms:>9.3f} {result.p50_ms:>9.3f} {ratio:>6.2f}x {marker}")
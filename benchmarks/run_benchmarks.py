@@ -0,0 +1,107 @@
+"""
+벤치마크 실행
+
+합성 SQLite 카탈로그로 전체 케이스를 측정하고 결과를 JSON으로 저장합니다.
+--scale을 여러 번 주면 배수별로 카탈로그를 새로 생성해 측정하고 스케일링 표를 출력합니다.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scale 10 --group engine --group routes
+    python benchmarks/run_benchmarks.py --scale 1 --scale 10 --scale 100 --group engine
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/before.json
+"""
+import argparse
+import logging
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# Add backend to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.catalog import MAX_SCALE, create_catalog_database
+from benchmarks.cases import CASE_GROUPS
+from benchmarks.harness import (
+    DEFAULT_MIN_ROUNDS, DEFAULT_MIN_TIME, load_results, measure,
+    print_comparison, print_results, print_scaling, save_results
+)
+
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def scale_arg(value: str) -> int:
+    scale = int(value)
+    if not 1 <= scale <= MAX_SCALE:
+        raise argparse.ArgumentTypeError(f"1 ~ {MAX_SCALE} 범위여야 합니다: {value}")
+    return scale
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Torchlight optimizer benchmarks")
+    parser.add_argument("--scale", type=scale_arg, action="append",
+                        help=f"카탈로그 배수 (1x = 현재 크롤링 규모, 최대 {MAX_SCALE}x, 반복 가능)")
+    parser.add_argument("--seed", type=int, default=0, help="카탈로그 생성 시드")
+    parser.add_argument("--group", action="append", choices=sorted(CASE_GROUPS), help="측정할 그룹 (반복 가능)")
+    parser.add_argument("--filter", default=None, help="이름에 이 문자열이 포함된 케이스만 측정")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="케이스당 최소 측정 시간 (초)")
+    parser.add_argument("--min-rounds", type=int, default=DEFAULT_MIN_ROUNDS, help="케이스당 최소 호출 횟수")
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON 경로 (기본: results/<시각>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="비교할 이전 결과 JSON")
+    return parser.parse_args()
+
+
+def run_scale(scale: int, args, groups):
+    """배수 1개: 카탈로그 생성 후 케이스 측정"""
+    with tempfile.TemporaryDirectory() as tmp:
+        session_factory = create_catalog_database(Path(tmp) / "catalog.db", scale, args.seed)
+        db = session_factory()
+        try:
+            cases = [case for group in groups for case in CASE_GROUPS[group](db)]
+            if args.filter:
+                cases = [case for case in cases if args.filter in case.name]
+            return [measure(case, args.min_time, args.min_rounds, scale=scale) for case in cases]
+        finally:
+            db.close()
+            session_factory.kw["bind"].dispose()
+
+
+def main():
+    args = parse_args()
+    logging.disable(logging.INFO)  # 캐시 로드 로그 생략
+    groups = args.group or list(CASE_GROUPS)
+    scales = sorted(set(args.scale or [1]))
+
+    print("=" * 60)
+    print(f"Benchmarks (scale {', '.join(f'{scale}x' for scale in scales)}, seed {args.seed})")
+    print("=" * 60)
+
+    results = []
+    for scale in scales:
+        results.extend(run_scale(scale, args, groups))
+
+    print_results(results)
+    if len(scales) > 1:
+        print()
+        print_scaling(results)
+
+    output = args.output or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    save_results(output, results, {
+        "scales": scales,
+        "seed": args.seed,
+        "groups": groups,
+        "filter": args.filter,
+        "min_time": args.min_time,
+        "min_rounds": args.min_rounds
+    })
+    print(f"\n✓ 결과 저장: {output}")
+
+    if args.compare:
+        print()
+        print_comparison(results, load_results(args.compare))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+스킬 메커니즘 컬럼 백필 - 기존 skills 행의 build_style / ailment / mechanics_mask 계산
+(컬럼 추가 후 1회, MechanicsAnalyzer.MECHANIC_BITS 변경 시 --all)
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database.db import get_db_session, upgrade_schema
+from backend.recommendation.mechanics_analyzer import BACKFILL_BATCH_SIZE, backfill_skill_mechanics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스킬 메커니즘 컬럼 백필")
+    parser.add_argument("--all", action="store_true", help="이미 계산된 행도 다시 계산")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE, help="커밋 단위 행 수")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("스킬 메커니즘 컬럼 백필")
+    print("=" * 70)
+
+    added = upgrade_schema()
+    if added:
+        print(f"✓ 추가한 컬럼: {', '.join(added)}")
+
+    started = time.perf_counter()
+    with get_db_session() as db:
+        count = backfill_skill_mechanics(db, recompute=args.all, batch_size=args.batch_size)
+
+    print(f"✓ 갱신한 스킬: {count}개")
+    print(f"✓ 소요 시간: {time.perf_counter() - started:.1f}초")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
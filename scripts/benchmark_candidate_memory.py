@@ -0,0 +1,84 @@
+"""
+Benchmark: 요청당 메모리 할당 (tracemalloc)
+합성 카탈로그 1x / 10x / 100x에서 RecommendationEngineV2.recommend_build() 요청 1건의
+최대 메모리 사용량(peak)과 요청 후 남은 메모리(점수 캐시 + 응답)를 모드별로 측정합니다.
+
+점수 캐시가 빈 첫 요청(cold)만 측정합니다. 요청마다 카탈로그 스냅샷의 얕은 복사본을 사용하여
+레코드/인덱스는 공유하고 점수 캐시 키만 새로 만듭니다 (복사는 측정 전에 수행).
+"""
+import copy
+import logging
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add backend to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.catalog import create_catalog_database
+from backend.recommendation.catalog import RecommendationCatalog
+from backend.recommendation.engine_v2 import RecommendationEngineV2
+from backend.recommendation.scoring_rules import get_scoring_rules
+
+
+SCALES = [1, 10, 100]
+HEROES_PER_SCALE = 6
+MODES = {
+    "default": {},
+    "optimize_skills": {"optimize_skills": True},
+    "optimize_items": {"optimize_items": True},
+    "allocate_talents": {"allocate_talents": True},
+    "all": {"optimize_skills": True, "optimize_items": True, "allocate_talents": True}
+}
+
+
+def measure(catalog: RecommendationCatalog, hero_id: int, options: dict):
+    """요청 1건 (빈 점수 캐시) → (peak KiB, 요청 후 남은 KiB)"""
+    fresh = copy.copy(catalog)  # 점수 캐시는 스냅샷 객체별
+    engine = RecommendationEngineV2(db=None, catalog=fresh)
+    engine.rules  # 규칙 로드는 측정 제외
+
+    tracemalloc.start()
+    try:
+        result = engine.recommend_build(hero_id, optimize_budget_ms=1000, **options)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del result
+    return peak / 1024, retained / 1024
+
+
+def main():
+    logging.disable(logging.INFO)
+    rules = get_scoring_rules()
+
+    print("=" * 60)
+    print("Per-request Allocation Benchmark (tracemalloc, cold score cache)")
+    print("=" * 60)
+    print(f"{'scale':>6} {'mode':<18} {'peak KiB':>10} {'retained KiB':>13}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in SCALES:
+            session_factory = create_catalog_database(Path(tmp) / f"catalog_{scale}.db", scale)
+            db = session_factory()
+            try:
+                catalog = RecommendationCatalog.load(db, rules.effect_keywords)
+            finally:
+                db.close()
+                session_factory.kw["bind"].dispose()
+
+            hero_ids = sorted(catalog.heroes)[:HEROES_PER_SCALE]
+            measure(catalog, hero_ids[0], MODES["all"])  # 재능 프로필 등 일회성 로드 제외
+            for mode, options in MODES.items():
+                runs = [measure(catalog, hero_id, options) for hero_id in hero_ids]
+                peak = statistics.median(run[0] for run in runs)
+                retained = statistics.median(run[1] for run in runs)
+                print(f"{scale:>5}x {mode:<18} {peak:>10.1f} {retained:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: 세트 보너스 고려 장비 슬롯 배정 (gear_optimizer.assign_gear)
+아이템 수를 1x / 10x / 100x로 늘리며 풀이 시간과 탐욕 해 대비 점수 비교
+
+- catalog: 세트마다 서로 다른 슬롯의 피스 4~6개 (세트 수도 아이템 수에 비례)
+- dense:   세트 수는 고정, 모든 세트가 모든 슬롯에 아이템 보유 (최악의 경우)
+"""
+import random
+import statistics
+import sys
+from pathlib import Path
+
+# Add backend to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.recommendation.gear_optimizer import DEFAULT_TIME_BUDGET_MS, assign_gear
+
+
+SLOTS = ["Head", "Chest", "Hands", "Feet", "MainHand", "OffHand", "Neck", "Finger", "Waist"]
+BASE_ITEMS = 80  # 현재 카탈로그 규모
+SET_ITEM_RATIO = 0.3
+SEEDS = 20
+
+
+def make_bonuses(rnd: random.Random, pieces_required: int):
+    """2/4/6 단계 보너스 점수 (pieces_required 이하만)"""
+    return [
+        (pieces, rnd.randint(5, 15) * pieces // 2)
+        for pieces in (2, 4, 6)
+        if pieces <= pieces_required
+    ]
+
+
+def make_catalog_problem(item_count: int, seed: int):
+    """세트별 고정 슬롯 피스로 구성된 카탈로그 (시드 고정)"""
+    rnd = random.Random(seed)
+    candidates, set_bonuses = [], {}
+    set_items = int(item_count * SET_ITEM_RATIO)
+    while set_items > 0:
+        pieces_required = rnd.randint(4, 6)
+        name = f"Set {len(set_bonuses)}"
+        set_bonuses[name] = make_bonuses(rnd, pieces_required)
+        for slot in rnd.sample(SLOTS, pieces_required):
+            candidates.append({"slot": slot, "score": rnd.randint(0, 60), "set_name": name})
+        set_items -= pieces_required
+    while len(candidates) < item_count:
+        candidates.append({"slot": rnd.choice(SLOTS), "score": rnd.randint(0, 60), "set_name": None})
+    candidates.sort(key=lambda c: c["score"], reverse=True)
+    return candidates, set_bonuses
+
+
+def make_dense_problem(item_count: int, set_count: int, seed: int):
+    """세트 수 고정, 세트 아이템이 모든 슬롯에 무작위 분포 (시드 고정)"""
+    rnd = random.Random(seed)
+    set_names = [f"Set {i}" for i in range(set_count)]
+    candidates = [
+        {
+            "slot": rnd.choice(SLOTS),
+            "score": rnd.randint(0, 60),
+            "set_name": rnd.choice(set_names) if rnd.random() < SET_ITEM_RATIO else None
+        }
+        for _ in range(item_count)
+    ]
+    candidates.sort(key=lambda c: c["score"], reverse=True)
+    set_bonuses = {name: make_bonuses(rnd, 6) for name in set_names}
+    return candidates, set_bonuses
+
+
+def run(label: str, item_count: int, problems):
+    timings, states, gains, optimal = [], [], [], 0
+    set_count = 0
+    for candidates, set_bonuses in problems:
+        result = assign_gear(candidates, set_bonuses, max_items=len(SLOTS))
+        timings.append(result.elapsed_ms)
+        states.append(result.states)
+        gains.append(result.total_score - result.greedy_score)
+        optimal += result.optimal
+        set_count = len(set_bonuses)
+
+    print(f"{label:>8} {item_count:>7} {set_count:>5} {statistics.median(timings):>8.2f} "
+          f"{max(timings):>8.2f} {int(statistics.median(states)):>7} "
+          f"{statistics.mean(gains):>7.1f} {optimal:>4}/{len(timings)}")
+
+
+def main():
+    print("=" * 72)
+    print(f"Gear Optimizer Benchmark (9 slots, budget {DEFAULT_TIME_BUDGET_MS} ms)")
+    print("=" * 72)
+    print(f"{'case':>8} {'items':>7} {'sets':>5} {'p50 ms':>8} {'max ms':>8} {'states':>7} "
+          f"{'gain':>7} {'optimal':>9}")
+
+    for multiplier in [1, 10, 100]:
+        item_count = BASE_ITEMS * multiplier
+        run("catalog", item_count, [make_catalog_problem(item_count, seed) for seed in range(SEEDS)])
+
+    for multiplier in [1, 10, 100]:
+        item_count = BASE_ITEMS * multiplier
+        for set_count in [4, 12, 30]:
+            run("dense", item_count, [make_dense_problem(item_count, set_count, seed) for seed in range(SEEDS)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark: 같은 영웅의 후속 요청 비용 (RecommendationEngineV2 점수 캐시)
+스킬/아이템/재능 노드 수를 1x / 10x / 100x로 늘리며 영웅별 첫 요청과
+플레이스타일/개수 제한만 바꾼 후속 요청의 시간 비교 (목표: 후속 요청 10배 이상 빠름)
+
+카탈로그는 DB 없이 시드 고정 무작위 레코드로 만들고 (공유 스냅샷 로드 비용 제외),
+요청마다 엔진을 새로 생성합니다 (API 라우트와 동일).
+"""
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database.models import Skill, Item, ItemSet, TalentNode
+from backend.recommendation.catalog import (
+    HeroRecord, RecommendationCatalog,
+    build_skill_record, build_item_record, build_item_set_record, build_talent_node_record
+)
+from backend.recommendation.engine_v2 import RecommendationEngineV2
+from backend.recommendation.scoring_rules import get_scoring_rules
+
+
+# 현재 카탈로그 규모 (1x)
+BASE_SKILLS = 60
+BASE_ITEMS = 80
+BASE_NODES = 40
+
+HEROES = [
+    ("Rehan", "Berserker", "Anger"),
+    ("Carino", "Divineshot", "Ranger of Glory"),
+    ("Gemma", "Mage", "Flame of Pleasure"),
+    ("Erika", "Ranger", "Wind Stalker")
+]
+TAGS = ["Attack", "Melee", "Area", "Spell", "Fire", "Cold", "Lightning", "Erosion", "Physical",
+        "DoT", "Combo", "Projectile", "Summon", "Ranged", "Ailment", "Channeled", "Cooldown"]
+EFFECTS = ["+20% Attack Speed", "+30% Critical Strike Rating", "+15% Area of Effect", "Affliction +10",
+           "+25% Fire Damage", "Ignite damage", "Spell Burst charge speed", "Rage Generation +5",
+           "Cooldown Recovery speed", "+10% Melee Damage", "double damage chance", "damage over time"]
+SLOTS = ["Head", "Chest", "Hands", "Feet", "MainHand", "OffHand", "Neck", "Finger", "Waist"]
+PLAYSTYLES = [None, "Melee", "Ranged", "Spell", "AoE", "DoT"]
+LIMITS = [(6, 10), (4, 6), (8, 12)]
+
+
+def make_catalog(scale: int, seed: int = 0) -> RecommendationCatalog:
+    """무작위 카탈로그 (시드 고정)"""
+    rnd = random.Random(seed)
+    heroes = [HeroRecord(id=i + 1, name=n, god_type=g, talent=t) for i, (n, g, t) in enumerate(HEROES)]
+    skills = [
+        build_skill_record(Skill(
+            id=i + 1,
+            name=f"Skill {i}",
+            type=rnd.choice(["Active Skill", "Support Skill", "Passive Skill"]),
+            description="Deals damage over time per second. " * rnd.randint(0, 4),
+            tags=json.dumps(rnd.sample(TAGS, rnd.randint(1, 5))),
+            damage_type=rnd.choice(["Physical", "Fire", "Cold", "Lightning", "Erosion", None])
+        ))
+        for i in range(BASE_SKILLS * scale)
+    ]
+    items = [
+        build_item_record(Item(
+            id=i + 1,
+            name=f"Item {i}",
+            type="Gear",
+            slot=rnd.choice(SLOTS),
+            rarity=rnd.choice(["Legendary", "Rare", None]),
+            stat_type=rnd.choice(["STR", "DEX", "INT", None]),
+            special_effects=json.dumps(rnd.sample(EFFECTS, rnd.randint(0, 4))),
+            set_name=rnd.choice([None, None, None, "Set A", "Set B"])
+        ))
+        for i in range(BASE_ITEMS * scale)
+    ]
+    item_sets = [
+        build_item_set_record(ItemSet(
+            set_name=name, pieces_required=4, set_bonus_2="+10% damage", set_bonus_4="+20% Attack Speed"
+        ))
+        for name in ("Set A", "Set B")
+    ]
+    nodes = [
+        build_talent_node_record(TalentNode(
+            id=i + 1,
+            name=f"Node {i}",
+            node_type=rnd.choice(["Core", "Regular"]),
+            god_class=rnd.choice(["God of Might", "God of Wisdom", "Berserker"]),
+            tier=rnd.choice(["Micro", "Medium", "Large", "Legendary"]),
+            effect=rnd.choice(["+affliction", "critical hit", "attack speed", "damage over time"])
+        ))
+        for i in range(BASE_NODES * scale)
+    ]
+    return RecommendationCatalog(heroes, skills, items, nodes, item_sets, get_scoring_rules().effect_keywords)
+
+
+def timed(catalog: RecommendationCatalog, **request) -> float:
+    """요청 1건 시간 (밀리초, 요청마다 새 엔진)"""
+    started = time.perf_counter()
+    RecommendationEngineV2(db=None, catalog=catalog).recommend_build(**request)
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    print("=" * 60)
+    print("Incremental Re-ranking Benchmark (same hero, playstyle/limits change)")
+    print("=" * 60)
+    print(f"{'scale':>6} {'skills':>7} {'first ms':>9} {'follow ms':>10} {'speedup':>8}")
+
+    for scale in [1, 10, 100]:
+        catalog = make_catalog(scale)
+        first, follow = [], []
+        for hero_id in catalog.heroes:
+            first.append(timed(catalog, hero_id=hero_id))
+            for playstyle in PLAYSTYLES:
+                for max_skills, max_items in LIMITS:
+                    follow.append(timed(
+                        catalog, hero_id=hero_id, playstyle=playstyle, max_skills=max_skills, max_items=max_items
+                    ))
+
+        first_ms, follow_ms = statistics.median(first), statistics.median(follow)
+        print(f"{scale:>5}x {len(catalog.skills):>7} {first_ms:>9.2f} {follow_ms:>10.3f} "
+              f"{first_ms / follow_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
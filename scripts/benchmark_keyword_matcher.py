@@ -0,0 +1,99 @@
+"""
+Benchmark: 키워드 매칭 - 호출 지점별 부분 문자열 검색 vs 단일 패스 매처
+긴 설명(~2000자)에 대해 엔진/분석기/크롤러의 전체 키워드 어휘를 검사하는 비용 비교
+
+- naive: 요청마다 소문자 변환 + 키워드별 `in` 검색 (기존 방식)
+- scan: 설명 1회 스캔 + 집합 조회 (카탈로그 생성 시 비용)
+- cached: 미리 스캔한 결과로 조회만 (요청 처리 시 비용)
+"""
+import random
+import sys
+import timeit
+from pathlib import Path
+
+# Add backend to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# 각 모듈 임포트 시 어휘가 공유 매처에 등록됨
+import backend.recommendation.engine_v2  # noqa: F401
+import backend.recommendation.mechanics_analyzer  # noqa: F401
+import backend.crawler.talent_levels_crawler  # noqa: F401
+from backend.keyword_matcher import get_shared_matcher, scan_keywords
+
+
+FILLER = [
+    "the", "enemy", "takes", "increased", "damage", "when", "you", "use", "skills",
+    "for", "seconds", "after", "casting", "gain", "stacks", "of", "with", "nearby",
+]
+
+
+def make_descriptions(count: int, length: int, keywords, seed: int = 42):
+    """키워드가 섞인 합성 설명 생성 (시드 고정)"""
+    rnd = random.Random(seed)
+    descriptions = []
+    for _ in range(count):
+        words = []
+        while sum(len(w) + 1 for w in words) < length:
+            words.append(rnd.choice(keywords) if rnd.random() < 0.1 else rnd.choice(FILLER))
+        descriptions.append(" ".join(words).capitalize())
+    return descriptions
+
+
+def naive(descriptions, keywords):
+    """기존 방식: 호출 지점마다 소문자 변환 + 키워드별 부분 문자열 검색"""
+    found = 0
+    for text in descriptions:
+        text_lower = text.lower()
+        for keyword in keywords:
+            if keyword in text_lower:
+                found += 1
+    return found
+
+
+def single_pass(descriptions, keywords):
+    """단일 패스: 설명 1회 스캔 후 집합 조회"""
+    return cached([scan_keywords(text) for text in descriptions], keywords)
+
+
+def cached(all_hits, keywords):
+    """미리 스캔한 결과로 집합 조회만 수행"""
+    found = 0
+    for hits in all_hits:
+        for keyword in keywords:
+            if keyword in hits:
+                found += 1
+    return found
+
+
+def main():
+    keywords = sorted(get_shared_matcher().vocabulary)
+    print("=" * 60)
+    print("Keyword Matcher Benchmark")
+    print("=" * 60)
+    print(f"Vocabulary: {len(keywords)} keywords\n")
+
+    for length in [200, 2000, 10000]:
+        descriptions = make_descriptions(200, length, keywords)
+        all_hits = [scan_keywords(text) for text in descriptions]
+        expected = naive(descriptions, keywords)
+        assert expected == single_pass(descriptions, keywords) == cached(all_hits, keywords)
+
+        results = {}
+        for name, func, data in [
+            ("naive", naive, descriptions),
+            ("scan", single_pass, descriptions),
+            ("cached", cached, all_hits),
+        ]:
+            runs = min(timeit.repeat(lambda: func(data, keywords), number=5, repeat=5))
+            per_description = runs / (5 * len(descriptions))
+            results[name] = per_description
+            print(f"[{length:>5} chars] {name:<8} {per_description * 1e6:9.1f} µs/desc  "
+                  f"{1 / per_description:12,.0f} desc/sec")
+
+        print(f"[{length:>5} chars] speedup  scan {results['naive'] / results['scan']:.2f}x, "
+              f"cached {results['naive'] / results['cached']:.2f}x\n")
+
+
+if __name__ == "__main__":
+    main()
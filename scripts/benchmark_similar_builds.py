@@ -0,0 +1,84 @@
+"""
+Benchmark: 유사 빌드 최근접 이웃 질의 (similar_builds.SimilarBuildIndex.query)
+저장된 빌드 수를 1천 / 1만 / 5만 / 10만으로 늘리며 질의 시간 측정 (목표: 10 ms 미만)
+
+빌드는 시드 고정 무작위 스킬/아이템 구성으로 생성합니다.
+"""
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.recommendation.similar_builds import (
+    DAMAGE_TYPE_ORDER, VECTOR_SIZE, IndexedBuild, SimilarBuildIndex, SkillFeatures, encode_build
+)
+
+
+SKILL_POOL = 600
+ITEM_POOL = 800
+QUERIES = 200
+
+
+def make_skills(rnd: random.Random, count: int):
+    """무작위 스킬 특징 (시드 고정)"""
+    return [
+        SkillFeatures(
+            id=rnd.randrange(SKILL_POOL),
+            damage_type=rnd.choice(DAMAGE_TYPE_ORDER + (None,)),
+            is_dot=rnd.random() < 0.4,
+            is_spell_burst_compatible=rnd.random() < 0.3,
+            is_combo=rnd.random() < 0.2
+        )
+        for _ in range(count)
+    ]
+
+
+def make_index(build_count: int, seed: int = 0) -> SimilarBuildIndex:
+    rnd = random.Random(seed)
+    builds = []
+    vectors = np.zeros((build_count, VECTOR_SIZE), dtype=np.float32)
+    for row in range(build_count):
+        skills = make_skills(rnd, 6)
+        item_ids = tuple(rnd.randrange(ITEM_POOL) for _ in range(10))
+        builds.append(IndexedBuild(
+            source="materialized", hero_id=row % 19, hero_name=None, playstyle=None, build_name=None,
+            build_type="Hit", skill_ids=tuple(s.id for s in skills), item_ids=item_ids
+        ))
+        vectors[row] = encode_build(skills, item_ids)
+    return SimilarBuildIndex(builds, vectors)
+
+
+def main():
+    print("=" * 60)
+    print(f"Similar Build Index Benchmark ({VECTOR_SIZE} dims, top 10)")
+    print("=" * 60)
+    print(f"{'builds':>8} {'build s':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+
+    rnd = random.Random(1)
+    for build_count in [1_000, 10_000, 50_000, 100_000]:
+        started = time.perf_counter()
+        index = make_index(build_count)
+        build_seconds = time.perf_counter() - started
+
+        timings = []
+        for _ in range(QUERIES):
+            skills = make_skills(rnd, 6)
+            item_ids = [rnd.randrange(ITEM_POOL) for _ in range(10)]
+            started = time.perf_counter()
+            index.query(encode_build(skills, item_ids), 10)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        print(f"{build_count:>8} {build_seconds:>8.2f} {statistics.median(timings):>8.3f} "
+              f"{timings[int(len(timings) * 0.99) - 1]:>8.3f} {timings[-1]:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
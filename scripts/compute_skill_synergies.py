@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+스킬 쌍 시너지 계산 - 전체 스킬 쌍의 시너지를 계산하여
+임계값 이상인 쌍을 skill_synergies 테이블에 저장 (크롤링 후 실행)
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database.db import get_db_session
+from backend.recommendation.skill_synergy import SIGNIFICANT_SYNERGY, populate_skill_synergies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스킬 쌍 시너지 계산")
+    parser.add_argument("--threshold", type=float, default=SIGNIFICANT_SYNERGY, help="저장할 최소 시너지")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("스킬 쌍 시너지 계산")
+    print("=" * 70)
+
+    started = time.perf_counter()
+    with get_db_session() as db:
+        count = populate_skill_synergies(db, threshold=args.threshold)
+
+    print(f"✓ 저장한 쌍: {count}개 (임계값 {args.threshold})")
+    print(f"✓ 소요 시간: {time.perf_counter() - started:.1f}초")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,8 @@ from backend.crawler.legendary_items_crawler_v2 import LegendaryItemsCrawlerV2
 from backend.crawler.talent_nodes_crawler import TalentNodesCrawler
 from backend.crawler.destiny_crawler import DestinyCrawler
 from backend.database.db import get_db_session
+from backend.recommendation.materialized import materialize_builds
+from backend.recommendation.skill_synergy import populate_skill_synergies
 
 # 로깅 설정
 logging.basicConfig(
@@ -148,6 +150,26 @@ def crawl_all_data():
         logger.error(f"운명 크롤링 실패: {e}")
         statistics['destinies'] = 0
 
+    # 스킬 쌍 시너지 계산
+    print("\n스킬 쌍 시너지 계산...")
+    print("-" * 80)
+    try:
+        with get_db_session() as db:
+            pair_count = populate_skill_synergies(db)
+        print(f"✓ 스킬 쌍 시너지 {pair_count}개 저장 완료")
+    except Exception as e:
+        logger.error(f"스킬 쌍 시너지 계산 실패: {e}")
+
+    # 크롤링한 카탈로그로 빌드 추천 사전 계산
+    print("\n빌드 추천 사전 계산...")
+    print("-" * 80)
+    try:
+        with get_db_session() as db:
+            result = materialize_builds(db)
+        print(f"✓ 빌드 {result.builds}개 사전 계산 완료 ({result.elapsed_ms / 1000:.1f}초)")
+    except Exception as e:
+        logger.error(f"빌드 사전 계산 실패: {e}")
+
     # 최종 통계
     print("\n" + "=" * 80)
     print("전체 데이터 크롤링 완료!")
@@ -0,0 +1,64 @@
+"""
+합성 카탈로그 DB 생성 (스케일/부하 테스트용)
+
+현재 크롤링 데이터 규모(1x) 기준 배수만큼 영웅/스킬/아이템/세트/재능/성운 행을
+시드 고정으로 생성하여 SQLite 파일로 저장합니다. (생성기: benchmarks/catalog.py)
+
+Usage:
+    python scripts/generate_synthetic_catalog.py --scale 100
+    python scripts/generate_synthetic_catalog.py --scale 1000 --seed 7 --output /tmp/catalog_1000x.db
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import func
+
+from backend.database.models import Hero, Skill, Item, ItemSet, TalentNode, TalentLevel, Destiny
+from benchmarks.catalog import MAX_SCALE, create_catalog_database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a synthetic catalog database")
+    parser.add_argument("--scale", type=int, default=1, help=f"카탈로그 배수 (1 ~ {MAX_SCALE})")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="SQLite 파일 경로 (기본: data/synthetic_<scale>x.db)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not 1 <= args.scale <= MAX_SCALE:
+        print(f"❌ --scale은 1 ~ {MAX_SCALE} 범위여야 합니다")
+        sys.exit(1)
+    output = args.output or project_root / "data" / f"synthetic_{args.scale}x.db"
+
+    print("=" * 60)
+    print(f"Synthetic Catalog (scale {args.scale}x, seed {args.seed})")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    session_factory = create_catalog_database(output, args.scale, args.seed)
+    elapsed = time.perf_counter() - started
+
+    db = session_factory()
+    try:
+        for model in (Hero, Skill, Item, ItemSet, TalentNode, TalentLevel, Destiny):
+            count = db.query(func.count(model.id)).scalar()
+            print(f"  {model.__tablename__:<15} {count:>8,}")
+    finally:
+        db.close()
+        session_factory.kw["bind"].dispose()
+
+    size_mb = output.stat().st_size / (1024 * 1024)
+    print(f"\n✓ 생성 완료: {output} ({size_mb:.1f} MB, {elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
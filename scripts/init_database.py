@@ -9,7 +9,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from backend.database.models import Base
-from backend.database.db import engine
+from backend.database.db import engine, upgrade_schema
 
 
 def init_database():
@@ -21,10 +21,13 @@ def init_database():
     # 모든 테이블 생성
     print("\n테이블 생성 중...")
     Base.metadata.create_all(bind=engine)
+    added = upgrade_schema()  # 기존 테이블에 새 컬럼 추가
 
     print("✓ 다음 테이블이 생성되었습니다:")
     for table_name in Base.metadata.tables.keys():
         print(f"  - {table_name}")
+    if added:
+        print(f"✓ 추가된 컬럼: {', '.join(added)} (python scripts/backfill_skill_mechanics.py 실행 필요)")
 
     print("\n" + "=" * 70)
     print("✓ 데이터베이스 초기화 완료!")
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+빌드 추천 사전 계산 - 파라미터 그리드 전체를 프로세스 풀에서 계산하여
+materialized_builds 테이블에 저장 (크롤링 후 실행)
+"""
+import argparse
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database.db import get_db_session, upgrade_schema
+from backend.recommendation.materialized import materialize_builds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="빌드 추천 사전 계산")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 풀 워커 수 (기본: CPU 수)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("빌드 추천 사전 계산")
+    print("=" * 70)
+
+    upgrade_schema()  # 카탈로그 변경 횟수 트리거 (기존 DB)
+    with get_db_session() as db:
+        result = materialize_builds(db, workers=args.workers)
+
+    print(f"✓ 카탈로그 버전: {result.catalog_version[:12]}")
+    print(f"✓ 저장한 빌드: {result.builds}개 (실패 {result.failed}개)")
+    print(f"✓ 소요 시간: {result.elapsed_ms / 1000:.1f}초")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+AI 빌드 추천 사전 생성 - 영웅 × 주요 플레이스타일 조합의 AI 추천을 미리 생성하여
+ai_pregenerated_builds 테이블에 저장 (크롤링 후 실행, 중단 후 다시 실행하면 남은 조합만 생성)
+
+사용법:
+    python scripts/pregenerate_ai_builds.py --concurrency 8
+    python scripts/pregenerate_ai_builds.py --force            # 현재 모델의 결과를 지우고 전부 다시 생성
+    python scripts/pregenerate_ai_builds.py --base-url http://127.0.0.1:8089/v1   # 로컬 호환 서버
+    python scripts/pregenerate_ai_builds.py --export-batch requests.jsonl        # Batch API 입력 파일
+    python scripts/pregenerate_ai_builds.py --import-batch results.jsonl         # Batch API 결과 저장
+"""
+import argparse
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from dotenv import load_dotenv
+
+from backend.database.db import get_db_session, upgrade_schema
+from backend.recommendation.ai_pregenerated import (
+    DEFAULT_CONCURRENCY,
+    export_batch_file,
+    import_batch_results,
+    pregenerate_ai_builds
+)
+from backend.recommendation.ai_service import AIRecommendationService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI 빌드 추천 사전 생성")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시 호출 수")
+    parser.add_argument("--base-url", default=None, help="OpenAI 호환 서버 주소 (기본: OPENAI_BASE_URL)")
+    parser.add_argument("--force", action="store_true", help="현재 모델의 저장된 결과를 지우고 전체 조합을 다시 생성")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--export-batch", metavar="PATH", help="호출 대신 Batch API 입력 파일(JSONL) 저장")
+    mode.add_argument("--import-batch", metavar="PATH", help="Batch API 결과 파일(JSONL)을 검증 후 저장")
+    args = parser.parse_args()
+    if args.force and args.import_batch:
+        parser.error("--force는 생성/내보내기에만 사용할 수 있습니다 (--export-batch --force로 내보낸 뒤 가져오기)")
+
+    load_dotenv()
+
+    print("=" * 70)
+    print("AI 빌드 추천 사전 생성")
+    print("=" * 70)
+
+    upgrade_schema()  # 카탈로그 변경 횟수 트리거 (기존 DB)
+    service = AIRecommendationService(base_url=args.base_url)
+    with get_db_session() as db:
+        if args.export_batch:
+            version, count = export_batch_file(db, service, args.export_batch, force=args.force)
+            print(f"✓ 카탈로그 버전: {version[:12]}")
+            print(f"✓ 내보낸 요청: {count}개 → {args.export_batch}")
+            print("=" * 70)
+            return
+
+        if args.import_batch:
+            result = import_batch_results(db, service, args.import_batch)
+        else:
+            result = pregenerate_ai_builds(db, service, concurrency=args.concurrency, force=args.force)
+
+    print(f"✓ 카탈로그 버전: {result.catalog_version[:12]} (모델 {result.model})")
+    print(f"✓ 저장한 추천: {result.generated}개 (기존 {result.skipped}개, 실패 {result.failed}개)")
+    print(f"✓ 소요 시간: {result.elapsed_ms / 1000:.1f}초")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+로컬 OpenAI 호환 스텁 서버 - AI 추천 파이프라인을 API 키/네트워크 없이 끝까지 실행하기 위한 대역
+
+POST /v1/chat/completions 요청의 사용자 프롬프트에서 "# AVAILABLE SKILLS"/"# AVAILABLE ITEMS"
+목록(- 이름 (ID: n ...))을 읽어, 요청한 개수만큼 앞에서부터 고른 추천 JSON을 결정적으로 돌려줍니다.
+
+사용법:
+    python scripts/stub_openai_server.py --port 8089 --delay 0.2
+    OPENAI_API_KEY=stub python scripts/pregenerate_ai_builds.py --base-url http://127.0.0.1:8089/v1
+"""
+import argparse
+import itertools
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_ENTRY_PATTERN = re.compile(r"^- (?:⭐ )?(.+?) \(ID: (\d+)")
+_LIMIT_PATTERN = re.compile(r"Select up to (\d+) (skills|items)")
+_FIELD_PATTERN = re.compile(r"^(Name|Talent): (.+)$", re.MULTILINE)
+
+
+def parse_prompt(prompt: str):
+    """사용자 프롬프트 → (영웅 정보, 스킬 후보, 아이템 후보, 개수 제한)"""
+    candidates = {"skills": [], "items": []}
+    section = None
+    for line in prompt.splitlines():
+        if line.startswith("# "):
+            section = "skills" if "AVAILABLE SKILLS" in line else "items" if "AVAILABLE ITEMS" in line else None
+            continue
+        match = _ENTRY_PATTERN.match(line)
+        if section and match:
+            candidates[section].append((match.group(1), int(match.group(2))))
+
+    limits = {kind: int(count) for count, kind in _LIMIT_PATTERN.findall(prompt)}
+    fields = dict(_FIELD_PATTERN.findall(prompt))
+    return fields, candidates, limits
+
+
+def build_recommendation(prompt: str, hallucinate: bool = False) -> dict:
+    """프롬프트의 후보 목록만 사용하는 추천 (hallucinate면 없는 스킬 하나를 섞음)"""
+    fields, candidates, limits = parse_prompt(prompt)
+    skills = [
+        {"skill_name": name, "skill_id": skill_id, "priority": min(rank, 5), "reason": "Top-ranked candidate"}
+        for rank, (name, skill_id) in enumerate(candidates["skills"][:limits.get("skills", 6)], 1)
+    ]
+    if hallucinate:
+        skills.append({"skill_name": "Imaginary Nova", "skill_id": 999999, "priority": 5, "reason": "-"})
+
+    return {
+        "hero_name": fields.get("Name", ""),
+        "talent_name": fields.get("Talent", ""),
+        "build_type": "Hybrid",
+        "build_summary": "Deterministic stub recommendation built from the prompt candidates.",
+        "recommended_skills": skills,
+        "recommended_items": [
+            {"item_name": name, "item_id": item_id, "slot": "", "reason": "Top-ranked candidate"}
+            for name, item_id in candidates["items"][:limits.get("items", 10)]
+        ],
+        "synergy_explanation": "Stub server response.",
+        "playstyle_tips": []
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    hallucinate_every = 0
+    _counter = itertools.count(1)
+    _counter_lock = threading.Lock()
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        with self._counter_lock:
+            number = next(self._counter)
+        time.sleep(self.delay)
+
+        prompt = "\n".join(m["content"] for m in body["messages"] if m["role"] == "user")
+        hallucinate = bool(self.hallucinate_every) and number % self.hallucinate_every == 0
+        content = json.dumps(build_recommendation(prompt, hallucinate))
+        prompt_tokens = sum(len(m["content"]) for m in body["messages"]) // 4
+        completion_tokens = len(content) // 4
+
+        self._send_json({
+            "id": f"chatcmpl-stub-{number}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    def _send_json(self, payload: dict):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 OpenAI 호환 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--delay", type=float, default=0.0, help="응답 지연 (초)")
+    parser.add_argument("--hallucinate-every", type=int, default=0, help="N번째 응답마다 없는 스킬을 섞음 (0 = 끔)")
+    args = parser.parse_args()
+
+    StubHandler.delay = args.delay
+    StubHandler.hallucinate_every = args.hallucinate_every
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    print(f"Stub OpenAI server on http://{args.host}:{args.port}/v1 (delay {args.delay}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()